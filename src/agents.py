@@ -0,0 +1,47 @@
+"""
+Simple agents for :obj:`src.game.Game`.
+
+An agent is a callable taking the game and returning the next direction of
+the snake or ``None`` to keep the current one. Agents are plain module level
+functions, so they can be sent to worker processes.
+"""
+
+from src.mcts import mcts_agent
+
+
+def random_agent(game):
+    """Turn to a random direction which does not end the game."""
+
+    directions = list(game.snake.safe_directions())
+
+    return game.grid.random.choice(directions) if directions else None
+
+
+def greedy_agent(game):
+    """Turn to the safe direction leading closest to the food."""
+
+    directions = list(game.snake.safe_directions())
+    food_cells = game.grid.food_cells()
+    if not directions or not food_cells:
+        return None
+
+    head = game.snake.head.coordinates
+
+    def food_distance(direction):
+        x, y = game.snake.change_coordinates(head, direction)
+
+        return min(abs(x - f_x) + abs(y - f_y) for f_x, f_y in (f.coordinates for f in food_cells))
+
+    return min(directions, key=food_distance)
+
+
+# Agents evaluated by default.
+AGENTS = {
+    'random': random_agent,
+    'greedy': greedy_agent,
+}
+
+# Slow agents evaluated only when they are asked for by name.
+OPT_IN_AGENTS = {
+    'mcts': mcts_agent,
+}
@@ -0,0 +1,165 @@
+import random
+
+from src.config import CELL_WIDTH, CELL_HEIGHT, MARGIN, CELLS_IN_ROW
+from src.grid.grid import BasicGrid
+from src.exceptions.snake_exceptions import LongDisposeLengthException
+from src.snake import UnclePy, Outcomes, StepResult
+
+# Attempts to find a place where a new snake fits.
+DISPOSE_ATTEMPTS = 10
+
+
+class Arena:
+    """
+    Many snakes moving simultaneously on one grid.
+
+    Every :meth:`step` resolves collisions of all moving snakes in one pass
+    before anything moves:
+
+    * a snake leaving the grid dies with :attr:`Outcomes.HIT_WALL`;
+    * snakes whose heads go to the same cell all die with
+      :attr:`Outcomes.HIT_SNAKE`, conflicts are found by a hash of proposed
+      head cells;
+    * a snake going to a cell of a snake, as the cells were at the beginning
+      of the tick, dies with :attr:`Outcomes.HIT_SELF` for its own body and
+      :attr:`Outcomes.HIT_SNAKE` for another one. Like for a single snake,
+      tails released by the step still block heads.
+
+    Survivors then move by :meth:`src.snake.UnclePy.step` and cells of dead
+    snakes are given back to the grid. Food replacing eaten one is added only
+    after every head moved, so it never appears on a cell another snake is
+    entering in the same tick.
+    """
+
+    def __init__(
+            self,
+            grid_bounds: tuple = (CELLS_IN_ROW, CELLS_IN_ROW),
+            grid_info: tuple = (CELL_WIDTH, CELL_HEIGHT, MARGIN),
+            grid_class=BasicGrid,
+            seed=None,
+    ):
+        self.grid = grid_class(grid_info=grid_info, grid_bounds=grid_bounds, rng=random.Random(seed))
+        self.snakes = []
+        self.ticks = 0
+
+        self._alive = set()
+
+    def __contains__(self, snake):
+        """Whether the `snake` is alive in the arena, unlike a scan of :attr:`snakes` it is O(1)."""
+
+        return snake in self._alive
+
+    def add_snake(self, length: int = 3, color: tuple = None, cell=None) -> UnclePy:
+        """Dispose a new snake from the `cell`, a random free one by default.
+
+        Random cells are tried up to :data:`DISPOSE_ATTEMPTS` times. A snake of
+        one cell goes to a random free neighbour.
+
+        Raises:
+            ValueError: if the snake does not fit the grid.
+        """
+
+        color = color or tuple(self.grid.random.randrange(64, 256) for _ in range(3))
+
+        for _ in range(DISPOSE_ATTEMPTS if cell is None else 1):
+            tail = cell or self.grid.main_structure.cells.sample(self.grid.random)
+            if not self.grid.is_free_cell(tail):
+                break
+
+            try:
+                snake = UnclePy(self.grid, tail, length, color)
+            except LongDisposeLengthException as e:
+                raise ValueError(f'A snake of length {length} does not fit the grid.') from e
+
+            if len(snake.cells) == length and self._direct(snake):
+                snake.spawns_food = False
+                self.snakes.append(snake)
+                self._alive.add(snake)
+                return snake
+
+            self.grid.bring_back_cells(list(snake.cells))
+
+        raise ValueError(f'Cannot find a place for a snake of length {length}.')
+
+    def _direct(self, snake: UnclePy) -> bool:
+        if snake.direction is not None:
+            return True
+
+        directions = list(snake.safe_directions())
+        if directions:
+            snake.direction = self.grid.random.choice(directions)
+
+        return bool(directions)
+
+    def remove_snake(self, snake: UnclePy):
+        """Take the alive `snake` out of the arena and give its cells back to the grid."""
+
+        self._alive.remove(snake)
+        self.snakes.remove(snake)
+        self.grid.bring_back_cells(list(snake.cells))
+
+    def add_food(self, count: int = 1, color: tuple = (100, 100, 0), value: int = 3):
+        for _ in range(count):
+            self.grid.add_food(color, value)
+
+    def step(self, actions: dict = None, snakes=None) -> dict:
+        """Move snakes simultaneously.
+
+        Args:
+            actions: snakes mapped to their new directions, backward ones are ignored.
+            snakes: snakes to move, all alive snakes by default. Other snakes
+                stay in place, so snakes can move at different speeds.
+
+        Returns:
+            :obj:`dict`: moved snakes mapped to :obj:`StepResult`, dead snakes
+            are removed from the arena.
+        """
+
+        actions = actions or {}
+        snakes = self.snakes if snakes is None else snakes
+
+        results = {}
+        proposed_heads = {}
+        for snake in snakes:
+            if snake in actions:
+                snake.turn(actions[snake])
+
+            new_x, new_y = snake.change_coordinates(snake.head.coordinates, snake.direction)
+            if not self.grid.in_bounds(new_x, new_y):
+                results[snake] = StepResult(Outcomes.HIT_WALL, 0)
+                continue
+
+            owner = self.grid.get_cell(new_x, new_y).owner
+            if owner is snake:
+                results[snake] = StepResult(Outcomes.HIT_SELF, 0)
+            elif isinstance(owner, UnclePy):
+                results[snake] = StepResult(Outcomes.HIT_SNAKE, 0)
+            else:
+                proposed_heads.setdefault((new_x, new_y), []).append(snake)
+
+        movers = []
+        for claimants in proposed_heads.values():
+            if len(claimants) == 1:
+                movers.append(claimants[0])
+            else:
+                for snake in claimants:
+                    results[snake] = StepResult(Outcomes.HIT_SNAKE, 0)
+
+        dead = set(results)
+        for snake in dead:
+            self.grid.bring_back_cells(list(snake.cells))
+
+        for snake in movers:
+            results[snake] = snake.step()
+
+        for snake in movers:
+            if results[snake].outcome is Outcomes.ATE:
+                snake.spawn_food()
+
+        if dead:
+            self._alive -= dead
+            self.snakes = [s for s in self.snakes if s not in dead]
+
+        self.ticks += 1
+
+        return results
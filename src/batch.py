@@ -0,0 +1,226 @@
+import numpy as np
+
+from src.config import CELLS_IN_ROW
+from src.snake import Directions, Outcomes
+
+# Offsets of the head for every direction, indexed by ``Directions.value``.
+DIRECTION_DX = np.array([-1, 0, 1, 0])
+DIRECTION_DY = np.array([0, -1, 0, 1])
+
+KEEP_DIRECTION = -1
+
+
+class BatchGame:
+    """
+    Many games played in lockstep with stacked NumPy arrays.
+
+    Every game follows the rules of :obj:`src.game.Game` and
+    :meth:`src.snake.UnclePy.step`: the snake of length 3 is disposed from the
+    cell ``(cells_in_row - 4, 0)``, the head moves before the tail is released
+    (so the snake cannot move into its own tail), eaten food makes the snake
+    grow and is replaced by a new one. A game where no free cell is left for
+    the new food is over with :attr:`Outcomes.GAME_OVER`. Finished games are
+    reset automatically.
+
+    Attributes:
+        body: ``(games, rows, columns)`` boolean plane of snake cells.
+        food: ``(games, rows, columns)`` boolean plane of food cells.
+        ring: ``(games, cells)`` ring buffer of flat snake cell indices,
+            the head is at ``head_ptr`` and the tail is ``length - 1`` cells
+            before it.
+        food_cells: ``(games, food_count)`` flat indices of food cells.
+        food_values: ``(games, food_count)`` values of food cells.
+        directions: ``(games,)`` current ``Directions`` values.
+        scores: ``(games,)`` scores of the current episodes.
+        final_scores: ``(games,)`` scores of the last finished episodes.
+    """
+
+    def __init__(
+            self,
+            games: int,
+            grid_bounds: tuple = (CELLS_IN_ROW, CELLS_IN_ROW),
+            length: int = 3,
+            food_count: int = 2,
+            food_value: int = 3,
+            new_food_value: int = 2,
+            seed=None,
+    ):
+        """
+        Args:
+            games: count of games played together.
+            grid_bounds: count of cells in a row and in a column.
+            length: initial length of snakes.
+            food_count: count of food cells on every grid.
+            food_value: value of the initial food.
+            new_food_value: value of the food added instead of an eaten one.
+            seed: seed of the random generator.
+        """
+
+        self.games = games
+        self.cells_in_row, self.cells_in_column = grid_bounds
+        self.cells_count = self.cells_in_row * self.cells_in_column
+
+        self.initial_length = length
+        self.food_value = food_value
+        self.new_food_value = new_food_value
+
+        self.rng = np.random.default_rng(seed)
+        self._rows = np.arange(games)
+
+        self.body = np.zeros((games, self.cells_in_column, self.cells_in_row), dtype=bool)
+        self.food = np.zeros_like(self.body)
+        self._body_flat = self.body.reshape(games, self.cells_count)
+        self._food_flat = self.food.reshape(games, self.cells_count)
+
+        self.ring = np.zeros((games, self.cells_count), dtype=np.int64)
+        self.head_ptr = np.zeros(games, dtype=np.int64)
+        self.length = np.zeros(games, dtype=np.int64)
+
+        self.food_cells = np.zeros((games, food_count), dtype=np.int64)
+        self.food_values = np.zeros((games, food_count), dtype=np.int64)
+
+        self.directions = np.zeros(games, dtype=np.int64)
+        self.scores = np.zeros(games, dtype=np.int64)
+        self.final_scores = np.zeros(games, dtype=np.int64)
+        self.ticks = np.zeros(games, dtype=np.int64)
+
+        self.reset()
+
+    @property
+    def heads(self) -> np.ndarray:
+        """Flat indices of snake heads."""
+
+        return self.ring[self._rows, self.head_ptr]
+
+    @property
+    def tails(self) -> np.ndarray:
+        """Flat indices of snake tails."""
+
+        return self.ring[self._rows, (self.head_ptr - self.length + 1) % self.cells_count]
+
+    def reset(self, rows=None):
+        """Start new games in passed `rows`, all games are restarted by default."""
+
+        rows = self._rows if rows is None else np.asarray(rows)
+        if not rows.size:
+            return
+
+        self.body[rows] = False
+        self.food[rows] = False
+        self.scores[rows] = 0
+        self.ticks[rows] = 0
+
+        self._dispose_snakes(rows)
+
+        self.food_values[rows] = self.food_value
+        for slot in range(self.food_cells.shape[1]):
+            self._add_food(rows, np.full(rows.size, slot))
+
+    def step(self, actions=None):
+        """Move snakes of all games at once.
+
+        Args:
+            actions: ``(games,)`` ``Directions`` values, ``KEEP_DIRECTION``
+                keeps the current direction. Backward directions are ignored.
+
+        Returns:
+            :obj:`tuple`: ``Outcomes`` values, rewards and done flags of the games.
+        """
+
+        if actions is not None:
+            actions = np.asarray(actions)
+            turning = (actions != KEEP_DIRECTION) & (actions != (self.directions + 2) % 4)
+            self.directions[turning] = actions[turning]
+
+        heads = self.heads
+        new_x = heads % self.cells_in_row + DIRECTION_DX[self.directions]
+        new_y = heads // self.cells_in_row + DIRECTION_DY[self.directions]
+
+        hit_wall = (new_x < 0) | (new_x >= self.cells_in_row) | (new_y < 0) | (new_y >= self.cells_in_column)
+        new_heads = np.where(hit_wall, heads, new_y * self.cells_in_row + new_x)
+
+        hit_self = ~hit_wall & self._body_flat[self._rows, new_heads]
+        moving = ~(hit_wall | hit_self)
+        ate = moving & self._food_flat[self._rows, new_heads]
+
+        outcomes = np.full(self.games, Outcomes.MOVED.value)
+        outcomes[hit_wall] = Outcomes.HIT_WALL.value
+        outcomes[hit_self] = Outcomes.HIT_SELF.value
+        outcomes[ate] = Outcomes.ATE.value
+        rewards = np.zeros(self.games, dtype=np.int64)
+
+        rows = self._rows[moving]
+        self.head_ptr[rows] = (self.head_ptr[rows] + 1) % self.cells_count
+        self.ring[rows, self.head_ptr[rows]] = new_heads[rows]
+        self._body_flat[rows, new_heads[rows]] = True
+        self.ticks[rows] += 1
+
+        rows = self._rows[ate]
+        if rows.size:
+            slots = np.argmax(self.food_cells[rows] == new_heads[rows, None], axis=1)
+            rewards[rows] = self.food_values[rows, slots]
+            self.scores[rows] += rewards[rows]
+            self.length[rows] += 1
+            self._food_flat[rows, new_heads[rows]] = False
+
+            self.food_values[rows, slots] = self.new_food_value
+            full = rows[~self._add_food(rows, slots)]
+            moving[full] = False
+            outcomes[full] = Outcomes.GAME_OVER.value
+
+        rows = self._rows[moving & ~ate]
+        thrown_tails = self.ring[rows, (self.head_ptr[rows] - self.length[rows]) % self.cells_count]
+        self._body_flat[rows, thrown_tails] = False
+
+        dones = ~moving
+        self.final_scores[dones] = self.scores[dones]
+        self.reset(self._rows[dones])
+
+        return outcomes, rewards, dones
+
+    def _dispose_snakes(self, rows):
+        """Dispose snakes like :meth:`src.snake.UnclePy.get_dispose_cells` does for `Game`."""
+
+        tail_x, tail_y = self.cells_in_row - 4, 0
+        length = self.initial_length
+
+        good_directions = np.array([
+            tail_x - length > 1,
+            tail_y - length > 1,
+            tail_x + length < self.cells_in_row - 1,
+            tail_y + length < self.cells_in_column - 1,
+        ])
+        if not good_directions.any():
+            raise ValueError(f'Snake of length {length} cannot be disposed on the grid.')
+
+        noise = self.rng.random((rows.size, len(Directions)))
+        directions = np.argmax(np.where(good_directions, noise, -1), axis=1)
+
+        offsets = np.arange(length)
+        xs = tail_x + DIRECTION_DX[directions, None] * offsets
+        ys = tail_y + DIRECTION_DY[directions, None] * offsets
+        cells = ys * self.cells_in_row + xs
+
+        self.ring[rows, :length] = cells
+        self._body_flat[rows[:, None], cells] = True
+        self.head_ptr[rows] = length - 1
+        self.length[rows] = length
+        self.directions[rows] = directions
+
+    def _add_food(self, rows, slots) -> np.ndarray:
+        """Put food of given `slots` to random free cells of games in `rows`.
+
+        Returns:
+            :obj:`numpy.ndarray`: mask of `rows` where a free cell was found,
+            the game is over on a grid without free cells.
+        """
+
+        free = ~(self._body_flat[rows] | self._food_flat[rows])
+        noise = np.where(free, self.rng.random(free.shape), -1)
+        food_cells = np.argmax(noise, axis=1)
+        found = free.any(axis=1)
+
+        self.food_cells[rows[found], slots[found]] = food_cells[found]
+        self._food_flat[rows[found], food_cells[found]] = True
+
+        return found
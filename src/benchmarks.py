@@ -0,0 +1,244 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from types import SimpleNamespace
+
+from src.config import CELL_WIDTH, CELL_HEIGHT, MARGIN
+from src.grid.grid import BasicGrid
+from src.snake import UnclePy
+
+SIZES = (20, 60, 200, 500, 1000)
+SEED = 0
+
+# Stands in for pygame: ``draw`` only computes rects, so the grid code is timed alone.
+DUMMY_PYGAME = SimpleNamespace(draw=SimpleNamespace(rect=lambda screen, color, rect: rect))
+
+
+def create_grid(size, seed=SEED):
+    return BasicGrid(grid_info=(CELL_HEIGHT, CELL_WIDTH, MARGIN), grid_bounds=(size, size), rng=random.Random(seed))
+
+
+def create_game(size, seed=SEED):
+    grid = create_grid(size, seed)
+    snake = UnclePy(grid, grid.get_cell(size // 2, size // 2), 3, (255, 0, 0))
+    grid.add_food((100, 100, 0), 3)
+    grid.flush_changed()
+
+    return grid, snake
+
+
+def bench_construction(size):
+    return lambda: create_grid(size), 1
+
+
+def bench_get_cell(size):
+    grid = create_grid(size)
+    rng = random.Random(SEED)
+    coordinates = [(rng.randrange(size), rng.randrange(size)) for _ in range(1000)]
+
+    def get_cells():
+        for x, y in coordinates:
+            grid.get_cell(x, y)
+
+    return get_cells, len(coordinates)
+
+
+def bench_free_cells(size):
+    grid, _ = create_game(size)
+
+    return grid.free_cells, 1
+
+
+def bench_add_food(size):
+    grid, _ = create_game(size)
+
+    def add_food():
+        food = grid.add_food((0, 0, 255), 2)
+        grid.bring_back_cells(list(food.cells))
+
+    return add_food, 1
+
+
+def bench_clear(size):
+    grid, _ = create_game(size)
+
+    return grid.clear, 1
+
+
+def bench_draw(size):
+    grid, snake = create_game(size)
+    rng = random.Random(SEED)
+
+    def move():
+        directions = list(snake.safe_directions())
+        snake.step(rng.choice(directions) if directions else None)
+
+    def draw():
+        grid.draw(None, DUMMY_PYGAME)
+
+    return draw, 1, move
+
+
+def bench_full_draw(size):
+    grid, _ = create_game(size)
+
+    def full_draw():
+        grid.mark_all_changed()
+        grid.draw(None, DUMMY_PYGAME)
+
+    return full_draw, 1
+
+
+def bench_move(size):
+    state = {'over': True, 'moves': 0}
+    rng = random.Random(SEED)
+
+    def restart():
+        if state['over']:
+            state['grid'], state['snake'] = create_game(size, rng.random())
+            state['over'] = False
+
+    def moves():
+        snake = state['snake']
+        for move in range(1, 101):
+            state['moves'] = move
+            directions = list(snake.safe_directions())
+            if not directions or snake.step(rng.choice(directions)).outcome.terminal:
+                state['over'] = True
+                break
+
+    return moves, lambda: state['moves'], restart
+
+
+BENCHMARKS = {
+    'construction': bench_construction,
+    'get_cell': bench_get_cell,
+    'free_cells': bench_free_cells,
+    'add_food': bench_add_food,
+    'clear': bench_clear,
+    'draw': bench_draw,
+    'full_draw': bench_full_draw,
+    'move': bench_move,
+}
+
+
+def measure(func, repeat, operations=1, setup=None):
+    """Time `func` `repeat` times, `setup` is called before every run outside the timed region.
+
+    Args:
+        func: function to time.
+        repeat: count of runs.
+        operations: count of operations done by one run or a callable
+            returning the count done by the last run.
+        setup: function preparing a run.
+
+    Returns:
+        :obj:`list`: seconds of one operation in every run.
+    """
+
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+
+        timings.append(elapsed / (operations() if callable(operations) else operations))
+
+    return timings
+
+
+def run_benchmarks(names=None, sizes=SIZES, repeat=5):
+    """
+    Time the grid and snake hot paths.
+
+    Every benchmark builds a seeded scenario for a size and returns the function
+    to time, the count of operations it does and optionally a setup function
+    called before every run, see :func:`measure`.
+
+    Returns:
+        :obj:`list`: dicts with benchmark name, grid size and best and median
+        time of one operation in seconds.
+    """
+
+    results = []
+    for name in names or BENCHMARKS:
+        for size in sizes:
+            func, operations, *setup = BENCHMARKS[name](size)
+            timings = measure(func, repeat, operations, *setup)
+
+            results.append({
+                'name': name,
+                'size': size,
+                'repeat': repeat,
+                'best': min(timings),
+                'median': statistics.median(timings),
+            })
+
+    return results
+
+
+def compare(results, baseline, threshold=0.2):
+    """Yield results slower than the same ones in `baseline` by more than `threshold`."""
+
+    baseline = {(r['name'], r['size']): r for r in baseline}
+    for r in results:
+        previous = baseline.get((r['name'], r['size']))
+        if previous and r['best'] > previous['best'] * (1 + threshold):
+            yield r, r['best'] / previous['best']
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run():
+    parser = argparse.ArgumentParser(description='Benchmark grid and snake hot paths.')
+    parser.add_argument('benchmarks', nargs='*', help=f'benchmarks to run: {", ".join(BENCHMARKS)} (all by default)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', metavar='BASELINE', help='results file to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args()
+
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f'unknown benchmarks: {", ".join(sorted(unknown))}')
+
+    results = []
+    for r in run_benchmarks(args.benchmarks, args.sizes, args.repeat):
+        print(f'{r["name"]:>12} {r["size"]:>5}x{r["size"]:<5} best {r["best"] * 1e6:12.2f} us')
+        results.append(r)
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'commit': current_commit(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': results,
+        }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+        regressions = list(compare(results, baseline, args.threshold))
+        for r, ratio in regressions:
+            print(f'Regression: {r["name"]} {r["size"]}x{r["size"]} is {ratio:.2f} times slower')
+
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run()
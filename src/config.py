@@ -4,3 +4,7 @@ CELL_HEIGHT = 6
 MARGIN = 1
 
 FPS = 60
+
+# Iterations per second the snake speed is measured in:
+# at speed 1 the snake moves every FPS / LOOP_RATE seconds.
+LOOP_RATE = 500
@@ -0,0 +1,116 @@
+import numpy as np
+
+from src.config import CELLS_IN_ROW
+from src.food import Food
+from src.game import Game
+from src.snake import Directions
+
+BODY_PLANE, HEAD_PLANE, FOOD_PLANE = range(3)
+
+# Layout of the feature vector.
+FOOD_DISTANCE = 0
+FOOD_ANGLE = 1
+SAFE_DIRECTIONS = slice(2, 6)
+DIRECTION = slice(6, 10)
+LENGTH = 10
+FEATURES_COUNT = 11
+
+
+class SnakeEnv:
+    """
+    Gym-style environment around :obj:`src.game.Game`.
+
+    Observations are written in place to preallocated buffers and the same
+    arrays are returned by every :meth:`reset` and :meth:`step`:
+
+    * ``planes`` of shape ``(3, rows, columns)`` with body, head and food
+      planes, updated only at cells changed by the step;
+    * ``features`` vector, see the ``FOOD_DISTANCE`` .. ``LENGTH`` indices.
+
+    Note:
+        The environment consumes :meth:`src.grid.grid.BasicGrid.flush_changed`,
+        so the grid should not be drawn at the same time.
+    """
+
+    def __init__(self, grid_bounds: tuple = (CELLS_IN_ROW, CELLS_IN_ROW), seed=None, max_ticks=None):
+        """
+        Args:
+            grid_bounds: count of cells in a row and in a column.
+            seed: seed of the game random generator.
+            max_ticks: episodes are finished after this count of ticks if passed.
+        """
+
+        self.game = Game(grid_bounds=grid_bounds, seed=seed)
+        self.max_ticks = max_ticks
+
+        cells_in_row, cells_in_column = grid_bounds
+        self.planes = np.zeros((3, cells_in_column, cells_in_row), dtype=np.float32)
+        self.features = np.zeros(FEATURES_COUNT, dtype=np.float32)
+
+        self._head = None
+
+    @property
+    def observation(self) -> tuple:
+        return self.planes, self.features
+
+    def reset(self) -> tuple:
+        """Start a new episode.
+
+        Returns:
+            :obj:`tuple`: ``planes`` and ``features`` buffers.
+        """
+
+        self.game.dispose()
+        self.planes.fill(0)
+        self._head = None
+        self._update()
+
+        return self.observation
+
+    def step(self, action=None) -> tuple:
+        """Turn the snake to `action` and move it, a backward turn is ignored.
+
+        Args:
+            action: :obj:`Directions` or its value, ``None`` keeps the direction.
+
+        Returns:
+            :obj:`tuple`: observation, reward, done flag and info dict with
+            the step outcome.
+        """
+
+        if action is not None:
+            self.game.turn(Directions(action))
+
+        outcome, reward = self.game.step()
+        done = self.game.done or (self.max_ticks is not None and self.game.ticks >= self.max_ticks)
+
+        if not self.game.done:
+            self._update()
+
+        return self.observation, reward, done, {'outcome': outcome}
+
+    def _update(self):
+        snake = self.game.snake
+
+        for c in self.game.grid.flush_changed():
+            x, y = c.coordinates
+            self.planes[BODY_PLANE, y, x] = c.owner is snake
+            self.planes[FOOD_PLANE, y, x] = isinstance(c.owner, Food)
+
+        if self._head is not None:
+            self.planes[(HEAD_PLANE,) + self._head] = 0
+        head_x, head_y = snake.head.coordinates
+        self._head = head_y, head_x
+        self.planes[HEAD_PLANE, head_y, head_x] = 1
+
+        features = self.features
+        features.fill(0)
+        nearest_food = self.game.grid.food.nearest(head_x, head_y)
+        if nearest_food:
+            (distance, food_cell), = nearest_food
+            features[FOOD_DISTANCE] = distance
+            features[FOOD_ANGLE] = snake.get_food_angle(food_cell)
+        for d in snake.safe_directions():
+            features[SAFE_DIRECTIONS.start + d.value] = 1
+        features[DIRECTION.start + snake.direction.value] = 1
+        features[LENGTH] = len(snake.cells)
@@ -0,0 +1,346 @@
+import argparse
+import json
+import math
+import os
+from collections import namedtuple
+from multiprocessing import Pool, RawArray
+from os import cpu_count
+
+import numpy as np
+
+from src.game import Game
+from src.snake import Directions, Outcomes
+
+# Layout of the network input vector.
+FOOD_DISTANCE = 0
+FOOD_ANGLE_SIN = 1
+FOOD_ANGLE_COS = 2
+SAFE_DIRECTIONS = slice(3, 7)
+DIRECTION = slice(7, 11)
+INPUTS_COUNT = 11
+OUTPUTS_COUNT = len(Directions)
+
+HIDDEN = 16
+
+# Fitness of every survived tick, one score is worth 100 ticks.
+TICK_FITNESS = 0.01
+
+GenerationStats = namedtuple('GenerationStats', ['generation', 'best', 'mean'])
+
+
+def genome_size(hidden: int = HIDDEN) -> int:
+    """Return count of weights of a network with `hidden` neurons."""
+
+    return (INPUTS_COUNT + 1) * hidden + (hidden + 1) * OUTPUTS_COUNT
+
+
+class NeuralAgent:
+    """
+    Agent driven by a network with one hidden layer.
+
+    The network weights are views of the flat `genome`, so a genome read
+    from the shared population is used without copying.
+    """
+
+    def __init__(self, genome: np.ndarray, hidden: int = HIDDEN):
+        w1_end = INPUTS_COUNT * hidden
+        b1_end = w1_end + hidden
+        w2_end = b1_end + hidden * OUTPUTS_COUNT
+
+        self.w1 = genome[:w1_end].reshape(INPUTS_COUNT, hidden)
+        self.b1 = genome[w1_end:b1_end]
+        self.w2 = genome[b1_end:w2_end].reshape(hidden, OUTPUTS_COUNT)
+        self.b2 = genome[w2_end:]
+
+        self.inputs = np.zeros(INPUTS_COUNT, dtype=genome.dtype)
+
+    def __call__(self, game):
+        """Return the direction with the highest output, except the backward one."""
+
+        sense(game, self.inputs)
+
+        return Directions(int(self.act(self.inputs)))
+
+    def act(self, inputs: np.ndarray) -> np.ndarray:
+        """Return values of directions chosen for `inputs` written by :func:`sense`.
+
+        Inputs may be a batch with one row per game. The backward direction,
+        found by the direction inputs, is never chosen.
+        """
+
+        outputs = np.tanh(inputs @ self.w1 + self.b1) @ self.w2 + self.b2
+        outputs[np.roll(inputs[..., DIRECTION], 2, axis=-1) > 0] = -np.inf
+
+        return outputs.argmax(axis=-1)
+
+
+def sense(game, inputs: np.ndarray):
+    """Write sensors of the snake of `game` to the `inputs` vector."""
+
+    snake = game.snake
+    bounds = game.grid.bounds
+
+    inputs.fill(0)
+    if game.grid.food:
+        inputs[FOOD_DISTANCE] = snake.get_food_distance() / math.hypot(*bounds)
+        angle = snake.get_food_angle()
+        inputs[FOOD_ANGLE_SIN] = math.sin(angle)
+        inputs[FOOD_ANGLE_COS] = math.cos(angle)
+    for d in snake.safe_directions():
+        inputs[SAFE_DIRECTIONS.start + d.value] = 1
+    inputs[DIRECTION.start + snake.direction.value] = 1
+
+
+def play(agent, seed: int, grid_bounds: tuple, max_ticks: int, starve_ticks: int) -> float:
+    """Play a headless game seeded by `seed` and return the fitness of the `agent`.
+
+    The game is stopped after `max_ticks` ticks or when the snake does not eat
+    for `starve_ticks` ticks, so looping snakes are not rewarded forever.
+    """
+
+    game = Game(grid_bounds=grid_bounds, seed=seed)
+    game.dispose()
+
+    hungry = 0
+    while not game.done and game.ticks < max_ticks and hungry < starve_ticks:
+        outcome, _ = game.step(agent(game))
+
+        hungry = 0 if outcome is Outcomes.ATE else hungry + 1
+
+    return game.snake.scores + TICK_FITNESS * game.ticks
+
+
+_population = None
+
+
+def _init_worker(shared, population_size, hidden):
+    global _population
+
+    _population = np.frombuffer(shared, dtype=np.float32).reshape(population_size, genome_size(hidden))
+
+
+def evaluate_genomes(start: int, stop: int, seeds: list, grid_bounds: tuple, hidden: int,
+                     max_ticks: int, starve_ticks: int) -> tuple:
+    """Return mean fitness of genomes ``start .. stop - 1`` of the shared population.
+
+    Runs in a worker process: genomes are read from the shared memory block
+    mapped by the pool initializer, only their indices are sent.
+    """
+
+    fitness = []
+    for genome in _population[start:stop]:
+        agent = NeuralAgent(genome, hidden)
+        fitness.append(sum(play(agent, s, grid_bounds, max_ticks, starve_ticks) for s in seeds) / len(seeds))
+
+    return start, fitness
+
+
+class Trainer:
+    """
+    Genetic algorithm evolving weights of :obj:`NeuralAgent` networks.
+
+    The population is a float32 matrix of one genome per row kept in a
+    :func:`multiprocessing.RawArray`. Worker processes map the block once
+    when they start, so a generation sends only genome indices and seeds to
+    workers and gets fitness back. Workers never write the block and the
+    trainer writes the next generation only between evaluations, so no lock
+    is needed.
+
+    Every generation genomes play the same seeded games, the best ones are
+    kept as they are and the rest of the population is bred from the top
+    ones by uniform crossover and gaussian mutation.
+    """
+
+    def __init__(
+            self,
+            population_size: int = 1000,
+            hidden: int = HIDDEN,
+            grid_bounds: tuple = (20, 20),
+            games: int = 2,
+            max_ticks: int = 1000,
+            starve_ticks: int = 200,
+            elite: float = 0.02,
+            parents: float = 0.2,
+            mutation_rate: float = 0.1,
+            mutation_scale: float = 0.3,
+            workers: int = None,
+            chunk_size: int = 20,
+            checkpoint_dir: str = None,
+            seed=None,
+    ):
+        """
+        Args:
+            population_size: count of genomes.
+            hidden: count of hidden neurons of networks.
+            grid_bounds: count of cells in a row and in a column.
+            games: count of games played by every genome in a generation.
+            max_ticks: games are stopped after this count of ticks.
+            starve_ticks: games are stopped when the snake does not eat this count of ticks.
+            elite: share of the best genomes copied to the next generation.
+            parents: share of the best genomes breeding the next generation.
+            mutation_rate: probability of a weight to mutate.
+            mutation_scale: standard deviation of a mutation.
+            workers: count of worker processes, all cores are used by default.
+            chunk_size: count of genomes in one task.
+            checkpoint_dir: directory to save a checkpoint of every generation to.
+            seed: seed of the random generator.
+        """
+
+        self.population_size = population_size
+        self.hidden = hidden
+        self.grid_bounds = tuple(grid_bounds)
+        self.games = games
+        self.max_ticks = max_ticks
+        self.starve_ticks = starve_ticks
+        self.elite_count = max(1, round(elite * population_size))
+        self.parents_count = max(2, round(parents * population_size))
+        self.mutation_rate = mutation_rate
+        self.mutation_scale = mutation_scale
+        self.chunk_size = chunk_size
+        self.checkpoint_dir = checkpoint_dir
+
+        self.rng = np.random.default_rng(seed)
+        self.generation = 0
+        self.fitness = None
+
+        size = genome_size(hidden)
+        self._shared = RawArray('f', population_size * size)
+        self.population = np.frombuffer(self._shared, dtype=np.float32).reshape(population_size, size)
+        self.population[:] = self.rng.normal(0, 1, self.population.shape)
+
+        self.pool = Pool(workers or cpu_count(), _init_worker, (self._shared, population_size, hidden))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    @property
+    def best(self) -> np.ndarray:
+        """Genome of the best evaluated network."""
+
+        return self.population[np.argmax(self.fitness)]
+
+    def evaluate(self) -> np.ndarray:
+        """Play games with every genome on the pool and return their fitness."""
+
+        seeds = self.rng.integers(2 ** 32, size=self.games).tolist()
+        chunks = [
+            (start, min(start + self.chunk_size, self.population_size), seeds,
+             self.grid_bounds, self.hidden, self.max_ticks, self.starve_ticks)
+            for start in range(0, self.population_size, self.chunk_size)
+        ]
+
+        fitness = np.zeros(self.population_size)
+        for start, chunk_fitness in self.pool.starmap(evaluate_genomes, chunks):
+            fitness[start:start + len(chunk_fitness)] = chunk_fitness
+
+        return fitness
+
+    def breed(self, fitness: np.ndarray):
+        """Replace the population by the next generation bred according to `fitness`."""
+
+        parents = self.population[np.argsort(-fitness)[:self.parents_count]]
+
+        children_count = self.population_size - self.elite_count
+        first = parents[self.rng.integers(self.parents_count, size=children_count)]
+        second = parents[self.rng.integers(self.parents_count, size=children_count)]
+
+        children = np.where(self.rng.random(first.shape) < 0.5, first, second)
+        mutated = self.rng.random(children.shape) < self.mutation_rate
+        children += mutated * self.rng.normal(0, self.mutation_scale, children.shape).astype(np.float32)
+
+        self.population[:self.elite_count] = parents[:self.elite_count]
+        self.population[self.elite_count:] = children
+
+    def step(self) -> GenerationStats:
+        """Evaluate the population, save a checkpoint and breed the next generation."""
+
+        self.fitness = self.evaluate()
+        stats = GenerationStats(self.generation, float(self.fitness.max()), float(self.fitness.mean()))
+
+        if self.checkpoint_dir is not None:
+            self.save_checkpoint(os.path.join(self.checkpoint_dir, f'generation_{self.generation:04d}.npz'))
+
+        self.breed(self.fitness)
+        self.generation += 1
+
+        return stats
+
+    def run(self, generations: int):
+        """Evolve the population for `generations` generations.
+
+        Yields:
+            :obj:`GenerationStats`: fitness of every evaluated generation.
+        """
+
+        for _ in range(generations):
+            yield self.step()
+
+    def save_checkpoint(self, path: str):
+        """Save the evaluated population with its fitness and the random generator state."""
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        np.savez(
+            path,
+            population=self.population,
+            fitness=self.fitness,
+            generation=self.generation,
+            rng_state=json.dumps(self.rng.bit_generator.state),
+        )
+
+    def load_checkpoint(self, path: str):
+        """Continue training from the checkpoint saved by :meth:`save_checkpoint`.
+
+        The checkpointed generation is bred again, so training goes on as if
+        it was not interrupted.
+        """
+
+        with np.load(path) as checkpoint:
+            self.population[:] = checkpoint['population']
+            self.fitness = checkpoint['fitness']
+            self.generation = int(checkpoint['generation'])
+            self.rng.bit_generator.state = json.loads(str(checkpoint['rng_state']))
+
+        self.breed(self.fitness)
+        self.generation += 1
+
+
+def run():
+    parser = argparse.ArgumentParser(description='Evolve networks playing the snake.')
+    parser.add_argument('--population', type=int, default=1000)
+    parser.add_argument('--generations', type=int, default=50)
+    parser.add_argument('--hidden', type=int, default=HIDDEN)
+    parser.add_argument('--size', type=int, default=20)
+    parser.add_argument('--games', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--checkpoint-dir', default='checkpoints')
+    parser.add_argument('--resume', metavar='CHECKPOINT', help='checkpoint to continue training from')
+    args = parser.parse_args()
+
+    with Trainer(
+            population_size=args.population,
+            hidden=args.hidden,
+            grid_bounds=(args.size, args.size),
+            games=args.games,
+            workers=args.workers,
+            checkpoint_dir=args.checkpoint_dir,
+            seed=args.seed,
+    ) as trainer:
+        if args.resume:
+            trainer.load_checkpoint(args.resume)
+
+        for stats in trainer.run(args.generations):
+            print(f'generation {stats.generation}: best={stats.best:.2f}, mean={stats.mean:.2f}')
+
+
+if __name__ == "__main__":
+    run()
@@ -1,3 +1,6 @@
+import heapq
+from math import sqrt
+
 # from src.grid.grid import BasicGrid
 from src.grid.structure import GridStructure
 
@@ -5,6 +8,9 @@ from src.grid.structure import GridStructure
 class Food(GridStructure):
     """
         Manage a food on the grid.
+
+        Cells of the food are registered in the grid :obj:`FoodRegistry`
+        while the food owns them.
     """
 
     def __init__(self, grid, cell, color: tuple, value: int):
@@ -12,3 +18,118 @@ class Food(GridStructure):
 
         self.value = value
         self.char_label = 'f'
+
+    def attach(self, cell):
+        super().attach(cell)
+        self.grid.food.add(cell)
+
+    def detach(self, cell):
+        position = super().detach(cell)
+        self.grid.food.remove(cell)
+
+        return position
+
+    def reattach(self, cell, position):
+        super().reattach(cell, position)
+        self.grid.food.add(cell)
+
+
+class FoodRegistry:
+    """
+    Spatial index of food cells on the grid.
+
+    Cells are bucketed by coordinates into square buckets of `bucket_size`
+    cells, so nearest food queries check only buckets around the passed point
+    instead of all the grid.
+    """
+
+    def __init__(self, bucket_size: int = 8):
+        self.bucket_size = bucket_size
+
+        self._buckets = {}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return (c for bucket in self._buckets.values() for c in bucket.values())
+
+    def __contains__(self, cell):
+        return cell.coordinates in self._buckets.get(self._bucket_key(*cell.coordinates), ())
+
+    def add(self, cell):
+        self._buckets.setdefault(self._bucket_key(*cell.coordinates), {})[cell.coordinates] = cell
+        self._count += 1
+
+    def remove(self, cell):
+        key = self._bucket_key(*cell.coordinates)
+
+        bucket = self._buckets[key]
+        del bucket[cell.coordinates]
+        if not bucket:
+            del self._buckets[key]
+
+        self._count -= 1
+
+    def nearest(self, x: int, y: int, count: int = 1) -> list:
+        """Find food cells nearest to the point.
+
+        Buckets are checked ring by ring around the bucket of the point. Food
+        beyond the ring ``r`` is at least ``r * bucket_size`` far, so the
+        search stops as soon as `count` cells closer than that are found.
+        Once a ring has more keys than there are occupied buckets, the
+        occupied buckets outside the checked rings are scanned directly, so
+        empty space around sparse food is not walked.
+
+        Args:
+            x: grid x coordinate of the point.
+            y: grid y coordinate of the point.
+            count: count of cells to find.
+
+        Returns:
+            :obj:`list`: pairs of euclidean distance and cell sorted by distance,
+            shorter if there is less food on the grid.
+        """
+
+        center_x, center_y = self._bucket_key(x, y)
+
+        found = []
+        visited = 0
+        ring = 0
+        while visited < self._count:
+            if len(found) >= count and heapq.nsmallest(count, found)[-1][0] <= (ring - 1) * self.bucket_size:
+                break
+
+            if 8 * ring > len(self._buckets):
+                buckets = (
+                    bucket for (b_x, b_y), bucket in self._buckets.items()
+                    if max(abs(b_x - center_x), abs(b_y - center_y)) >= ring
+                )
+            else:
+                buckets = (self._buckets.get(key, {}) for key in self._ring_keys(center_x, center_y, ring))
+
+            for bucket in buckets:
+                for (f_x, f_y), cell in bucket.items():
+                    found.append((sqrt((x - f_x) ** 2 + (y - f_y) ** 2), f_x, f_y, cell))
+                    visited += 1
+
+            ring += 1
+
+        return [(distance, cell) for distance, *_, cell in heapq.nsmallest(count, found)]
+
+    def _bucket_key(self, x, y):
+        return x // self.bucket_size, y // self.bucket_size
+
+    @staticmethod
+    def _ring_keys(center_x, center_y, ring):
+        if not ring:
+            yield center_x, center_y
+            return
+
+        for dx in range(-ring, ring + 1):
+            yield center_x + dx, center_y - ring
+            yield center_x + dx, center_y + ring
+        for dy in range(-ring + 1, ring):
+            yield center_x - ring, center_y + dy
+            yield center_x + ring, center_y + dy
@@ -0,0 +1,278 @@
+import random
+from collections import namedtuple
+
+from src.config import CELL_WIDTH, CELL_HEIGHT, MARGIN, CELLS_IN_ROW
+from src.food import Food
+from src.grid.grid import BasicGrid
+from src.scheduler import TimingWheel, move_delay
+from src.snake import UnclePy, Outcomes, StepResult
+
+SNAKE_COLOR = (255, 0, 0)
+
+GameSnapshot = namedtuple('GameSnapshot', ['journal_size', 'snake', 'ticks', 'done', 'random_state'])
+GameState = namedtuple('GameState', ['body', 'occupancy', 'food', 'snake', 'ticks', 'done', 'random_state'])
+
+
+class Game:
+    """
+    Pure simulation of the game.
+
+    Holds the grid, the snake and the food and advances them one tick at
+    a time. There is no display, input or clock here, so the game can be
+    stepped as fast as the grid code allows; see :obj:`src.manager.GameManager`
+    for the interactive adapter.
+
+    Search agents fork the game with :meth:`snapshot` and :meth:`restore`:
+    the grid journals ownership changes made after the first snapshot, so
+    taking a snapshot is O(1) and restoring it costs O(changed cells).
+    :meth:`state` and :meth:`load_state` give a compact standalone copy of
+    the game which can be stored or sent to another process.
+
+    Besides direct :meth:`tick` calls the game can be driven by
+    :meth:`advance`: the snake and any other scheduled callbacks are called
+    by a :obj:`src.scheduler.TimingWheel` when their deadlines come, so
+    entities may move at independent and changing speeds.
+    """
+
+    def __init__(
+            self,
+            grid_bounds: tuple = (CELLS_IN_ROW, CELLS_IN_ROW),
+            grid_info: tuple = (CELL_WIDTH, CELL_HEIGHT, MARGIN),
+            grid_class=BasicGrid,
+            seed=None,
+    ):
+        """
+        Args:
+            grid_bounds: count of cells in a row and in a column.
+            grid_info: cell width, cell height and margin used for drawing.
+            grid_class: grid implementation to use.
+            seed: seed of the random generator placing the snake and the food.
+        """
+
+        self.grid = grid_class(grid_info=grid_info, grid_bounds=grid_bounds, rng=random.Random(seed))
+        self.snake = None
+        self.scheduler = TimingWheel()
+
+        self.ticks = 0
+        self.done = False
+
+    def dispose(self):
+        """Place the snake and the food on the cleared grid."""
+
+        self.grid.stop_journal()
+        self.grid.clear()
+
+        self.snake = UnclePy(
+            grid=self.grid,
+            cell=self.grid.get_cell(self.grid.bounds.cells_in_row - 4, 0),
+            length=3,
+            color=SNAKE_COLOR,
+        )
+
+        self.grid.add_food((100, 100, 0), 3)
+        self.grid.add_food((100, 100, 0), 3)
+
+        self.ticks = 0
+        self.done = False
+
+        self.scheduler = TimingWheel()
+        self.schedule(self._move_snake, move_delay(self.snake.speed))
+
+    def schedule(self, callback, delay: int):
+        """Call `callback` with the game in `delay` scheduler ticks.
+
+        The callback returns a delay of its next call or ``None`` to stop.
+        """
+
+        self.scheduler.schedule(callback, delay)
+
+    def advance(self) -> list:
+        """Advance the scheduler by one tick and call callbacks due on it.
+
+        Returns:
+            :obj:`list`: called callbacks.
+        """
+
+        due = self.scheduler.advance()
+
+        for callback in due:
+            if self.done:
+                break
+
+            delay = callback(self)
+            if delay is not None:
+                self.scheduler.schedule(callback, delay)
+
+        return due
+
+    def _move_snake(self, game):
+        self.step()
+
+        return None if self.done else move_delay(self.snake.speed)
+
+    def turn(self, direction) -> bool:
+        """Change the snake direction, ignoring backward moves.
+
+        Returns:
+            :obj:`bool`: whether the direction was accepted.
+        """
+
+        return self.snake.turn(direction)
+
+    def tick(self, direction=None) -> bool:
+        """Advance the game by one snake move.
+
+        Args:
+            direction: new direction of the snake, the current one is kept if
+                it is ``None`` or backward.
+
+        Returns:
+            :obj:`bool`: ``False`` if the game is over.
+        """
+
+        if self.done:
+            return False
+
+        if direction is not None:
+            self.turn(direction)
+
+        self.step()
+
+        return not self.done
+
+    def step(self, direction=None) -> StepResult:
+        """Advance the game by one snake move without raising on game over.
+
+        A backward `direction` is reported as :attr:`Outcomes.ILLEGAL_TURN`
+        and does not advance the game, neither does any step after the game
+        is over, which is reported as :attr:`Outcomes.GAME_OVER`.
+
+        Returns:
+            :obj:`StepResult`: outcome of the move and scores gained by it.
+        """
+
+        if self.done:
+            return StepResult(Outcomes.GAME_OVER, 0)
+
+        result = self.snake.step(direction)
+
+        if result.outcome is not Outcomes.ILLEGAL_TURN:
+            self.ticks += 1
+            self.done = result.outcome.terminal
+
+        return result
+
+    def run(self, agent, max_ticks=None) -> int:
+        """Play the game until it is over, asking `agent` for a direction every tick.
+
+        Args:
+            agent: callable taking the game and returning a direction or ``None``.
+            max_ticks: stop after this count of ticks if passed.
+
+        Returns:
+            :obj:`int`: count of played ticks.
+        """
+
+        while not self.done and (max_ticks is None or self.ticks < max_ticks):
+            self.tick(agent(self))
+
+        return self.ticks
+
+    def snapshot(self) -> GameSnapshot:
+        """Remember the current state of the game to :meth:`restore` it later.
+
+        Note:
+            Scheduled callbacks are not a part of the snapshot.
+
+        Returns:
+            :obj:`GameSnapshot`: mark in the grid journal and the snake,
+            game and random generator state.
+        """
+
+        return GameSnapshot(
+            journal_size=self.grid.start_journal(),
+            snake=self.snake.dump_state(),
+            ticks=self.ticks,
+            done=self.done,
+            random_state=self.grid.random.getstate(),
+        )
+
+    def restore(self, snapshot: GameSnapshot):
+        """Return the game to the state of the `snapshot`.
+
+        Snapshots taken after the restored one become invalid, while the
+        restored one and earlier ones can be restored again.
+        """
+
+        self.grid.rollback(snapshot.journal_size)
+
+        self.snake.load_state(snapshot.snake)
+        self.ticks = snapshot.ticks
+        self.done = snapshot.done
+        self.grid.random.setstate(snapshot.random_state)
+
+    def release_snapshots(self):
+        """Stop journaling grid changes, invalidating all taken snapshots."""
+
+        self.grid.stop_journal()
+
+    def state(self) -> GameState:
+        """Return a compact copy of the game state independent of the grid.
+
+        Returns:
+            :obj:`GameState`: snake cells from the tail to the head, the bitset
+            of cells occupied by the snake in row-major order, ``(x, y, value,
+            color)`` of each food sorted by coordinates, and the snake, game and
+            random generator state.
+        """
+
+        cells_in_row = self.grid.bounds.cells_in_row
+        cells_count = cells_in_row * self.grid.bounds.cells_in_column
+
+        body = tuple(c.coordinates for c in self.snake.cells)
+
+        occupancy = bytearray((cells_count + 7) // 8)
+        for x, y in body:
+            index = y * cells_in_row + x
+            occupancy[index >> 3] |= 1 << (index & 7)
+
+        food = tuple(sorted((*c.coordinates, c.owner.value, c.owner.color) for c in self.grid.food))
+
+        return GameState(
+            body=body,
+            occupancy=bytes(occupancy),
+            food=food,
+            snake=self.snake.dump_state(),
+            ticks=self.ticks,
+            done=self.done,
+            random_state=self.grid.random.getstate(),
+        )
+
+    def load_state(self, state: GameState):
+        """Rebuild the game from the `state` returned by :meth:`state`.
+
+        Note:
+            Taken snapshots are invalidated and the snake is scheduled anew.
+        """
+
+        self.grid.stop_journal()
+        self.grid.clear()
+
+        self.snake = UnclePy.from_cells(
+            grid=self.grid,
+            cells=self.grid.get_cells(state.body),
+            direction=state.snake.direction,
+            color=SNAKE_COLOR,
+        )
+        self.snake.load_state(state.snake)
+
+        for x, y, value, color in state.food:
+            Food(self.grid, self.grid.get_cell(x, y), color, value)
+
+        self.ticks = state.ticks
+        self.done = state.done
+        self.grid.random.setstate(state.random_state)
+
+        self.scheduler = TimingWheel()
+        if not self.done:
+            self.schedule(self._move_snake, move_delay(self.snake.speed))
@@ -2,6 +2,8 @@ from src.grid.structure import GridStructure
 
 
 class GridCell:
+    __slots__ = ('coordinates', 'owner', 'changed')
+
     def __init__(self, coordinates: tuple, owner: GridStructure = None):
         self.coordinates = coordinates
         self.owner = owner
@@ -10,15 +12,21 @@ class GridCell:
     def __eq__(self, other):
         return self.coordinates == other.coordinates
 
+    def __hash__(self):
+        return hash(self.coordinates)
+
     @property
     def color(self):
         return self.owner.color
 
     def occupy(self, new_owner):
-        if self.owner:
-            self.owner.cells.remove(self)
+        old_owner = self.owner
+        position = old_owner.detach(self) if old_owner else None
 
         self.owner = new_owner
-        self.owner.cells.append(self)
+        new_owner.attach(self)
 
-        self.changed = True
+        grid = new_owner.grid
+        if grid.journal is not None:
+            grid.journal.append((self, old_owner, position))
+        grid.mark_changed(self)
@@ -0,0 +1,242 @@
+import random
+from array import array
+
+from src.grid.cell import GridCell
+from src.grid.grid import BasicGrid
+from src.grid.structure import FreeSpace
+
+NOT_IN_SET = 0xFFFFFFFF
+
+
+class CompactGridCell(GridCell):
+    """
+    Lightweight view of a cell stored in the :obj:`CompactGrid` arrays.
+
+    Views are created on demand and keep only the grid and the cell index,
+    the owner and the changed flag are read from and written to the grid.
+    """
+
+    __slots__ = ('grid', 'index')
+
+    def __init__(self, grid, index: int):
+        self.grid = grid
+        self.index = index
+
+    @property
+    def coordinates(self):
+        y, x = divmod(self.index, self.grid.bounds.cells_in_row)
+
+        return x, y
+
+    @property
+    def owner(self):
+        return self.grid.get_owner(self.grid.owner_ids[self.index])
+
+    @owner.setter
+    def owner(self, new_owner):
+        self.grid.set_owner(self.index, new_owner)
+
+    @property
+    def changed(self):
+        return bool(self.grid.changed_flags[self.index])
+
+    @changed.setter
+    def changed(self, value):
+        self.grid.changed_flags[self.index] = value
+
+
+class CompactCellSet:
+    """
+    :obj:`src.grid.structure.CellSet` counterpart holding cell indices of
+    a :obj:`CompactGrid` in typed arrays instead of cell objects.
+    """
+
+    def __init__(self, grid, indices=()):
+        self.grid = grid
+        self._indices = array('I', indices)
+
+        self._positions = array('I', [NOT_IN_SET]) * len(grid.owner_ids)
+        for position, index in enumerate(self._indices):
+            self._positions[index] = position
+
+    @classmethod
+    def full(cls, grid):
+        """Create a set containing every cell of the `grid`."""
+
+        cell_set = cls(grid)
+        cell_set._indices = array('I', range(len(grid.owner_ids)))
+        cell_set._positions = array('I', cell_set._indices)
+
+        return cell_set
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __iter__(self):
+        return (CompactGridCell(self.grid, i) for i in self._indices)
+
+    def __getitem__(self, position):
+        return CompactGridCell(self.grid, self._indices[position])
+
+    def __contains__(self, cell):
+        return self._positions[cell.index] != NOT_IN_SET
+
+    def append(self, cell):
+        self._positions[cell.index] = len(self._indices)
+        self._indices.append(cell.index)
+
+    def remove(self, cell) -> int:
+        position = self._positions[cell.index]
+        if position == NOT_IN_SET:
+            raise ValueError(f'{cell} is not in the set.')
+
+        last = self._indices.pop()
+        if position < len(self._indices):
+            self._indices[position] = last
+            self._positions[last] = position
+
+        self._positions[cell.index] = NOT_IN_SET
+
+        return position
+
+    def restore(self, cell, position: int):
+        if position < len(self._indices):
+            last = self._indices[position]
+            self._positions[last] = len(self._indices)
+            self._indices.append(last)
+
+            self._indices[position] = cell.index
+            self._positions[cell.index] = position
+        else:
+            self.append(cell)
+
+    def sample(self, rng=random):
+        """Return a random cell of the set.
+
+        Raises:
+            IndexError: if the set is empty.
+        """
+
+        return CompactGridCell(self.grid, rng.choice(self._indices))
+
+
+class CompactCells:
+    """Read-only sequence of all cells of a :obj:`CompactGrid` in row-major order."""
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def __len__(self):
+        return len(self.grid.owner_ids)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('cell index out of range')
+
+        return CompactGridCell(self.grid, index)
+
+    def __iter__(self):
+        return (CompactGridCell(self.grid, i) for i in range(len(self)))
+
+
+class CompactGrid(BasicGrid):
+    """
+    Grid keeping owner ids and changed flags of its cells in flat typed arrays.
+
+    It has the same interface as :obj:`BasicGrid`, but does not hold a
+    :obj:`GridCell` object per cell: cells are :obj:`CompactGridCell` views
+    created on demand, so memory is a few bytes per cell.
+
+    Owner ids are counted by cells: when an owner gives back its last cell
+    its id is released and reused by the next registered owner, so eaten
+    food does not stay referenced by the grid.
+    """
+
+    def __init__(self, grid_info: tuple, grid_bounds: tuple, rng=None):
+        self._owners = [None]
+        self._owner_ids = {None: 0}
+        self._owner_counts = [0]
+        self._free_owner_ids = []
+
+        super().__init__(grid_info, grid_bounds, rng)
+
+    def register_owner(self, owner) -> int:
+        """Return an id of the `owner` stored in cell arrays, registering it if needed."""
+
+        try:
+            return self._owner_ids[owner]
+        except KeyError:
+            pass
+
+        if self._free_owner_ids:
+            owner_id = self._free_owner_ids.pop()
+            self._owners[owner_id] = owner
+        else:
+            owner_id = len(self._owners)
+            self._owners.append(owner)
+            self._owner_counts.append(0)
+
+        self._owner_ids[owner] = owner_id
+
+        return owner_id
+
+    def set_owner(self, index: int, owner):
+        """Give the cell `index` to the `owner`, releasing the id of the previous owner if it has no cells left."""
+
+        owner_id = self.register_owner(owner)
+        previous_id = self.owner_ids[index]
+
+        self.owner_ids[index] = owner_id
+        self._owner_counts[owner_id] += 1
+        self._owner_counts[previous_id] -= 1
+
+        if previous_id and not self._owner_counts[previous_id]:
+            del self._owner_ids[self._owners[previous_id]]
+            self._owners[previous_id] = None
+            self._free_owner_ids.append(previous_id)
+
+    @property
+    def owners_count(self) -> int:
+        """Count of owners holding cells of the grid."""
+
+        return len(self._owner_ids) - 1
+
+    def get_owner(self, owner_id: int):
+        return self._owners[owner_id]
+
+    def get_owner_cells(self, owner) -> list:
+        owner_id = self._owner_ids.get(owner)
+
+        return [CompactGridCell(self, i) for i, o in enumerate(self.owner_ids) if o == owner_id]
+
+    def get_foreign_cells(self, owner) -> list:
+        owner_id = self._owner_ids.get(owner)
+
+        return [CompactGridCell(self, i) for i, o in enumerate(self.owner_ids) if o != owner_id]
+
+    def clear(self):
+        """Set all cells in the grid to default color."""
+
+        [c.occupy(self.main_structure) for c in self.get_foreign_cells(self.main_structure)]
+        self.mark_all_changed()
+
+    def _create_grid_cells(self):
+        cells_count = self.bounds.cells_in_row * self.bounds.cells_in_column
+
+        self.owner_ids = array('I', [0]) * cells_count
+        self.changed_flags = bytearray(cells_count)
+
+        return CompactCells(self)
+
+    def _create_main_structure(self):
+        main_structure = FreeSpace(self, [], self.color)
+
+        main_structure.cells = CompactCellSet.full(self)
+        owner_id = self.register_owner(main_structure)
+        self.owner_ids[:] = array('I', [owner_id]) * len(self.owner_ids)
+        self._owner_counts[owner_id] = len(self.owner_ids)
+        self.mark_all_changed()
+
+        return main_structure
@@ -1,11 +1,11 @@
 import itertools
 import random
-from collections import namedtuple
+from collections import namedtuple, deque
 
 from src.exceptions.grid_exceptions import OutOfGridBoundsError
-from src.food import Food
+from src.food import Food, FoodRegistry
 from src.grid.cell import GridCell
-from src.grid.structure import GridStructure
+from src.grid.structure import GridStructure, FreeSpace
 from src.snake import UnclePy
 
 GridBounds = namedtuple('GridBounds', ['cells_in_row', 'cells_in_column'])
@@ -20,20 +20,32 @@ class BasicGrid:
             self,
             grid_info: tuple,
             grid_bounds: tuple,
+            rng=None,
     ):
         """
         Initializes grid properties.
 
         Args:
-
+            grid_info: cell height, cell width and margin in pixels.
+            grid_bounds: count of cells in a row and in a column.
+            rng: :obj:`random.Random` used to place the food and the snakes,
+                the :mod:`random` module is used by default.
         """
 
         self.cell_height, self.cell_width, self.cell_margin = grid_info
         self.bounds = GridBounds(*grid_bounds)
         self.color = (10, 0, 0)
+        self.random = rng if rng is not None else random
+        self.food = FoodRegistry()
+
+        self._changed_cells = deque()
+        self._all_changed = False
+
+        # Ownership changes recorded while it is not None, see :meth:`rollback`.
+        self.journal = None
 
         self._cells = self._create_grid_cells()
-        self.main_structure = GridStructure(self, self._cells, self.color)
+        self.main_structure = self._create_main_structure()
 
     def __repr__(self):
         res = ''
@@ -54,30 +66,33 @@ class BasicGrid:
         return self._cells
 
     def add_food(self, color, value):
-        food_cell = random.choice(self.free_cells())
+        food_cell = self.main_structure.cells.sample(self.random)
 
         return Food(self, food_cell, color, value)
 
     def add_snake(self, length, color):
-        free_cell = random.choice(self.free_cells())
+        free_cell = self.main_structure.cells.sample(self.random)
 
         return UnclePy(self, free_cell, length, color)
 
-    def draw(self, screen, pygame):
+    def draw(self, screen, pygame) -> list:
         """
-        Draw the grid on the screen using pygame object.
+        Draw changed cells of the grid on the screen using pygame object.
 
         Args:
             :obj:`screen`: specified the screen where a snake will be drawn.
             :obj:`pygame`: used to call ``draw`` method.
-        """
 
-        changed_cells = [c for c in self.cells if c.changed]
+        Returns:
+            :obj:`list`: rects painted on the screen, ready to be passed to
+            ``pygame.display.update``.
+        """
 
-        for c in changed_cells:
+        rects = []
+        for c in self.flush_changed():
             x, y = c.coordinates
 
-            pygame.draw.rect(
+            rects.append(pygame.draw.rect(
                 screen,
                 c.color,
                 [
@@ -86,11 +101,80 @@ class BasicGrid:
                     self.cell_width,
                     self.cell_height
                 ]
-            )
+            ))
+
+        return rects
+
+    def mark_changed(self, cell: GridCell):
+        """Mark the `cell` as changed and queue it for the next :meth:`flush_changed`."""
+
+        if not cell.changed:
+            cell.changed = True
+            self._changed_cells.append(cell)
+
+    def mark_all_changed(self):
+        """Make the next :meth:`flush_changed` return every cell of the grid."""
 
+        self._all_changed = True
+
+    def start_journal(self) -> int:
+        """Start recording ownership changes of cells if it is not started yet.
+
+        Returns:
+            :obj:`int`: size of the journal to pass to :meth:`rollback`.
+        """
+
+        if self.journal is None:
+            self.journal = []
+
+        return len(self.journal)
+
+    def stop_journal(self):
+        """Stop recording ownership changes and forget the recorded ones."""
+
+        self.journal = None
+
+    def rollback(self, journal_size: int):
+        """Undo ownership changes recorded after the journal had `journal_size` entries.
+
+        Changes are undone in reverse order, so structures get their cells back
+        in the same order, including the order of free cells.
+        """
+
+        journal, self.journal = self.journal, None
+
+        while len(journal) > journal_size:
+            cell, old_owner, position = journal.pop()
+
+            cell.owner.detach(cell)
+            cell.owner = old_owner
+            if old_owner is not None:
+                old_owner.reattach(cell, position)
+
+            self.mark_changed(cell)
+
+        self.journal = journal
+
+    def changed_cells_count(self) -> int:
+        """Return count of cells the next :meth:`flush_changed` will return."""
+
+        return len(self.cells) if self._all_changed else len(self._changed_cells)
+
+    def flush_changed(self) -> list:
+        """Return cells changed since the previous call and reset their `changed` flags."""
+
+        if self._all_changed:
+            changed_cells = list(self.cells)
+            self._all_changed = False
+        else:
+            changed_cells = list(self._changed_cells)
+
+        self._changed_cells.clear()
         for c in changed_cells:
             c.changed = False
 
+        return changed_cells
+
     def get_owner_cells(self, owner: GridStructure) -> list:
         return [c for c in self.cells if c.owner is owner]
 
@@ -98,21 +182,34 @@ class BasicGrid:
         return [c for c in self.cells if c.owner is not owner]
 
     def get_cell(self, grid_x: int, grid_y: int) -> GridCell:
-        try:
-            cell = next(c for c in self.cells if c.coordinates == (grid_x, grid_y))
-        except StopIteration:
+        """
+        Return the cell placed at passed grid coordinates.
+
+        Raises:
+            OutOfGridBoundsError: if coordinates are beyond the grid bounds.
+        """
+
+        if not self.in_bounds(grid_x, grid_y):
             raise OutOfGridBoundsError(f'You cannot get cell with coordinates ({grid_x}, {grid_y}).')
 
-        return cell
+        return self._cells[grid_y * self.bounds.cells_in_row + grid_x]
 
     def get_cells(self, coordinates: list) -> list:
         return [self.get_cell(*coord) for coord in coordinates]
 
+    def in_bounds(self, grid_x: int, grid_y: int) -> bool:
+        """Check whether passed grid coordinates are inside the grid."""
+
+        return 0 <= grid_x < self.bounds.cells_in_row and 0 <= grid_y < self.bounds.cells_in_column
+
     def food_cells(self):
-        return [c for c in self.cells if c.owner.__class__ is Food]
+        return list(self.food)
 
     def free_cells(self):
-        return [c for c in self.cells if self.is_free_cell(c)]
+        return list(self.main_structure.cells)
+
+    def free_cells_count(self) -> int:
+        return len(self.main_structure.cells)
 
     def is_free_cell(self, cell):
         return cell.owner is self.main_structure
@@ -163,11 +260,16 @@ class BasicGrid:
         return cell_x, cell_y
 
     def _create_grid_cells(self):
+        """Create cells in row-major order, so the cell (x, y) has index ``y * cells_in_row + x``."""
+
         x_indices = range(self.bounds.cells_in_row)
         y_indices = range(self.bounds.cells_in_column)
-        index_combinations = itertools.product(x_indices, y_indices)
+        index_combinations = itertools.product(y_indices, x_indices)
         cells = [GridCell((x, y)) for y, x in index_combinations]
 
         return cells
 
+    def _create_main_structure(self):
+        return FreeSpace(self, self._cells, self.color)
+
 # http://sphinxcontrib-napoleon.readthedocs.io/en/latest/example_google.html
@@ -0,0 +1,206 @@
+from src.exceptions.grid_exceptions import OutOfGridBoundsError
+from src.grid.cell import GridCell
+from src.grid.grid import BasicGrid
+from src.grid.structure import FreeSpace
+
+# Random cells tried by :meth:`SparseFreeCells.sample` before it lists all free cells.
+SAMPLE_ATTEMPTS = 64
+
+
+class SparseGridCell(GridCell):
+    """
+    Cell of a :obj:`SparseGrid`. The grid stores the cell while its owner is
+    not the free space, whichever way the owner is changed.
+    """
+
+    __slots__ = ('grid', '_owner')
+
+    def __init__(self, grid, coordinates: tuple, owner=None):
+        self.grid = grid
+        super().__init__(coordinates, owner)
+
+    @property
+    def owner(self):
+        return self._owner
+
+    @owner.setter
+    def owner(self, new_owner):
+        self._owner = new_owner
+
+        owned_cells = self.grid.owned_cells
+        if new_owner is not self.grid.main_structure:
+            owned_cells[self.coordinates] = self
+        elif owned_cells.get(self.coordinates) is self:
+            del owned_cells[self.coordinates]
+
+
+class SparseFreeCells:
+    """
+    Free cells of a :obj:`SparseGrid`: every cell which is not owned by
+    a structure. A cell given to the free space is forgotten by the grid and
+    a cell taken from it is stored.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def __len__(self):
+        return self.grid.bounds.cells_in_row * self.grid.bounds.cells_in_column - len(self.grid.owned_cells)
+
+    def __iter__(self):
+        owned_cells = self.grid.owned_cells
+
+        for y in range(self.grid.bounds.cells_in_column):
+            for x in range(self.grid.bounds.cells_in_row):
+                if (x, y) not in owned_cells:
+                    yield SparseGridCell(self.grid, (x, y), self.grid.main_structure)
+
+    def __contains__(self, cell):
+        return self.grid.in_bounds(*cell.coordinates) and cell.coordinates not in self.grid.owned_cells
+
+    def append(self, cell):
+        self.grid.owned_cells.pop(cell.coordinates, None)
+
+    def remove(self, cell):
+        if cell.coordinates in self.grid.owned_cells:
+            raise ValueError(f'{cell} is not free.')
+
+        self.grid.owned_cells[cell.coordinates] = cell
+
+    def restore(self, cell, position=None):
+        self.append(cell)
+
+    def sample(self, rng):
+        """Return a random free cell.
+
+        Random coordinates are tried first, which is fast while the grid is
+        mostly free; all free cells are listed only if every attempt failed.
+
+        Raises:
+            IndexError: if there are no free cells.
+        """
+
+        if not len(self):
+            raise IndexError('There are no free cells.')
+
+        for _ in range(SAMPLE_ATTEMPTS):
+            x = rng.randrange(self.grid.bounds.cells_in_row)
+            y = rng.randrange(self.grid.bounds.cells_in_column)
+            if (x, y) not in self.grid.owned_cells:
+                return SparseGridCell(self.grid, (x, y), self.grid.main_structure)
+
+        return rng.choice(list(self))
+
+
+class SparseCells:
+    """Read-only sequence of all cells of a :obj:`SparseGrid` in row-major order."""
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def __len__(self):
+        return self.grid.bounds.cells_in_row * self.grid.bounds.cells_in_column
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('cell index out of range')
+
+        y, x = divmod(index, self.grid.bounds.cells_in_row)
+
+        return self.grid.get_cell(x, y)
+
+    def __iter__(self):
+        return (self.grid.get_cell(x, y)
+                for y in range(self.grid.bounds.cells_in_column)
+                for x in range(self.grid.bounds.cells_in_row))
+
+
+class SparseForeignCells:
+    """
+    Cells of a :obj:`SparseGrid` not owned by a structure: cells of other
+    structures are taken from the owned cells when the view is created and
+    free cells are listed lazily on iteration, so creating the view and
+    getting its length cost O(owned cells).
+    """
+
+    def __init__(self, grid, owner):
+        self.grid = grid
+        self.owner = owner
+        self.owned_cells = [c for c in grid.owned_cells.values() if c.owner is not owner]
+
+    def __len__(self):
+        return len(self.owned_cells) + len(self.grid.main_structure.cells)
+
+    def __iter__(self):
+        yield from self.owned_cells
+        yield from self.grid.main_structure.cells
+
+    def __contains__(self, cell):
+        return self.grid.get_cell(*cell.coordinates).owner is not self.owner
+
+
+class SparseGrid(BasicGrid):
+    """
+    Grid storing only owned cells.
+
+    Free cells are implicit: :meth:`get_cell` materialises a free cell on
+    demand and it is kept only after a structure occupies it, so memory
+    depends on count of snake and food cells instead of the grid area.
+
+    Note:
+        Free cells are not drawn on :meth:`mark_all_changed`, the background
+        is expected to be filled by the renderer.
+    """
+
+    def get_cell(self, grid_x: int, grid_y: int) -> GridCell:
+        cell = self.owned_cells.get((grid_x, grid_y))
+        if cell is not None:
+            return cell
+
+        if not self.in_bounds(grid_x, grid_y):
+            raise OutOfGridBoundsError(f'You cannot get cell with coordinates ({grid_x}, {grid_y}).')
+
+        return SparseGridCell(self, (grid_x, grid_y), self.main_structure)
+
+    def get_owner_cells(self, owner) -> list:
+        if owner is self.main_structure:
+            return list(self.main_structure.cells)
+
+        return [c for c in self.owned_cells.values() if c.owner is owner]
+
+    def get_foreign_cells(self, owner):
+        """Return cells not owned by the `owner`.
+
+        Cells of other owners are found in the owned cells, so only free
+        cells, if the `owner` is not the free space, are listed lazily by the
+        returned :obj:`SparseForeignCells`.
+        """
+
+        if owner is self.main_structure:
+            return list(self.owned_cells.values())
+
+        return SparseForeignCells(self, owner)
+
+    def clear(self):
+        """Give all owned cells back to the grid."""
+
+        self.bring_back_cells(self.get_foreign_cells(self.main_structure))
+
+    def mark_all_changed(self):
+        """Mark all owned cells as changed."""
+
+        for c in self.owned_cells.values():
+            self.mark_changed(c)
+
+    def _create_grid_cells(self):
+        self.owned_cells = {}
+
+        return SparseCells(self)
+
+    def _create_main_structure(self):
+        main_structure = FreeSpace(self, [], self.color)
+        main_structure.cells = SparseFreeCells(self)
+
+        return main_structure
@@ -1,12 +1,188 @@
+import random
+from collections import deque
+
+
+class CellSet:
+    """
+    Unordered collection of cells with constant-time insertion, removal,
+    membership check and random sampling.
+
+    Cells are kept in a plain list and a removed cell is replaced by the last
+    one, so the positions map always points to the actual cell indices.
+    """
+
+    def __init__(self, cells=()):
+        self._cells = []
+        self._positions = {}
+
+        for c in cells:
+            self.append(c)
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __iter__(self):
+        return iter(self._cells)
+
+    def __getitem__(self, index):
+        return self._cells[index]
+
+    def __contains__(self, cell):
+        return cell in self._positions
+
+    def append(self, cell):
+        self._positions[cell] = len(self._cells)
+        self._cells.append(cell)
+
+    def remove(self, cell) -> int:
+        """Remove the `cell`, returning the index it had for :meth:`restore`."""
+
+        try:
+            index = self._positions.pop(cell)
+        except KeyError:
+            raise ValueError(f'{cell} is not in the set.')
+
+        last = self._cells.pop()
+        if index < len(self._cells):
+            self._cells[index] = last
+            self._positions[last] = index
+
+        return index
+
+    def restore(self, cell, index: int):
+        """Undo the last :meth:`remove` of the `cell`, keeping the order of cells."""
+
+        if index < len(self._cells):
+            last = self._cells[index]
+            self._positions[last] = len(self._cells)
+            self._cells.append(last)
+
+            self._cells[index] = cell
+            self._positions[cell] = index
+        else:
+            self.append(cell)
+
+    def sample(self, rng=random):
+        """Return a random cell of the set.
+
+        Raises:
+            IndexError: if the set is empty.
+        """
+
+        return rng.choice(self._cells)
+
+
+class CellQueue:
+    """
+    Ordered collection of cells backed by a deque with a membership set.
+
+    Cells are appended to the right end and usually leave from the left one,
+    so both operations, as well as membership checks, take constant time.
+    """
+
+    def __init__(self, cells=()):
+        self._cells = deque()
+        self._members = set()
+
+        for c in cells:
+            self.append(c)
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __iter__(self):
+        return iter(self._cells)
+
+    def __getitem__(self, index):
+        return self._cells[index]
+
+    def __contains__(self, cell):
+        return cell in self._members
+
+    def append(self, cell):
+        self._cells.append(cell)
+        self._members.add(cell)
+
+    def appendleft(self, cell):
+        self._cells.appendleft(cell)
+        self._members.add(cell)
+
+    def remove(self, cell) -> int:
+        """Remove the `cell`, returning its position for :meth:`restore`:
+        ``0`` for the left end and ``-1`` for the right one."""
+
+        if cell not in self._members:
+            raise ValueError(f'{cell} is not in the queue.')
+
+        if self._cells[0] == cell:
+            self._cells.popleft()
+            position = 0
+        elif self._cells[-1] == cell:
+            self._cells.pop()
+            position = -1
+        else:
+            position = self._cells.index(cell)
+            del self._cells[position]
+
+        self._members.remove(cell)
+
+        return position
+
+    def restore(self, cell, position: int):
+        """Undo the last :meth:`remove` of the `cell`."""
+
+        if position == 0:
+            self.appendleft(cell)
+        elif position == -1:
+            self.append(cell)
+        else:
+            self._cells.insert(position, cell)
+            self._members.add(cell)
+
+
+class CellList(list):
+    """List of cells able to put a removed cell back to its index."""
+
+    def remove(self, cell) -> int:
+        index = self.index(cell)
+        del self[index]
+
+        return index
+
+    def restore(self, cell, index: int):
+        self.insert(index, cell)
+
+
 class GridStructure:
+    cells_type = CellList
+
     def __init__(self, grid, cells, color):
         self.grid = grid
         self.color = color
         self.char_label = '*'
 
-        self.cells = []
+        self.cells = self.cells_type()
         self + cells
 
+    def attach(self, cell):
+        """Take the `cell` which is being occupied by the structure."""
+
+        self.cells.append(cell)
+
+    def detach(self, cell):
+        """Release the `cell` which is being occupied by another structure.
+
+        Returns:
+            position of the cell for :meth:`reattach`.
+        """
+
+        return self.cells.remove(cell)
+
+    def reattach(self, cell, position):
+        """Take back the `cell` released by :meth:`detach` at `position`."""
+
+        self.cells.restore(cell, position)
+
     def __add__(self, cells: list):
         self.conquer(cells)
 
@@ -30,3 +206,14 @@ class GridStructure:
         """
 
         self.grid.main_structure.conquer(cells)
+
+
+class FreeSpace(GridStructure):
+    """
+    The structure owning all free cells of the grid.
+
+    Its cells form a :obj:`CellSet`, so free cells can be counted, checked and
+    sampled in constant time.
+    """
+
+    cells_type = CellSet
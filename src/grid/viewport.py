@@ -0,0 +1,182 @@
+from collections import OrderedDict
+
+
+class Viewport:
+    """
+    Camera showing a window-sized part of the grid.
+
+    The grid is split into square tiles of `tile_size` cells pre-rendered to
+    surfaces. Drawing blits only tiles visible in the window and patches
+    cached tiles at changed cells, tiles which are neither cached nor visible
+    are rendered when they come into view. So the cost of a frame depends on
+    the window size, not the grid size.
+
+    The camera follows the head of the `target` structure, scrolling when the
+    head leaves the middle half of the window.
+
+    Note:
+        The viewport consumes :meth:`src.grid.grid.BasicGrid.flush_changed`,
+        so the grid should not be drawn by anything else.
+    """
+
+    def __init__(self, grid, pygame, window_cells: tuple, tile_size: int = 16, target=None, max_tiles: int = None):
+        """
+        Args:
+            grid: grid to show.
+            pygame: used to create surfaces and draw cells.
+            window_cells: count of cells in a row and in a column of the window.
+            tile_size: count of cells in a row and in a column of a tile.
+            target: structure with ``head`` to follow.
+            max_tiles: count of cached tiles, four screens of tiles by default.
+        """
+
+        self.grid = grid
+        self.pygame = pygame
+        self.columns = min(window_cells[0], grid.bounds.cells_in_row)
+        self.rows = min(window_cells[1], grid.bounds.cells_in_column)
+        self.tile_size = tile_size
+        self.target = target
+
+        visible_tiles = (self.columns // tile_size + 2) * (self.rows // tile_size + 2)
+        self.max_tiles = max_tiles or 4 * visible_tiles
+
+        self.x, self.y = 0, 0
+        self._tiles = OrderedDict()
+        self._moved = True
+
+    @property
+    def cell_pitch(self) -> tuple:
+        return self.grid.cell_width + self.grid.cell_margin, self.grid.cell_height + self.grid.cell_margin
+
+    def screen_size(self) -> list:
+        """Return width and height of the window in pixels."""
+
+        pitch_x, pitch_y = self.cell_pitch
+
+        return [self.grid.cell_margin + self.columns * pitch_x, self.grid.cell_margin + self.rows * pitch_y]
+
+    def move_to(self, x: int, y: int):
+        """Put the top left corner of the view to the cell, keeping the view inside the grid."""
+
+        x = max(0, min(x, self.grid.bounds.cells_in_row - self.columns))
+        y = max(0, min(y, self.grid.bounds.cells_in_column - self.rows))
+
+        if (x, y) != (self.x, self.y):
+            self.x, self.y = x, y
+            self._moved = True
+
+    def follow(self):
+        """Scroll to the target head if it left the middle half of the view."""
+
+        if self.target is None or not len(self.target.cells):
+            return
+
+        head_x, head_y = self.target.head.coordinates
+        if not (self.x + self.columns // 4 <= head_x < self.x + self.columns - self.columns // 4) \
+                or not (self.y + self.rows // 4 <= head_y < self.y + self.rows - self.rows // 4):
+            self.move_to(head_x - self.columns // 2, head_y - self.rows // 2)
+
+    def is_visible(self, x: int, y: int) -> bool:
+        return self.x <= x < self.x + self.columns and self.y <= y < self.y + self.rows
+
+    def draw(self, screen) -> list:
+        """Draw the view on the screen.
+
+        Returns:
+            :obj:`list`: painted screen rects.
+        """
+
+        visible_changes = []
+        for c in self.grid.flush_changed():
+            x, y = c.coordinates
+
+            tile = self._tiles.get(self._tile_key(x, y))
+            if tile is not None:
+                self._draw_cell(tile, c, x % self.tile_size, y % self.tile_size)
+
+            if self.is_visible(x, y):
+                visible_changes.append((x, y))
+
+        self.follow()
+        if self._moved:
+            self._moved = False
+            return [self._draw_view(screen)]
+
+        return [
+            screen.blit(self._get_tile(self._tile_key(x, y)), self._screen_position(x, y), self._cell_area(x, y))
+            for x, y in visible_changes
+        ]
+
+    def _draw_view(self, screen):
+        first_x, first_y = self._tile_key(self.x, self.y)
+        last_x, last_y = self._tile_key(self.x + self.columns - 1, self.y + self.rows - 1)
+
+        view_rect = self.pygame.Rect((0, 0), self.screen_size())
+        screen.fill((0, 0, 0), view_rect)
+        for tile_y in range(first_y, last_y + 1):
+            for tile_x in range(first_x, last_x + 1):
+                screen.blit(self._get_tile((tile_x, tile_y)), self._tile_position(tile_x, tile_y))
+
+        return view_rect
+
+    def _tile_key(self, x, y):
+        return x // self.tile_size, y // self.tile_size
+
+    def _tile_position(self, tile_x, tile_y):
+        """Return screen position of the tile top left corner."""
+
+        pitch_x, pitch_y = self.cell_pitch
+
+        return (tile_x * self.tile_size - self.x) * pitch_x, (tile_y * self.tile_size - self.y) * pitch_y
+
+    def _screen_position(self, x, y):
+        pitch_x, pitch_y = self.cell_pitch
+
+        return (x - self.x) * pitch_x + self.grid.cell_margin, (y - self.y) * pitch_y + self.grid.cell_margin
+
+    def _cell_area(self, x, y):
+        """Return the rect of the cell on its tile surface."""
+
+        pitch_x, pitch_y = self.cell_pitch
+
+        return self.pygame.Rect(
+            (x % self.tile_size) * pitch_x + self.grid.cell_margin,
+            (y % self.tile_size) * pitch_y + self.grid.cell_margin,
+            self.grid.cell_width,
+            self.grid.cell_height,
+        )
+
+    def _get_tile(self, key):
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+
+        tile = self._tiles[key] = self._render_tile(key)
+        if len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+
+        return tile
+
+    def _render_tile(self, key):
+        pitch_x, pitch_y = self.cell_pitch
+        tile = self.pygame.Surface((self.tile_size * pitch_x + self.grid.cell_margin,
+                                    self.tile_size * pitch_y + self.grid.cell_margin))
+        tile.fill((0, 0, 0))
+
+        start_x, start_y = key[0] * self.tile_size, key[1] * self.tile_size
+        for y in range(start_y, min(start_y + self.tile_size, self.grid.bounds.cells_in_column)):
+            for x in range(start_x, min(start_x + self.tile_size, self.grid.bounds.cells_in_row)):
+                self._draw_cell(tile, self.grid.get_cell(x, y), x - start_x, y - start_y)
+
+        return tile
+
+    def _draw_cell(self, surface, cell, tile_x, tile_y):
+        pitch_x, pitch_y = self.cell_pitch
+
+        self.pygame.draw.rect(surface, cell.color, [
+            tile_x * pitch_x + self.grid.cell_margin,
+            tile_y * pitch_y + self.grid.cell_margin,
+            self.grid.cell_width,
+            self.grid.cell_height,
+        ])
@@ -0,0 +1,178 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from src.snake import Directions
+
+_STOP = object()
+
+
+class InferenceBroker:
+    """
+    Evaluate observations of many concurrent games by batched policy calls.
+
+    Games submit observations from any thread or coroutine and wait for their
+    actions. A dispatcher thread takes the oldest pending observation and
+    waits for more until `max_batch_size` observations are pending or
+    `max_latency` seconds passed since the oldest one was submitted, then
+    calls the policy once for the whole batch and resolves every request.
+
+    Use the broker as a context manager or call :meth:`close` to stop the
+    dispatcher, requests pending at that moment are still evaluated and new
+    ones are rejected.
+    """
+
+    def __init__(self, policy, max_batch_size: int = 64, max_latency: float = 0.002):
+        """
+        Args:
+            policy: callable taking observations stacked to one array and
+                returning an action per row, e.g. :meth:`src.evolution.NeuralAgent.act`.
+            max_batch_size: maximal count of observations in one policy call.
+            max_latency: seconds the oldest observation may wait for a batch.
+        """
+
+        self.policy = policy
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+
+        self.batches = 0
+        self.requests = 0
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._dispatcher = threading.Thread(target=self._dispatch, name='inference-broker', daemon=True)
+        self._dispatcher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+
+        self._dispatcher.join()
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+    def submit(self, observation) -> Future:
+        """Queue the `observation` and return the future of its action.
+
+        Raises:
+            RuntimeError: if the broker is closed.
+        """
+
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('The broker is closed.')
+
+            self._queue.put((time.monotonic(), observation, future))
+
+        return future
+
+    def request(self, observation):
+        """Return the action for the `observation`, blocking the calling thread."""
+
+        return self.submit(observation).result()
+
+    async def request_async(self, observation):
+        """Return the action for the `observation` without blocking the event loop."""
+
+        return await asyncio.wrap_future(self.submit(observation))
+
+    def _dispatch(self):
+        stopped = False
+        while not stopped:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = []
+            self._take(batch, item)
+            deadline = item[0] + self.max_latency
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+
+                if item is _STOP:
+                    stopped = True
+                    break
+
+                self._take(batch, item)
+
+            if batch:
+                self._evaluate(batch)
+
+        # Requests left behind the stop marker are evaluated without waiting.
+        leftovers = []
+        while not self._queue.empty():
+            item = self._queue.get()
+            if item is not _STOP:
+                self._take(leftovers, item)
+
+        for start in range(0, len(leftovers), self.max_batch_size):
+            self._evaluate(leftovers[start:start + self.max_batch_size])
+
+    @staticmethod
+    def _take(batch, item):
+        # Requests cancelled by their callers are dropped, the others cannot be cancelled any more.
+        if item[2].set_running_or_notify_cancel():
+            batch.append(item)
+
+    def _evaluate(self, batch):
+        self.batches += 1
+        self.requests += len(batch)
+
+        try:
+            actions = self.policy(np.stack([observation for _, observation, _ in batch]))
+            if len(actions) != len(batch):
+                raise ValueError(f'The policy returned {len(actions)} actions for {len(batch)} observations.')
+        except Exception as e:
+            for *_, future in batch:
+                future.set_exception(e)
+        else:
+            for (*_, future), action in zip(batch, actions):
+                future.set_result(action)
+
+
+def play(game, broker: InferenceBroker, observe, max_ticks=None) -> int:
+    """Play the `game` in the calling thread asking the `broker` for moves.
+
+    Args:
+        game: disposed :obj:`src.game.Game`.
+        broker: broker evaluating observations.
+        observe: callable returning a new observation array of the game, it
+            is read by the broker after the call returns.
+        max_ticks: stop after this count of ticks if passed.
+
+    Returns:
+        :obj:`int`: count of played ticks.
+    """
+
+    while not game.done and (max_ticks is None or game.ticks < max_ticks):
+        game.tick(Directions(int(broker.request(observe(game)))))
+
+    return game.ticks
+
+
+async def play_async(game, broker: InferenceBroker, observe, max_ticks=None) -> int:
+    """Play the `game` in a coroutine asking the `broker` for moves, see :func:`play`."""
+
+    while not game.done and (max_ticks is None or game.ticks < max_ticks):
+        game.tick(Directions(int(await broker.request_async(observe(game)))))
+
+    return game.ticks
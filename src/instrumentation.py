@@ -0,0 +1,176 @@
+import json
+import sys
+from collections import deque, defaultdict
+from time import perf_counter
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class NullProfiler:
+    """Profiler doing nothing, used when instrumentation is disabled."""
+
+    enabled = False
+
+    _phase = _NullPhase()
+
+    def start_frame(self):
+        pass
+
+    def phase(self, name):
+        return self._phase
+
+    def count(self, name, value):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'started')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.frame[self.name] += perf_counter() - self.started
+        return False
+
+
+class FrameProfiler:
+    """
+    Records per-phase timings and counters of game loop frames.
+
+    Every frame is a dict of phase durations in seconds and counters, the last
+    `window` frames are kept for rolling percentiles. Frame ``time`` is the sum
+    of all phases except `idle_phases`, so waiting for events and deadlines is not
+    reported as work. ``allocated_blocks`` is the change of
+    :func:`sys.getallocatedblocks` during the frame.
+    """
+
+    enabled = True
+
+    def __init__(self, window: int = 600, idle_phases=('wait',), stats_path: str = None):
+        """
+        Args:
+            window: count of the last frames used for percentiles.
+            idle_phases: phases excluded from the frame time.
+            stats_path: file the stats are dumped to on :meth:`close`.
+        """
+
+        self.frames = deque(maxlen=window)
+        self.idle_phases = set(idle_phases)
+        self.stats_path = stats_path
+
+        self.frame = None
+        self.frames_count = 0
+        self._phases = {}
+        self._allocated_blocks = 0
+
+    def start_frame(self):
+        self.frame = defaultdict(int)
+        self._allocated_blocks = sys.getallocatedblocks()
+
+    def phase(self, name):
+        """Context manager adding the time spent in it to the phase `name`."""
+
+        try:
+            return self._phases[name]
+        except KeyError:
+            phase = self._phases[name] = _Phase(self, name)
+            return phase
+
+    def count(self, name, value):
+        self.frame[name] += value
+
+    def end_frame(self):
+        frame = self.frame
+        frame['allocated_blocks'] = sys.getallocatedblocks() - self._allocated_blocks
+        frame['time'] = sum(v for k, v in frame.items() if k in self._phases and k not in self.idle_phases)
+
+        self.frames.append(dict(frame))
+        self.frames_count += 1
+
+    def percentile(self, q: float, key: str = 'time') -> float:
+        """Return the `q` percentile (0..100) of `key` over the kept frames."""
+
+        values = sorted(f.get(key, 0) for f in self.frames)
+        if not values:
+            return 0.0
+
+        return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+    def summary(self) -> dict:
+        """Return p50, p99 and maximum of every recorded phase and counter."""
+
+        keys = sorted({k for f in self.frames for k in f})
+
+        return {
+            'frames': self.frames_count,
+            'window': len(self.frames),
+            'stats': {
+                k: {
+                    'p50': self.percentile(50, k),
+                    'p99': self.percentile(99, k),
+                    'max': max(f.get(k, 0) for f in self.frames),
+                }
+                for k in keys
+            },
+        }
+
+    def dump(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def close(self):
+        if self.stats_path:
+            self.dump(self.stats_path)
+
+
+class ProfilerOverlay:
+    """Draws p50/p99 frame time of a :obj:`FrameProfiler` in the screen corner."""
+
+    def __init__(self, profiler: FrameProfiler, pygame, every: int = 30):
+        """
+        Args:
+            profiler: profiler to show.
+            pygame: used to render the text.
+            every: count of frames between overlay updates.
+        """
+
+        self.profiler = profiler
+        self.pygame = pygame
+        self.every = every
+        self.font = pygame.font.Font(None, 18)
+
+    def draw(self, screen) -> list:
+        """Draw the overlay if it is time to update it.
+
+        Returns:
+            :obj:`list`: painted rects.
+        """
+
+        if self.profiler.frames_count % self.every:
+            return []
+
+        text = 'p50 {:.2f} ms  p99 {:.2f} ms'.format(
+            self.profiler.percentile(50) * 1000,
+            self.profiler.percentile(99) * 1000,
+        )
+        surface = self.font.render(text, True, (255, 255, 255), (0, 0, 0))
+
+        return [screen.blit(surface, (2, 2))]
@@ -1,78 +1,166 @@
+from math import ceil
+from time import perf_counter
+
 import pygame
 
-from src.config import CELL_WIDTH, CELL_HEIGHT, MARGIN, CELLS_IN_ROW, FPS
-from src.exceptions.grid_exceptions import OutOfGridBoundsError
-from src.exceptions.snake_exceptions import SnakeTwistedError, SnakeHeadBeatenError, SnakeBackwardMoveError
-from src.grid.grid import BasicGrid
-from src.snake import Directions, UnclePy
+from src.config import FPS, LOOP_RATE
+from src.game import Game
+from src.grid.viewport import Viewport
+from src.instrumentation import NullProfiler, ProfilerOverlay
+from src.snake import Directions
+
+KEY_DIRECTIONS = {
+    pygame.K_RIGHT: Directions.RIGHT,
+    pygame.K_LEFT: Directions.LEFT,
+    pygame.K_UP: Directions.UP,
+    pygame.K_DOWN: Directions.DOWN,
+}
 
 
 class GameManager:
-    def __init__(self):
-        self.grid = BasicGrid(
-            grid_info=(CELL_WIDTH, CELL_HEIGHT, MARGIN),
-            grid_bounds=(CELLS_IN_ROW, CELLS_IN_ROW)
-        )
+    """
+    Interactive adapter for :obj:`src.game.Game`.
+
+    Renders the grid with pygame and turns the snake from the keyboard.
+    Between snake moves the manager blocks on pygame events until the next
+    move deadline, and the screen is updated only when something changed.
+    Phases of every frame are reported to the `profiler`, see
+    :mod:`src.instrumentation`. Boards larger than the window are shown
+    through a :obj:`src.grid.viewport.Viewport` following the snake.
+    """
+
+    def __init__(self, game: Game = None, profiler=None, viewport_cells: tuple = None, clock=perf_counter):
+        """
+        Args:
+            game: game to play, a new default one if not passed.
+            profiler: receives frame phases, see :mod:`src.instrumentation`.
+            viewport_cells: count of cells in a row and in a column of the
+                window, all the grid is shown if not passed.
+            clock: callable returning seconds move deadlines are counted by.
+        """
+
+        self.game = game or Game()
+        self.profiler = profiler or NullProfiler()
+        self.clock = clock
 
         pygame.init()
 
-        window_size = self.grid.screen_size()
+        self.viewport = Viewport(self.grid, pygame, viewport_cells) if viewport_cells else None
+
+        window_size = (self.viewport or self.grid).screen_size()
         self.screen = pygame.display.set_mode(window_size)
         pygame.display.set_caption('UnclePy')
 
-        # Used to manage how fast the screen updates
-        self.clock = pygame.time.Clock()
+        self.overlay = ProfilerOverlay(self.profiler, pygame) if self.profiler.enabled else None
+
+    @property
+    def grid(self):
+        return self.game.grid
+
+    @property
+    def snake(self):
+        return self.game.snake
 
     def dispose(self):
-        self.grid.clear()
+        self.game.dispose()
+
+        if self.viewport:
+            self.viewport.target = self.snake
+
+    def move_interval(self) -> float:
+        """Seconds between snake moves at the current snake speed."""
+
+        return FPS / (self.snake.speed * LOOP_RATE)
+
+    def wait_events(self, timeout: float) -> list:
+        """Block until a pygame event comes or `timeout` seconds pass.
+
+        Returns:
+            :obj:`list`: pending events, empty on timeout.
+        """
+
+        if timeout <= 0:
+            return pygame.event.get()
+
+        timeout_ms = ceil(timeout * 1000)
+
+        event = pygame.event.wait(timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return []
 
-        self.snake = UnclePy(
-            grid=self.grid,
-            cell=self.grid.get_cell(CELLS_IN_ROW - 4, 0),
-            length=3,
-            color=(255, 0, 0),
-        )
+        return [event] + pygame.event.get()
 
-        self.grid.add_food((100, 100, 0), 3)
-        self.grid.add_food((100, 100, 0), 3)
+    def handle_events(self, events=None) -> bool:
+        """Apply `events` to the game, pending pygame events by default.
+
+        Returns:
+            :obj:`bool`: ``False`` if the window was closed.
+        """
+
+        for event in pygame.event.get() if events is None else events:
+            if event.type == pygame.QUIT:
+                return False
+            elif event.type == pygame.KEYDOWN and event.key in KEY_DIRECTIONS:
+                self.game.turn(KEY_DIRECTIONS[event.key])
+
+        return True
+
+    def render(self) -> list:
+        """Draw changed cells and update their rects on the display."""
+
+        profiler = self.profiler
+
+        with profiler.phase('draw'):
+            profiler.count('cells_scanned', self.grid.changed_cells_count())
+            if self.viewport:
+                changed_rects = self.viewport.draw(self.screen)
+            else:
+                changed_rects = self.grid.draw(self.screen, pygame)
+            profiler.count('cells_drawn', len(changed_rects))
+
+            if self.overlay:
+                changed_rects += self.overlay.draw(self.screen)
+
+        with profiler.phase('display'):
+            if changed_rects:
+                pygame.display.update(changed_rects)
+
+        return changed_rects
 
     def start(self):
-        frame_counter = 0
+        profiler = self.profiler
 
         self.dispose()
-        self.grid.draw(self.screen, pygame)
+        self.render()
         pygame.display.flip()
 
-        done = False
-        while not done:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    done = True
-                elif event.type == pygame.KEYDOWN:
-                    try:
-                        if event.key == pygame.K_RIGHT:
-                            self.snake.direction = Directions.RIGHT
-                        if event.key == pygame.K_LEFT:
-                            self.snake.direction = Directions.LEFT
-                        if event.key == pygame.K_UP:
-                            self.snake.direction = Directions.UP
-                        if event.key == pygame.K_DOWN:
-                            self.snake.direction = Directions.DOWN
-                    except SnakeBackwardMoveError:
-                        pass
-            try:
-                if frame_counter < (FPS - 1) / self.snake.speed:
-                    frame_counter += 1
-                else:
-                    self.snake.move()
-                    frame_counter = 0
-            except (OutOfGridBoundsError, SnakeTwistedError, SnakeHeadBeatenError):
-                # print(f'Total scores {self.snake.scores}')
+        next_move = self.clock() + self.move_interval()
+        while True:
+            profiler.start_frame()
+
+            with profiler.phase('wait'):
+                events = self.wait_events(next_move - self.clock())
+
+            with profiler.phase('events'):
+                running = self.handle_events(events)
+            if not running:
                 break
 
-            self.grid.draw(self.screen, pygame)
+            now = self.clock()
+            if now >= next_move:
+                with profiler.phase('move'):
+                    alive = self.game.tick()
+                if not alive:
+                    # print(f'Total scores {self.snake.scores}')
+                    break
+
+                # Deadlines are counted from the previous one, so the speed
+                # grows exactly as intended unless the loop falls behind.
+                next_move = max(next_move + self.move_interval(), now)
 
-            self.clock.tick(500)
-            pygame.display.flip()
+            if self.grid.changed_cells_count():
+                self.render()
 
+            profiler.end_frame()
 
+        profiler.close()
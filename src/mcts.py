@@ -0,0 +1,306 @@
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from src.config import FPS
+from src.game import Game
+from src.grid.sparse import SparseGrid
+
+# Share of the frame an agent may think about a move by default.
+FRAME_SHARE = 0.5
+
+# Value of one score gained in a rollout, surviving a rollout is worth 1.
+SCORE_WEIGHT = 0.1
+
+# Value of ending a rollout next to the food, it decays with the distance.
+CLOSENESS_WEIGHT = 0.2
+
+
+class Node:
+    """
+    Node of an open loop search tree: it stands for a sequence of moves, not
+    for a game state, so food appearing randomly does not split the tree.
+    """
+
+    __slots__ = ('children', 'visits', 'value')
+
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.value = 0.0
+
+    def select(self, directions, exploration):
+        """Return the direction from `directions` with the best UCB1 score."""
+
+        log_visits = math.log(self.visits)
+
+        def ucb(direction):
+            child = self.children[direction]
+
+            return child.value / child.visits + exploration * math.sqrt(log_visits / child.visits)
+
+        return max(directions, key=ucb)
+
+    def stats(self) -> dict:
+        """Return directions mapped to visits and total value of their children."""
+
+        return {d: (c.visits, c.value) for d, c in self.children.items() if c.visits}
+
+
+class TreeSearch:
+    """
+    Monte Carlo tree search over a private copy of a game.
+
+    The copy is a :obj:`Game` on a :obj:`SparseGrid`, so loading a state costs
+    O(snake length) whatever the board size. Every iteration walks the tree
+    from the copied state, plays a random rollout, backs the value up and
+    restores the copy by :meth:`Game.restore`.
+    """
+
+    def __init__(self, exploration=math.sqrt(2), rollout_depth=8, seed=None, clock=time.perf_counter):
+        """
+        Args:
+            exploration: weight of the exploration term of UCB1.
+            rollout_depth: count of random moves played after a new node.
+            seed: seed of the random generator choosing rollout moves.
+            clock: callable returning seconds deadlines are compared with.
+        """
+
+        self.exploration = exploration
+        self.rollout_depth = rollout_depth
+        self.random = random.Random(seed)
+        self.clock = clock
+
+        self.game = None
+
+    def load(self, state, grid_bounds):
+        """Copy the game `state` returned by :meth:`Game.state`."""
+
+        if self.game is None or self.game.grid.bounds != grid_bounds:
+            self.game = Game(grid_bounds=grid_bounds, grid_class=SparseGrid)
+
+        self.game.load_state(state)
+
+    def search(self, root: Node, deadline: float) -> int:
+        """Run iterations from the loaded state growing the `root` until the
+        :attr:`clock` reaches `deadline`.
+
+        Returns:
+            :obj:`int`: count of iterations.
+        """
+
+        snapshot = self.game.snapshot()
+
+        iterations = 0
+        while self.clock() < deadline:
+            self._iterate(root)
+            self.game.restore(snapshot)
+            iterations += 1
+
+        self.game.release_snapshots()
+        # Nothing draws the copy, so changed cells would pile up.
+        self.game.grid.flush_changed()
+
+        return iterations
+
+    def _iterate(self, root: Node):
+        game = self.game
+        scores = game.snake.scores
+
+        path = [root]
+        node = root
+        while not game.done:
+            directions = list(game.snake.safe_directions())
+            if not directions:
+                game.done = True
+                break
+
+            untried = [d for d in directions if d not in node.children]
+            if untried:
+                direction = self.random.choice(untried)
+                node.children[direction] = Node()
+                node = node.children[direction]
+                path.append(node)
+
+                game.step(direction)
+                self._rollout()
+                break
+
+            direction = node.select(directions, self.exploration)
+            node = node.children[direction]
+            path.append(node)
+
+            game.step(direction)
+
+        value = self._evaluate(scores)
+        for node in path:
+            node.visits += 1
+            node.value += value
+
+    def _evaluate(self, scores) -> float:
+        game = self.game
+        if game.done:
+            return 0.0
+
+        nearest = game.grid.food.nearest(*game.snake.head.coordinates)
+        closeness = 1 / (1 + nearest[0][0]) if nearest else 0.0
+
+        return 1.0 + SCORE_WEIGHT * (game.snake.scores - scores) + CLOSENESS_WEIGHT * closeness
+
+    def _rollout(self):
+        game = self.game
+
+        for _ in range(self.rollout_depth):
+            if game.done:
+                return
+
+            directions = list(game.snake.safe_directions())
+            if not directions:
+                game.done = True
+                return
+
+            game.step(self.random.choice(directions))
+
+
+_worker_search = None
+
+
+def search_root(state, grid_bounds, deadline, seed, exploration, rollout_depth) -> dict:
+    """Search a new tree from `state` until `deadline` in a worker process.
+
+    The `deadline` is given by :func:`time.time`, which is shared by processes.
+
+    Returns:
+        :obj:`dict`: root statistics, see :meth:`Node.stats`.
+    """
+
+    global _worker_search
+
+    if _worker_search is None:
+        _worker_search = TreeSearch(exploration, rollout_depth)
+
+    _worker_search.exploration = exploration
+    _worker_search.rollout_depth = rollout_depth
+    _worker_search.random.seed(seed)
+    _worker_search.load(state, grid_bounds)
+
+    root = Node()
+    _worker_search.search(root, time.perf_counter() + deadline - time.time())
+
+    return root.stats()
+
+
+class MCTSAgent:
+    """
+    Agent choosing moves by Monte Carlo tree search within a time budget.
+
+    The agent keeps its tree between calls: when it is asked for a move
+    right after the previous one, the subtree of the chosen move becomes the
+    new root. With `workers` the search is root parallel: every worker grows
+    its own tree from the same state for the same budget, and visits of root
+    moves are summed with the ones of the local tree.
+
+    Use the agent as a context manager or call :meth:`close` to stop workers.
+    """
+
+    def __init__(
+            self,
+            time_budget: float = FRAME_SHARE / FPS,
+            workers: int = 0,
+            exploration: float = math.sqrt(2),
+            rollout_depth: int = 8,
+            seed=None,
+            clock=time.perf_counter,
+    ):
+        """
+        Args:
+            time_budget: seconds to think about a move.
+            workers: count of worker processes, the search is local if 0.
+            exploration: weight of the exploration term of UCB1.
+            rollout_depth: count of random moves played after a new node.
+            seed: seed of the random generator choosing rollout moves.
+            clock: callable returning seconds the local search is timed by,
+                workers always use the wall clock.
+        """
+
+        self.time_budget = time_budget
+        self.workers = workers
+
+        self.tree_search = TreeSearch(exploration, rollout_depth, seed, clock)
+
+        self.executor = None
+        if workers:
+            self.executor = ProcessPoolExecutor(workers)
+            wait([self.executor.submit(int) for _ in range(workers)])
+
+        self.root = None
+        self._expected = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __call__(self, game):
+        """Return the direction to move the snake of `game`, ``None`` if every move loses."""
+
+        deadline = self.tree_search.clock() + self.time_budget
+        wall_deadline = time.time() + self.time_budget
+
+        state = game.state()
+        grid_bounds = game.grid.bounds
+
+        futures = []
+        if self.executor is not None:
+            search = self.tree_search
+            futures = [
+                self.executor.submit(
+                    search_root, state, grid_bounds, wall_deadline,
+                    search.random.getrandbits(32), search.exploration, search.rollout_depth,
+                )
+                for _ in range(self.workers)
+            ]
+
+        if self._expected != (id(game.snake), game.ticks) or self.root is None:
+            self.root = Node()
+
+        self.tree_search.load(state, grid_bounds)
+        self.tree_search.search(self.root, deadline)
+
+        stats = self.root.stats()
+        for future in futures:
+            for direction, (visits, value) in future.result().items():
+                local_visits, local_value = stats.get(direction, (0, 0.0))
+                stats[direction] = (local_visits + visits, local_value + value)
+
+        if not stats:
+            self.root = None
+            return None
+
+        direction = max(stats, key=lambda d: stats[d])
+
+        self.root = self.root.children.get(direction)
+        self._expected = (id(game.snake), game.ticks + 1)
+
+        return direction
+
+
+_agent = None
+
+
+def mcts_agent(game):
+    """Choose a move by :obj:`MCTSAgent` searching in the calling process."""
+
+    global _agent
+
+    if _agent is None:
+        _agent = MCTSAgent()
+
+    return _agent(game)
@@ -0,0 +1,444 @@
+import argparse
+import mmap
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from src.food import Food
+from src.game import Game, GameState
+from src.snake import Directions, Outcomes, SnakeState
+
+MAGIC = b'UPRP'
+VERSION = 2
+
+# Header: magic, version, cells in a row and in a column, seed, whether the seed is known, keyframe interval.
+HEADER = struct.Struct('<4sBHHQBH')
+# Footer: index offset, count of keyframes, ticks, scores, last outcome, magic.
+FOOTER = struct.Struct('<QIIIB4s')
+# Keyframe: tick, speed, scores, direction, eaten and done flags, count of body cells and of food.
+KEYFRAME = struct.Struct('<IdIBBBHH')
+SPAWN = struct.Struct('<HHB')
+
+INDEX_ENTRY = np.dtype([('tick', '<u4'), ('events', '<u8'), ('keyframe', '<u8')])
+BODY_CELL = np.dtype([('x', '<u2'), ('y', '<u2')])
+FOOD_CELL = np.dtype([('x', '<u2'), ('y', '<u2'), ('value', 'u1'), ('color', 'u1', 3)])
+
+# Event bytes: below RUN_LIMIT a run of ``byte + 1`` ticks without events,
+# KEYFRAME_MARK before a keyframe, END_MARK after the last tick, otherwise
+# a tick with the TURNED and SPAWNED flags and the direction value.
+RUN_LIMIT = 0x80
+KEYFRAME_MARK = 0xC0
+END_MARK = 0xC1
+TURNED = 0x20
+SPAWNED = 0x10
+DIRECTION_MASK = 0x03
+
+# Outcome stored for replays of unfinished games.
+NO_OUTCOME = 0xFF
+
+ReplaySummary = namedtuple('ReplaySummary', ['bounds', 'seed', 'ticks', 'scores', 'outcome', 'complete'])
+
+
+def _encode_keyframe(game) -> bytes:
+    snake = game.snake
+    body = [c.coordinates for c in snake.cells]
+    food = sorted((*c.coordinates, c.owner.value, c.owner.color) for c in game.grid.food)
+
+    return (
+        KEYFRAME.pack(game.ticks, snake.speed, snake.scores, snake.direction.value,
+                      snake.eaten, game.done, len(body), len(food))
+        + np.array(body, dtype=BODY_CELL).tobytes()
+        + np.array(food, dtype=FOOD_CELL).tobytes()
+    )
+
+
+def _keyframe_end(data, offset: int) -> int:
+    """Return the offset after the keyframe at `offset`, past the end of `data` if it is cut."""
+
+    if offset + KEYFRAME.size > len(data):
+        return len(data) + 1
+
+    *_, body_count, food_count = KEYFRAME.unpack_from(data, offset)
+    return offset + KEYFRAME.size + body_count * BODY_CELL.itemsize + food_count * FOOD_CELL.itemsize
+
+
+def _read_header(data, path: str) -> tuple:
+    if len(data) < HEADER.size:
+        raise ValueError(f'{path} is not a replay.')
+
+    magic, version, *header = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'{path} is not a replay of version {VERSION}.')
+
+    return tuple(header)
+
+
+def _read_footer(data):
+    """Return the footer, or None if the recorder did not close the replay."""
+
+    if len(data) < HEADER.size + FOOTER.size:
+        return None
+
+    footer = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+    index_offset, keyframes_count, *_, magic = footer
+    if magic != MAGIC or index_offset + keyframes_count * INDEX_ENTRY.itemsize + FOOTER.size != len(data):
+        return None
+
+    return footer
+
+
+def _scan(data) -> tuple:
+    """
+    Index a replay which was not closed by reading its stream up to the
+    last complete tick.
+
+    Returns:
+        entries of the index, count of complete ticks and scores at the last keyframe.
+    """
+
+    index = []
+    ticks = scores = 0
+    offset = HEADER.size
+
+    while offset < len(data):
+        byte = data[offset]
+        if byte == END_MARK:
+            break
+        elif byte < RUN_LIMIT:
+            end = offset + 1
+            ticks += byte + 1
+        elif byte == KEYFRAME_MARK:
+            end = _keyframe_end(data, offset + 1)
+            if end > len(data):
+                break
+            ticks, _, scores, *_ = KEYFRAME.unpack_from(data, offset + 1)
+            index.append((ticks, end, offset + 1))
+        else:
+            end = offset + 1 + (SPAWN.size if byte & SPAWNED else 0)
+            if end > len(data):
+                break
+            ticks += 1
+
+        offset = end
+
+    return index, ticks, scores
+
+
+class ReplayRecorder:
+    """
+    Write a game to a compact binary replay while it is played.
+
+    A replay starts with a header and ends with an index of keyframes and a
+    footer with the summary of the game, so archives can be scanned by
+    reading a few bytes of every file, see :func:`read_summary`. Between them
+    is the stream of ticks: a tick is one byte if the snake turns or food
+    appears (with 5 more bytes for the food) and runs of up to 128 ticks
+    without events take one byte. Keyframes with the snake and the food are
+    written into the stream every `keyframe_interval` ticks and flushed, the
+    first one is the initial placement of the snake and the food. A replay
+    of a crashed process has no footer and is played up to its last
+    complete tick, which is at least its last keyframe.
+
+    Use the recorder as a context manager or call :meth:`close` to write the
+    index and the footer.
+    """
+
+    def __init__(self, game: Game, path: str, seed: int = None, keyframe_interval: int = 256):
+        """
+        Args:
+            game: disposed game to record.
+            path: path of the replay file.
+            seed: seed the game was created with, if it is known.
+            keyframe_interval: ticks between keyframes.
+        """
+
+        self.game = game
+        self.keyframe_interval = keyframe_interval
+        self.outcome = None
+
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(
+            MAGIC, VERSION, *game.grid.bounds, seed or 0, seed is not None, keyframe_interval,
+        ))
+
+        self._index = []
+        self._idle = 0
+        self._direction = game.snake.direction
+        self._food = self._food_coordinates()
+
+        self._add_keyframe()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def step(self, direction=None):
+        """Step the game like :meth:`Game.step` and record the tick."""
+
+        result = self.game.step(direction)
+        if result.outcome in (Outcomes.ILLEGAL_TURN, Outcomes.GAME_OVER):
+            return result
+
+        event = 0
+        if self.game.snake.direction != self._direction:
+            self._direction = self.game.snake.direction
+            event |= TURNED | self._direction.value
+
+        spawned = None
+        if result.outcome is Outcomes.ATE:
+            food = self._food_coordinates()
+            new_food = food - self._food
+            self._food = food
+
+            if new_food:
+                spawned = self.game.grid.get_cell(*new_food.pop())
+                event |= SPAWNED
+
+        if event:
+            self._write_idle()
+            self._file.write(bytes((RUN_LIMIT | event,)))
+            if spawned is not None:
+                self._file.write(SPAWN.pack(*spawned.coordinates, spawned.owner.value))
+        else:
+            self._idle += 1
+
+        if result.outcome.terminal:
+            self.outcome = result.outcome
+        if self.game.ticks % self.keyframe_interval == 0:
+            self._add_keyframe()
+
+        return result
+
+    def run(self, agent, max_ticks=None) -> int:
+        """Play and record the game like :meth:`Game.run`."""
+
+        while not self.game.done and (max_ticks is None or self.game.ticks < max_ticks):
+            self.step(agent(self.game))
+
+        return self.game.ticks
+
+    def close(self):
+        if self._file.closed:
+            return
+
+        self._write_idle()
+        self._file.write(bytes((END_MARK,)))
+        index = np.array(self._index, dtype=INDEX_ENTRY)
+
+        index_offset = self._file.tell()
+        self._file.write(index.tobytes())
+        self._file.write(FOOTER.pack(
+            index_offset, len(index), self.game.ticks, self.game.snake.scores,
+            NO_OUTCOME if self.outcome is None else self.outcome.value, MAGIC,
+        ))
+        self._file.close()
+
+    def _add_keyframe(self):
+        self._write_idle()
+
+        self._file.write(bytes((KEYFRAME_MARK,)))
+        offset = self._file.tell()
+        self._file.write(_encode_keyframe(self.game))
+        self._index.append((self.game.ticks, self._file.tell(), offset))
+        self._file.flush()
+
+    def _write_idle(self):
+        while self._idle:
+            run = min(self._idle, RUN_LIMIT)
+            self._file.write(bytes((run - 1,)))
+            self._idle -= run
+
+    def _food_coordinates(self) -> set:
+        return {c.coordinates for c in self.game.grid.food}
+
+
+def read_summary(path: str) -> ReplaySummary:
+    """
+    Read the summary of a replay from its header and footer only.
+
+    A replay without a footer is scanned to its last complete tick, its
+    summary has the scores of the last keyframe and no outcome.
+    """
+
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if f.seek(0, 2) else b''
+        try:
+            cells_in_row, cells_in_column, seed, has_seed, _ = _read_header(data, path)
+            footer = _read_footer(data)
+            if footer is not None:
+                *_, ticks, scores, outcome, _ = footer
+            else:
+                _, ticks, scores = _scan(data)
+                outcome = NO_OUTCOME
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    return ReplaySummary(
+        bounds=(cells_in_row, cells_in_column),
+        seed=seed if has_seed else None,
+        ticks=ticks,
+        scores=scores,
+        outcome=None if outcome == NO_OUTCOME else Outcomes(outcome),
+        complete=footer is not None,
+    )
+
+
+class ReplayPlayer:
+    """
+    Play a replay back by the game rules.
+
+    The file is memory mapped, so only the pages of the keyframe and ticks
+    being played are read. :meth:`seek` loads the nearest keyframe before
+    the tick and plays the ticks after it, so any tick is reached by at most
+    `keyframe_interval` steps. A replay without a footer is indexed by
+    scanning its stream and played up to its last complete tick.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._file.seek(0, 2) else b''
+
+        try:
+            cells_in_row, cells_in_column, seed, has_seed, self.keyframe_interval = _read_header(self.data, path)
+            footer = _read_footer(self.data)
+            self.complete = footer is not None
+            if self.complete:
+                index_offset, keyframes_count, self.ticks, self.scores, *_ = footer
+                # The index is copied, so the map can be closed while it is alive.
+                self.index = np.frombuffer(
+                    self.data, dtype=INDEX_ENTRY, count=keyframes_count, offset=index_offset,
+                ).copy()
+            else:
+                index, self.ticks, self.scores = _scan(self.data)
+                self.index = np.array(index, dtype=INDEX_ENTRY)
+            if not len(self.index):
+                raise ValueError(f'{path} has no keyframes.')
+        except ValueError:
+            self.close()
+            raise
+
+        self.seed = seed if has_seed else None
+
+        self.game = Game(grid_bounds=(cells_in_row, cells_in_column), seed=self.seed)
+        self._position = None
+        self._idle = 0
+
+        self.seek(0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def seek(self, tick: int) -> Game:
+        """Bring the game to the state after `tick` ticks.
+
+        Raises:
+            ValueError: if the replay is shorter.
+        """
+
+        if not 0 <= tick <= self.ticks:
+            raise ValueError(f'The replay has {self.ticks} ticks.')
+
+        keyframe = int(np.searchsorted(self.index['tick'], tick, side='right')) - 1
+        if not self.game.snake or tick < self.game.ticks or self.index['tick'][keyframe] > self.game.ticks:
+            self._load_keyframe(keyframe)
+
+        while self.game.ticks < tick:
+            self.step()
+
+        return self.game
+
+    def step(self):
+        """Play the next tick of the replay."""
+
+        if self.game.ticks >= self.ticks:
+            raise ValueError(f'The replay has {self.ticks} ticks.')
+
+        event = 0
+        if self._idle:
+            self._idle -= 1
+        else:
+            byte = self.data[self._position]
+            self._position += 1
+            while byte == KEYFRAME_MARK:
+                self._position = _keyframe_end(self.data, self._position)
+                byte = self.data[self._position]
+                self._position += 1
+
+            if byte < RUN_LIMIT:
+                self._idle = byte
+            else:
+                event = byte
+
+        food = {c.coordinates for c in self.game.grid.food} if event & SPAWNED else None
+
+        self.game.step(Directions(event & DIRECTION_MASK) if event & TURNED else None)
+
+        if food is not None:
+            x, y, value = SPAWN.unpack_from(self.data, self._position)
+            self._position += SPAWN.size
+            self._place_spawned_food(food, x, y, value)
+
+    def _place_spawned_food(self, food_before: set, x: int, y: int, value: int):
+        """Move food spawned at random by the step to the recorded cell,
+        so playback does not depend on the random generator."""
+
+        grid = self.game.grid
+        spawned = [grid.get_cell(*c) for c in {c.coordinates for c in grid.food} - food_before]
+        if [c.coordinates for c in spawned] == [(x, y)]:
+            return
+
+        color = spawned[0].owner.color
+        grid.bring_back_cells(spawned)
+        Food(grid, grid.get_cell(x, y), color, value)
+
+    def _load_keyframe(self, keyframe: int):
+        _, events, offset = self.index[keyframe]
+        offset = int(offset)
+
+        tick, speed, scores, direction, eaten, done, body_count, food_count = KEYFRAME.unpack_from(self.data, offset)
+        offset += KEYFRAME.size
+        body = np.frombuffer(self.data, dtype=BODY_CELL, count=body_count, offset=offset)
+        offset += body.nbytes
+        food = np.frombuffer(self.data, dtype=FOOD_CELL, count=food_count, offset=offset)
+
+        self.game.load_state(GameState(
+            body=[(int(x), int(y)) for x, y in body.tolist()],
+            occupancy=b'',
+            food=[(x, y, value, tuple(color)) for x, y, value, color in food.tolist()],
+            snake=SnakeState(Directions(direction), bool(eaten), scores, speed),
+            ticks=tick,
+            done=bool(done),
+            random_state=self.game.grid.random.getstate(),
+        ))
+
+        self._position = int(events)
+        self._idle = 0
+
+
+def run():
+    parser = argparse.ArgumentParser(description='Print summaries of replays.')
+    parser.add_argument('replays', nargs='+', help='replay files')
+    args = parser.parse_args()
+
+    for path in args.replays:
+        summary = read_summary(path)
+        outcome = summary.outcome.name if summary.outcome else '-'
+        incomplete = '' if summary.complete else ' (incomplete)'
+        print(f'{path}: ticks={summary.ticks}, scores={summary.scores}, outcome={outcome}, seed={summary.seed}'
+              f'{incomplete}')
+
+
+if __name__ == "__main__":
+    run()
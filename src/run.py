@@ -1,8 +1,16 @@
+import argparse
+
+from src.instrumentation import FrameProfiler
 from src.manager import GameManager
 
 
 def run():
-    manager = GameManager()
+    parser = argparse.ArgumentParser(description='Play UnclePy.')
+    parser.add_argument('--profile', metavar='STATS_FILE', help='record frame timings and dump them to the file')
+    args = parser.parse_args()
+
+    profiler = FrameProfiler(stats_path=args.profile) if args.profile else None
+    manager = GameManager(profiler=profiler)
 
     manager.start()
 
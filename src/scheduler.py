@@ -0,0 +1,86 @@
+from src.config import FPS
+
+
+def move_delay(speed: float) -> int:
+    """Return count of ticks between moves of an entity with passed `speed`.
+
+    Ticks are counted at ``LOOP_RATE``, so it matches
+    :meth:`src.manager.GameManager.move_interval`.
+    """
+
+    return max(1, round(FPS / speed))
+
+
+class TimingWheel:
+    """
+    Hashed timing wheel dispatching entities on deadline ticks.
+
+    An entity scheduled with a delay is put to the slot of its deadline
+    modulo the wheel size, so advancing by one tick touches only one slot:
+    entities due on the tick and the ones scheduled a whole number of turns
+    of the wheel later. With the wheel larger than usual delays the cost of a
+    tick is proportional to count of due entities, not all entities.
+
+    Rescheduling and cancelling are lazy: stale slot entries are dropped
+    when their slot comes.
+    """
+
+    def __init__(self, slots: int = 1024):
+        self.slots = slots
+        self.now = 0
+
+        self._wheel = [[] for _ in range(slots)]
+        self._deadlines = {}
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def __contains__(self, entity):
+        return entity in self._deadlines
+
+    def schedule(self, entity, delay: int):
+        """Schedule the `entity` to be due in `delay` ticks, replacing its previous deadline.
+
+        Raises:
+            ValueError: if `delay` is not positive.
+        """
+
+        if delay < 1:
+            raise ValueError(f'Delay should be positive, got {delay}.')
+
+        deadline = self.now + delay
+        self._deadlines[entity] = deadline
+        self._wheel[deadline % self.slots].append((deadline, entity))
+
+    def cancel(self, entity):
+        self._deadlines.pop(entity, None)
+
+    def deadline(self, entity) -> int:
+        return self._deadlines[entity]
+
+    def advance(self) -> list:
+        """Move to the next tick.
+
+        Returns:
+            :obj:`list`: entities due on the tick in order of scheduling.
+        """
+
+        self.now += 1
+
+        slot = self.now % self.slots
+        entries = self._wheel[slot]
+        if not entries:
+            return []
+
+        due = []
+        later = []
+        for deadline, entity in entries:
+            if deadline > self.now:
+                later.append((deadline, entity))
+            elif self._deadlines.get(entity) == deadline:
+                del self._deadlines[entity]
+                due.append(entity)
+
+        self._wheel[slot] = later
+
+        return due
@@ -0,0 +1,158 @@
+from functools import lru_cache
+
+import numpy as np
+
+from src.snake import UnclePy
+
+# Steps of rays: the 8 directions to the neighbour cells and 8 more between them.
+RAY_STEPS = {
+    8: ((-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1)),
+    16: (
+        (-1, 0), (-2, -1), (-1, -1), (-1, -2), (0, -1), (1, -2), (1, -1), (2, -1),
+        (1, 0), (2, 1), (1, 1), (1, 2), (0, 1), (-1, 2), (-1, 1), (-2, 1),
+    ),
+}
+
+# Layout of the last axis of ray vectors.
+WALL, BODY, FOOD = range(3)
+
+
+class RayTable:
+    """
+    Ray offsets precomputed for a board size.
+
+    For every ray ``offsets`` holds flat index offsets of the cells along it,
+    ``offsets[r, k]`` is the offset of the cell ``k + 1`` steps away, and
+    ``limits[c, r]`` is the count of steps from the cell ``c`` before the ray
+    leaves the board. So cells seen from any head are found by one addition
+    and one comparison, without coordinate arithmetic per cell.
+    """
+
+    def __init__(self, grid_bounds: tuple, rays: int = 8):
+        if rays not in RAY_STEPS:
+            raise ValueError(f'Count of rays should be one of {", ".join(map(str, RAY_STEPS))}.')
+
+        self.cells_in_row, self.cells_in_column = grid_bounds
+        self.cells_count = self.cells_in_row * self.cells_in_column
+
+        steps = np.array(RAY_STEPS[rays])
+        dx, dy = steps[:, 0], steps[:, 1]
+        length = max(grid_bounds)
+
+        k = np.arange(1, length + 1)
+        self.offsets = k[None, :] * (dy * self.cells_in_row + dx)[:, None]
+
+        y, x = np.divmod(np.arange(self.cells_count), self.cells_in_row)
+        self.limits = np.minimum(
+            self._axis_limits(x, dx, self.cells_in_row),
+            self._axis_limits(y, dy, self.cells_in_column),
+        )
+
+        self.steps = k
+
+    @staticmethod
+    def _axis_limits(position, step, size):
+        with np.errstate(divide='ignore'):
+            forward = (size - 1 - position[:, None]) // step
+            backward = position[:, None] // -step
+
+        return np.where(step > 0, forward, np.where(step < 0, backward, size))
+
+
+@lru_cache(maxsize=None)
+def ray_table(grid_bounds: tuple, rays: int = 8) -> RayTable:
+    """Return the :obj:`RayTable` of the board size, it is built once per size."""
+
+    return RayTable(grid_bounds, rays)
+
+
+def cast_rays(table: RayTable, heads: np.ndarray, body: np.ndarray, food: np.ndarray) -> np.ndarray:
+    """Cast rays from many heads at once.
+
+    Args:
+        table: ray table of the board size.
+        heads: flat indices of heads of shape ``(n,)``.
+        body: occupancy of cells blocking snakes, of shape ``(rows, columns)``
+            shared by all heads or ``(n, rows, columns)`` with a board per head.
+        food: occupancy of food cells of the same shape as `body`.
+
+    Returns:
+        :obj:`numpy.ndarray`: array of shape ``(n, rays, 3)`` with inverse
+        distances to the wall, the nearest blocked cell and the nearest food
+        along every ray, ``0`` if there is nothing on the ray.
+    """
+
+    heads = np.asarray(heads)
+
+    limits = table.limits[heads]
+    inside = table.steps <= limits[:, :, None]
+    cells = np.where(inside, heads[:, None, None] + table.offsets, 0)
+
+    if body.ndim == 3:
+        cells += np.arange(heads.size)[:, None, None] * table.cells_count
+
+    result = np.empty(limits.shape + (3,), dtype=np.float32)
+    result[..., WALL] = 1 / (limits + 1)
+    result[..., BODY] = _inverse_first_hit(body.reshape(-1)[cells] & inside)
+    result[..., FOOD] = _inverse_first_hit(food.reshape(-1)[cells] & inside)
+
+    return result
+
+
+def _inverse_first_hit(hits):
+    first = hits.argmax(axis=-1)
+
+    return np.where(hits.any(axis=-1), 1 / (first + 1), 0)
+
+
+class RaySensor:
+    """
+    Ray vision of snakes on a :obj:`src.grid.grid.BasicGrid`.
+
+    Occupancy planes are filled from snake cells and the food registry and
+    only cells set by the previous call are cleared, so building them costs
+    O(snakes length + food), not O(grid size).
+    """
+
+    def __init__(self, grid_bounds: tuple, rays: int = 8):
+        self.table = ray_table(tuple(grid_bounds), rays)
+
+        self.body = np.zeros((self.table.cells_in_column, self.table.cells_in_row), dtype=bool)
+        self.food = np.zeros_like(self.body)
+
+        self._body_indices = np.empty(0, dtype=np.int64)
+        self._food_indices = np.empty(0, dtype=np.int64)
+
+    def sense(self, snakes: list, grid) -> np.ndarray:
+        """Cast rays from heads of `snakes`, every snake is blocked by cells of all of them.
+
+        Returns:
+            :obj:`numpy.ndarray`: array of shape ``(len(snakes), rays, 3)``,
+            see :func:`cast_rays`.
+        """
+
+        body, food = self.body.reshape(-1), self.food.reshape(-1)
+
+        body[self._body_indices] = False
+        food[self._food_indices] = False
+
+        self._body_indices = self._indices(c for snake in snakes for c in snake.cells)
+        self._food_indices = self._indices(grid.food)
+
+        body[self._body_indices] = True
+        food[self._food_indices] = True
+
+        heads = [self._index(*s.head.coordinates) for s in snakes]
+
+        return cast_rays(self.table, np.array(heads, dtype=np.int64), self.body, self.food)
+
+    def sense_snake(self, snake: UnclePy) -> np.ndarray:
+        """Cast rays from the head of the `snake`, the result has shape ``(rays, 3)``."""
+
+        return self.sense([snake], snake.grid)[0]
+
+    def _index(self, x, y):
+        return y * self.table.cells_in_row + x
+
+    def _indices(self, cells) -> np.ndarray:
+        return np.array([self._index(*c.coordinates) for c in cells], dtype=np.int64)
@@ -0,0 +1,391 @@
+import argparse
+import asyncio
+import struct
+
+import numpy as np
+
+from src.arena import Arena
+from src.snake import Directions
+
+KEYFRAME = 1
+DELTA = 2
+
+# Client commands.
+JOIN = 1
+TURN = 2
+
+# Frame length prefix and header: kind, tick, count of palette entries and of cells.
+LENGTH = struct.Struct('>I')
+HEADER = struct.Struct('>BIHI')
+BOUNDS = struct.Struct('>HH')
+COMMAND = struct.Struct('>BB')
+
+PALETTE_ENTRY = np.dtype([('id', '>u2'), ('rgb', 'u1', 3)])
+CELL = np.dtype([('index', '>u4'), ('color', '>u2')])
+
+# Palette id of free cells, clients do not store them.
+FREE_COLOR = 0
+
+
+def encode_frame(kind: int, tick: int, palette: list, cells: list, bounds: tuple = None) -> bytes:
+    """Encode a length prefixed frame.
+
+    Args:
+        kind: :data:`KEYFRAME` or :data:`DELTA`.
+        tick: tick of the game the frame shows.
+        palette: ``(id, (r, g, b))`` entries the client does not know yet.
+        cells: ``(index, color id)`` of cells, indices are flat row-major ones.
+        bounds: count of cells in a row and in a column, only for key frames.
+    """
+
+    body = HEADER.pack(kind, tick, len(palette), len(cells))
+    if kind == KEYFRAME:
+        body += BOUNDS.pack(*bounds)
+
+    body += np.array(palette, dtype=PALETTE_ENTRY).tobytes() + np.array(cells, dtype=CELL).tobytes()
+
+    return LENGTH.pack(len(body)) + body
+
+
+def decode_frame(body: bytes) -> tuple:
+    """Decode a frame body without the length prefix.
+
+    Returns:
+        :obj:`tuple`: kind, tick, bounds (``None`` for deltas), palette and
+        cells structured arrays.
+    """
+
+    kind, tick, palette_count, cells_count = HEADER.unpack_from(body)
+    offset = HEADER.size
+
+    bounds = None
+    if kind == KEYFRAME:
+        bounds = BOUNDS.unpack_from(body, offset)
+        offset += BOUNDS.size
+
+    palette = np.frombuffer(body, dtype=PALETTE_ENTRY, count=palette_count, offset=offset)
+    offset += palette.nbytes
+    cells = np.frombuffer(body, dtype=CELL, count=cells_count, offset=offset)
+
+    return kind, tick, bounds, palette, cells
+
+
+class Connection:
+    __slots__ = ('reader', 'writer', 'snake', 'stale', 'task')
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.snake = None
+        self.stale = True
+        self.task = None
+
+
+class ArenaServer:
+    """
+    Host an :obj:`src.arena.Arena` for players and spectators over TCP.
+
+    The arena steps on a fixed tick. Every tick cells changed by the step are
+    taken from :meth:`src.grid.grid.BasicGrid.flush_changed`, the same queue
+    the grid draws from, and encoded once to a delta frame written to all
+    clients. A frame is a length prefixed header followed by new palette
+    entries and ``(cell index, color id)`` pairs, so a cell costs 6 bytes.
+
+    Backpressure is per client: a client whose transport has more than
+    `max_buffer` bytes unsent skips deltas and becomes stale. When its
+    buffer drains it gets a key frame with all occupied cells instead of the
+    missed deltas, so slow clients never make the server buffer the history.
+
+    Colors are sent once as palette entries. Cells using every palette id
+    are counted and ids of colors no cell uses any more are reused by new
+    colors, so the palette of a long-running server holds only the colors
+    on the board.
+
+    Clients send two byte commands: ``JOIN`` to get a snake and ``TURN`` with
+    a :obj:`Directions` value to turn it.
+    """
+
+    def __init__(self, arena: Arena, tick_interval: float = 0.1, food_count: int = 2, max_buffer: int = 64 * 1024):
+        """
+        Args:
+            arena: arena to host.
+            tick_interval: seconds between ticks.
+            food_count: food is added when there is less on the grid.
+            max_buffer: unsent bytes after which a client skips frames.
+        """
+
+        self.arena = arena
+        self.tick_interval = tick_interval
+        self.food_count = food_count
+        self.max_buffer = max_buffer
+
+        self.connections = set()
+        self.commands = {}
+
+        self._palette = {arena.grid.main_structure.color: FREE_COLOR}
+        self._new_palette = []
+        self._colors = {}
+        self._color_counts = {}
+        self._unused_color_ids = set()
+        self._free_color_ids = []
+        self._cell_colors = {}
+        self._keyframe = None
+        self._server = None
+
+        for c in self._occupied_cells():
+            self._recolor(self._index(c), self._color_id(c.owner.color))
+
+    @property
+    def grid(self):
+        return self.arena.grid
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> tuple:
+        """Start listening, an arbitrary free port is taken by default.
+
+        Returns:
+            :obj:`tuple`: host and port the server listens on.
+        """
+
+        self._server = await asyncio.start_server(self._accept, host, port)
+
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        connections, self.connections = self.connections, set()
+        for connection in connections:
+            connection.task.cancel()
+
+        await asyncio.gather(*(c.task for c in connections), return_exceptions=True)
+
+    async def run(self, ticks: int = None):
+        """Tick every `tick_interval` seconds, forever by default.
+
+        Deadlines are counted from the start, so slow ticks do not make the
+        game drift.
+        """
+
+        loop = asyncio.get_event_loop()
+        deadline = loop.time()
+
+        tick = 0
+        while ticks is None or tick < ticks:
+            self.tick()
+            tick += 1
+
+            deadline += self.tick_interval
+            await asyncio.sleep(max(deadline - loop.time(), 0))
+
+    def tick(self):
+        """Step the arena by client commands and broadcast changed cells."""
+
+        actions = {s: d for s, d in self.commands.items() if s in self.arena}
+        self.commands.clear()
+
+        self.arena.step(actions)
+        if len(self.grid.food) < self.food_count:
+            self.arena.add_food(self.food_count - len(self.grid.food))
+
+        self._broadcast(self.grid.flush_changed())
+
+    def _broadcast(self, changed_cells):
+        self._keyframe = None
+
+        cells = []
+        for c in changed_cells:
+            index, color_id = self._index(c), self._color_id(c.owner.color)
+            self._recolor(index, color_id)
+            cells.append((index, color_id))
+        self._release_colors()
+
+        delta = encode_frame(DELTA, self.arena.ticks, self._new_palette, cells)
+        self._new_palette = []
+
+        for connection in self.connections:
+            self._send(connection, delta)
+
+    def _send(self, connection, delta):
+        transport = connection.writer.transport
+        if transport.is_closing():
+            return
+
+        if transport.get_write_buffer_size() > self.max_buffer:
+            connection.stale = True
+        elif connection.stale:
+            connection.writer.write(self._get_keyframe())
+            connection.stale = False
+        else:
+            connection.writer.write(delta)
+
+    def _get_keyframe(self) -> bytes:
+        if self._keyframe is None:
+            cells = [(self._index(c), self._color_id(c.owner.color)) for c in self._occupied_cells()]
+            palette = [(i, color) for color, i in self._palette.items()]
+
+            self._keyframe = encode_frame(KEYFRAME, self.arena.ticks, palette, cells, self.grid.bounds)
+
+        return self._keyframe
+
+    def _occupied_cells(self):
+        # Only snakes and food own cells of an arena, so the grid is not scanned.
+        for snake in self.arena.snakes:
+            yield from snake.cells
+        yield from self.grid.food
+
+    def _color_id(self, color) -> int:
+        color_id = self._palette.get(color)
+        if color_id is None:
+            color_id = self._free_color_ids.pop() if self._free_color_ids else len(self._palette)
+            self._palette[color] = color_id
+            self._colors[color_id] = color
+            self._color_counts[color_id] = 0
+            self._unused_color_ids.add(color_id)
+            self._new_palette.append((color_id, color))
+
+        return color_id
+
+    def _recolor(self, index: int, color_id: int):
+        previous_id = self._cell_colors.pop(index, FREE_COLOR)
+
+        if color_id != FREE_COLOR:
+            self._cell_colors[index] = color_id
+            self._color_counts[color_id] += 1
+        if previous_id != FREE_COLOR:
+            self._color_counts[previous_id] -= 1
+            if not self._color_counts[previous_id]:
+                self._unused_color_ids.add(previous_id)
+
+    def _release_colors(self):
+        for color_id in self._unused_color_ids:
+            if not self._color_counts[color_id]:
+                del self._palette[self._colors.pop(color_id)]
+                del self._color_counts[color_id]
+                self._free_color_ids.append(color_id)
+
+        self._unused_color_ids.clear()
+
+    def _index(self, cell) -> int:
+        x, y = cell.coordinates
+
+        return y * self.grid.bounds.cells_in_row + x
+
+    def _add_snake(self):
+        try:
+            return self.arena.add_snake()
+        except ValueError:
+            return None
+
+    def _accept(self, reader, writer):
+        connection = Connection(reader, writer)
+        connection.task = asyncio.ensure_future(self._serve(connection))
+
+        self.connections.add(connection)
+        self._send(connection, None)
+
+    async def _serve(self, connection):
+        try:
+            while True:
+                command, value = COMMAND.unpack(await connection.reader.readexactly(COMMAND.size))
+
+                if command == JOIN and connection.snake not in self.arena:
+                    connection.snake = self._add_snake()
+                elif command == TURN and connection.snake is not None:
+                    self.commands[connection.snake] = Directions(value)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.connections.discard(connection)
+            connection.writer.close()
+
+            if connection.snake in self.arena:
+                self.arena.remove_snake(connection.snake)
+            self.commands.pop(connection.snake, None)
+
+
+class FrameClient:
+    """
+    Loopback client keeping a copy of the board from received frames.
+
+    ``board`` maps flat indices of occupied cells to their colors.
+    """
+
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+
+        self.bounds = None
+        self.tick = None
+        self.palette = {}
+        self.board = {}
+
+    async def connect(self, host: str, port: int):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+
+    async def close(self):
+        self.writer.close()
+
+    def join(self):
+        self.writer.write(COMMAND.pack(JOIN, 0))
+
+    def turn(self, direction: Directions):
+        self.writer.write(COMMAND.pack(TURN, direction.value))
+
+    async def read_frame(self) -> int:
+        """Read a frame and apply it to the board.
+
+        Returns:
+            :obj:`int`: kind of the frame.
+        """
+
+        length, = LENGTH.unpack(await self.reader.readexactly(LENGTH.size))
+        kind, tick, bounds, palette, cells = decode_frame(await self.reader.readexactly(length))
+
+        if kind == KEYFRAME:
+            self.bounds = bounds
+            self.board.clear()
+
+        self.tick = tick
+        for color_id, rgb in zip(palette['id'].tolist(), palette['rgb'].tolist()):
+            self.palette[color_id] = tuple(rgb)
+
+        for index, color_id in zip(cells['index'].tolist(), cells['color'].tolist()):
+            if color_id == FREE_COLOR:
+                self.board.pop(index, None)
+            else:
+                self.board[index] = self.palette[color_id]
+
+        return kind
+
+
+def run():
+    parser = argparse.ArgumentParser(description='Host an arena for players and spectators.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--size', type=int, default=60)
+    parser.add_argument('--tick', type=float, default=0.1, help='seconds between ticks')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    async def serve():
+        server = ArenaServer(Arena(grid_bounds=(args.size, args.size), seed=args.seed), args.tick)
+        host, port = await server.start(args.host, args.port)
+        print(f'serving on {host}:{port}')
+
+        try:
+            await server.run()
+        finally:
+            await server.close()
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(serve())
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -1,17 +1,14 @@
-import random
+from collections import namedtuple
 from enum import Enum
 from typing import List
 
-from math import sqrt
-
 import math
 
-from src.exceptions.grid_exceptions import OutOfGridBoundsError
 from src.exceptions.snake_exceptions import SnakeTwistedError, SnakeHeadBeatenError, LongDisposeLengthException, \
     SnakeBackwardMoveError
 from src.food import Food
 from src.grid.cell import GridCell
-from src.grid.structure import GridStructure
+from src.grid.structure import GridStructure, CellQueue
 
 
 class Directions(Enum):
@@ -21,12 +18,42 @@ class Directions(Enum):
     DOWN = 3
 
 
+class Outcomes(Enum):
+    MOVED = 0
+    ATE = 1
+    HIT_WALL = 2
+    HIT_SELF = 3
+    ILLEGAL_TURN = 4
+    HIT_SNAKE = 5
+    GAME_OVER = 6
+
+    @property
+    def terminal(self) -> bool:
+        """Whether the outcome ends the game or the game is already over."""
+
+        return self in (Outcomes.HIT_WALL, Outcomes.HIT_SELF, Outcomes.HIT_SNAKE, Outcomes.GAME_OVER)
+
+
+StepResult = namedtuple('StepResult', ['outcome', 'reward'])
+
+SnakeState = namedtuple('SnakeState', ['direction', 'eaten', 'scores', 'speed'])
+
+
 class UnclePy(GridStructure):
     """
         Class represents a snake on the screen and provides the reins for
         its management.
+
+        Cells of the snake are ordered from the tail to the head and kept in
+        a :obj:`CellQueue`, so moving the head and releasing the tail do not
+        depend on the snake length.
     """
 
+    cells_type = CellQueue
+
+    # Whether eating adds a new food at once, see :meth:`spawn_food`.
+    spawns_food = True
+
     def __init__(self, grid, cell, length, color: tuple):
         """
         Declare required variables and dispose the snake on the screen.
@@ -43,12 +70,39 @@ class UnclePy(GridStructure):
         discovered_cells = self.get_dispose_cells(cell, length)
         self + discovered_cells
 
+        self._init_state()
+
+    @classmethod
+    def from_cells(cls, grid, cells: List[GridCell], direction: Directions, color: tuple):
+        """Create the snake occupying free `cells` ordered from the tail to the head."""
+
+        snake = cls.__new__(cls)
+
+        snake._direction = direction
+
+        GridStructure.__init__(snake, grid, cells, color)
+        snake.char_label = 's'
+        snake._init_state()
+
+        return snake
+
+    def _init_state(self):
         self.eaten = False
         self.scores = 0
 
         self._speed = 1
         self._difficulty = 0.01
 
+    def dump_state(self) -> SnakeState:
+        """Return the state of the snake besides its cells."""
+
+        return SnakeState(self._direction, self.eaten, self.scores, self._speed)
+
+    def load_state(self, state: SnakeState):
+        """Restore the state returned by :meth:`dump_state`."""
+
+        self._direction, self.eaten, self.scores, self._speed = state
+
     @property
     def direction(self):
         """The direction to move."""
@@ -57,11 +111,23 @@ class UnclePy(GridStructure):
 
     @direction.setter
     def direction(self, new_dir):
-        if new_dir == self.opposite_direction():
+        if not self.turn(new_dir):
             raise SnakeBackwardMoveError()
 
+    def turn(self, new_dir) -> bool:
+        """Change the direction unless `new_dir` is the backward one.
+
+        Returns:
+            :obj:`bool`: whether the direction was changed.
+        """
+
+        if new_dir == self.opposite_direction():
+            return False
+
         self._direction = new_dir
 
+        return True
+
     @property
     def head(self) -> GridCell:
         """The head cell of the snake."""
@@ -81,21 +147,27 @@ class UnclePy(GridStructure):
         return self._speed
 
     def get_food_distance(self) -> float:
-        """Return nearest food to the head."""
+        """Return the distance from the head to the nearest food.
 
-        all_food_cells = self.grid.food_cells()
+        Raises:
+            ValueError: if there is no food on the grid.
+        """
 
-        distances = []
-        head_x, head_y = self.head.coordinates
-        for f in all_food_cells:
-            f_x, f_y = f.coordinates
-            distance_to_head = sqrt((head_x - f_x) ** 2 + (head_y - f_y) ** 2)
+        distance, _ = self._nearest_food()
 
-            distances.append(distance_to_head)
+        return distance
 
-        return min(distances)
+    def get_nearest_food(self, count: int = 1) -> List[GridCell]:
+        """Return up to `count` food cells nearest to the head, closest first."""
+
+        return [c for _, c in self.grid.food.nearest(*self.head.coordinates, count)]
+
+    def get_food_angle(self, food_cell: GridCell = None):
+        """Return the angle from the head to the `food_cell`, the nearest food by default."""
+
+        if food_cell is None:
+            _, food_cell = self._nearest_food()
 
-    def get_food_angle(self, food_cell):
         food_x, food_y = food_cell.coordinates
         head_x, head_y = self.head.coordinates
 
@@ -103,6 +175,13 @@ class UnclePy(GridStructure):
 
         return math.atan2(dx, dy)
 
+    def _nearest_food(self):
+        nearest = self.grid.food.nearest(*self.head.coordinates)
+        if not nearest:
+            raise ValueError('There is no food on the grid.')
+
+        return nearest[0]
+
     def opposite_direction(self):
         """Return opposite direction for the current one."""
 
@@ -123,22 +202,57 @@ class UnclePy(GridStructure):
                 borders of the grid.
             SnakeTwistedError: if new head is one the snake cells.
         """
-        self.eaten = False
 
-        try:
-            self.move_head()
-        except OutOfGridBoundsError:
+        outcome, _ = self.step()
+
+        if outcome is Outcomes.HIT_WALL:
             raise SnakeHeadBeatenError()
-        except SnakeTwistedError:
-            raise
+        if outcome is Outcomes.HIT_SELF:
+            raise SnakeTwistedError()
+
+    def step(self, direction=None) -> StepResult:
+        """Turn to `direction` and move the snake without raising on game over.
+
+        Note:
+            A backward `direction` is rejected and the snake stays in place.
+
+        Args:
+            direction: new direction, the current one is kept if ``None``.
+
+        Returns:
+            :obj:`StepResult`: outcome of the step and scores gained by it.
+        """
+
+        if direction is not None and not self.turn(direction):
+            return StepResult(Outcomes.ILLEGAL_TURN, 0)
+
+        self.eaten = False
+
+        new_x, new_y = self.change_coordinates(self.head.coordinates, self.direction)
+        if not self.grid.in_bounds(new_x, new_y):
+            return StepResult(Outcomes.HIT_WALL, 0)
+
+        new_head = self.grid.get_cell(new_x, new_y)
+        if new_head.owner is self:
+            return StepResult(Outcomes.HIT_SELF, 0)
+
+        scores = self.scores
+        self._advance_head(new_head)
 
         if not self.eaten:
             self.move_tail()
 
         self._speed += self._difficulty
 
+        return StepResult(Outcomes.ATE if self.eaten else Outcomes.MOVED, self.scores - scores)
+
     def move_head(self):
-        """Move the head."""
+        """Move the head.
+
+        Raises:
+            OutOfGridBoundsError: if the new head is beyond the grid.
+            SnakeTwistedError: if the new head is one of the snake cells.
+        """
 
         new_x, new_y = self.change_coordinates(self.head.coordinates, self.direction)
 
@@ -147,6 +261,9 @@ class UnclePy(GridStructure):
         if new_head.owner is self:
             raise SnakeTwistedError()
 
+        self._advance_head(new_head)
+
+    def _advance_head(self, new_head: GridCell):
         if isinstance(new_head.owner, Food):
             self.eat(new_head.owner)
 
@@ -155,25 +272,42 @@ class UnclePy(GridStructure):
     def move_tail(self):
         """Release previous tail cell and return it back to the grid."""
 
-        thrown_tail = self.cells[0]
+        thrown_tail = self.tail
         self.grid.bring_back_cells([thrown_tail])
 
     def eat(self, food: Food):
         self.eaten = True
         self.scores += food.value
-        self.grid.add_food((0, 0, 255), 2)
+        if self.spawns_food:
+            self.spawn_food()
         # print(f'{food.value} scores added.')
 
+    def spawn_food(self):
+        """Add the food replacing an eaten one to a random free cell."""
+
+        self.grid.add_food((0, 0, 255), 2)
+
     def available_directions(self):
         for d in list(Directions):
             new_x, new_y = self.change_coordinates(self.head.coordinates, d)
 
-            try:
-                checking_cell = self.grid.get_cell(new_x, new_y)
-            except OutOfGridBoundsError:
+            if not self.grid.in_bounds(new_x, new_y):
+                continue
+
+            if self.grid.is_free_cell(self.grid.get_cell(new_x, new_y)):
+                yield d
+
+    def safe_directions(self):
+        """Yield directions which do not end the game: unlike
+        :meth:`available_directions` the food cells are included."""
+
+        for d in list(Directions):
+            new_x, new_y = self.change_coordinates(self.head.coordinates, d)
+
+            if not self.grid.in_bounds(new_x, new_y):
                 continue
 
-            if self.grid.is_free_cell(checking_cell):
+            if not isinstance(self.grid.get_cell(new_x, new_y).owner, UnclePy):
                 yield d
 
     def get_dispose_cells(self, tail_cell: GridCell, length) -> List[GridCell]:
@@ -196,7 +330,7 @@ class UnclePy(GridStructure):
             raise LongDisposeLengthException()
 
         all_directions = list(Directions)
-        random.shuffle(all_directions)
+        self.grid.random.shuffle(all_directions)
         for d in all_directions:
             cells = self._discover_direction(tail_cell, d, length)
 
@@ -1,3 +1,21 @@
 from .test_grid import *
 from .test_snake import *
 from .test_food import *
+from .test_compact_grid import *
+from .test_game import *
+from .test_batch import *
+from .test_tournament import *
+from .test_env import *
+from .test_benchmarks import *
+from .test_instrumentation import *
+from .test_scheduler import *
+from .test_sparse_grid import *
+from .test_viewport import *
+from .test_arena import *
+from .test_mcts import *
+from .test_evolution import *
+from .test_sensors import *
+from .test_inference import *
+from .test_server import *
+from .test_replay import *
+from .test_manager import *
@@ -0,0 +1,108 @@
+import unittest
+
+from src.arena import Arena
+from src.food import Food
+from src.grid.grid import GridBounds
+from src.snake import Directions, Outcomes
+
+
+class TestArena(unittest.TestCase):
+    def setUp(self):
+        self.arena = Arena(grid_bounds=GridBounds(20, 20), seed=1)
+
+    def add_snake(self, x, y, direction):
+        snake = self.arena.add_snake(1, cell=self.arena.grid.get_cell(x, y))
+        snake._direction = direction
+
+        return snake
+
+    def test_head_to_head(self):
+        first = self.add_snake(5, 5, Directions.RIGHT)
+        second = self.add_snake(7, 5, Directions.LEFT)
+        other = self.add_snake(5, 10, Directions.RIGHT)
+
+        results = self.arena.step()
+
+        self.assertIs(results[first].outcome, Outcomes.HIT_SNAKE)
+        self.assertIs(results[second].outcome, Outcomes.HIT_SNAKE)
+        self.assertIs(results[other].outcome, Outcomes.MOVED)
+        self.assertListEqual(self.arena.snakes, [other])
+        self.assertTrue(self.arena.grid.is_free_cell(self.arena.grid.get_cell(5, 5)))
+
+    def test_body_collision(self):
+        hitting = self.add_snake(10, 10, Directions.RIGHT)
+        leaving = self.add_snake(11, 10, Directions.RIGHT)
+
+        results = self.arena.step()
+
+        self.assertIs(results[hitting].outcome, Outcomes.HIT_SNAKE)
+        self.assertIs(results[leaving].outcome, Outcomes.MOVED)
+
+    def test_wall(self):
+        snake = self.add_snake(0, 3, Directions.LEFT)
+
+        self.assertIs(self.arena.step()[snake].outcome, Outcomes.HIT_WALL)
+        self.assertListEqual(self.arena.snakes, [])
+
+    def test_actions_and_partial_step(self):
+        moving = self.add_snake(3, 3, Directions.RIGHT)
+        waiting = self.add_snake(3, 8, Directions.RIGHT)
+
+        results = self.arena.step({moving: Directions.DOWN}, snakes=[moving])
+
+        self.assertNotIn(waiting, results)
+        self.assertTupleEqual(moving.head.coordinates, (3, 4))
+        self.assertTupleEqual(waiting.head.coordinates, (3, 8))
+
+    def test_single_cell_direction(self):
+        snake = self.arena.add_snake(1, cell=self.arena.grid.get_cell(0, 0))
+
+        self.assertIn(snake.direction, (Directions.RIGHT, Directions.DOWN))
+        self.assertIs(self.arena.step()[snake].outcome, Outcomes.MOVED)
+
+    def test_explicit_cell_taken(self):
+        cell = self.arena.grid.get_cell(4, 4)
+        self.arena.add_snake(1, cell=cell)
+        snakes_count = len(self.arena.snakes)
+
+        with self.assertRaises(ValueError):
+            self.arena.add_snake(3, cell=cell)
+        self.assertEqual(len(self.arena.snakes), snakes_count)
+
+    def test_too_long_snake(self):
+        with self.assertRaises(ValueError):
+            self.arena.add_snake(15)
+
+    def test_food_added_after_moves(self):
+        eating = self.add_snake(5, 5, Directions.RIGHT)
+        other = self.add_snake(5, 10, Directions.RIGHT)
+        Food(self.arena.grid, self.arena.grid.get_cell(6, 5), (0, 255, 0), 1)
+
+        heads = []
+        add_food = self.arena.grid.add_food
+
+        def record_add_food(color, value):
+            heads.append(other.head.coordinates)
+            return add_food(color, value)
+
+        self.arena.grid.add_food = record_add_food
+        results = self.arena.step()
+
+        self.assertIs(results[eating].outcome, Outcomes.ATE)
+        self.assertListEqual(heads, [(6, 10)])
+        self.assertEqual(len(self.arena.grid.food), 1)
+
+    def test_crowd(self):
+        arena = Arena(grid_bounds=GridBounds(200, 200), seed=2)
+        for _ in range(300):
+            arena.add_snake()
+        arena.add_food(50)
+
+        for _ in range(20):
+            arena.step()
+
+        snake_cells = sum(len(s.cells) for s in arena.snakes)
+        snakes = set(arena.snakes)
+        owned = [c for c in arena.grid.cells if c.owner in snakes]
+        self.assertEqual(len(owned), snake_cells)
+        self.assertEqual(arena.grid.free_cells_count() + snake_cells + len(arena.grid.food), 200 * 200)
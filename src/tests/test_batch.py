@@ -0,0 +1,103 @@
+import unittest
+
+import numpy as np
+
+from src.batch import BatchGame, KEEP_DIRECTION
+from src.snake import Directions, Outcomes
+
+
+class TestBatchGame(unittest.TestCase):
+    def setUp(self):
+        self.cells_in_row = self.cells_in_column = 20
+        self.batch = BatchGame(64, grid_bounds=(self.cells_in_row, self.cells_in_column), seed=1)
+
+    def assertConsistent(self):
+        body_cells = self.batch.body.reshape(self.batch.games, -1).sum(axis=1)
+        food_cells = self.batch.food.reshape(self.batch.games, -1).sum(axis=1)
+
+        np.testing.assert_array_equal(body_cells, self.batch.length)
+        np.testing.assert_array_equal(food_cells, self.batch.food_cells.shape[1])
+        self.assertFalse((self.batch.body & self.batch.food).any())
+
+    def put_food_ahead(self, game):
+        head = self.batch.heads[game]
+        x, y = head % self.cells_in_row, head // self.cells_in_row
+        direction = self.batch.directions[game]
+        food_cell = (y + (direction == Directions.DOWN.value)) * self.cells_in_row + x - (direction == Directions.LEFT.value)
+
+        food_plane = self.batch.food.reshape(self.batch.games, -1)
+        slots = np.flatnonzero(self.batch.food_cells[game] == food_cell)
+        slot = slots[0] if slots.size else 0
+
+        food_plane[game, self.batch.food_cells[game, slot]] = False
+        food_plane[game, food_cell] = True
+        self.batch.food_cells[game, slot] = food_cell
+        self.batch.food_values[game, slot] = 5
+
+    def test_reset(self):
+        self.assertConsistent()
+        np.testing.assert_array_equal(self.batch.tails, self.cells_in_row - 4)
+        self.assertTrue(np.isin(self.batch.directions, [Directions.LEFT.value, Directions.DOWN.value]).all())
+
+    def test_random_steps(self):
+        rng = np.random.default_rng(0)
+
+        for _ in range(300):
+            outcomes, rewards, dones = self.batch.step(rng.integers(0, 4, self.batch.games))
+
+            np.testing.assert_array_equal(dones, np.isin(outcomes, [Outcomes.HIT_WALL.value, Outcomes.HIT_SELF.value]))
+            np.testing.assert_array_equal(rewards > 0, outcomes == Outcomes.ATE.value)
+            self.assertConsistent()
+
+    def test_hit_wall(self):
+        actions = np.full(self.batch.games, Directions.UP.value)
+        going_left = self.batch.directions == Directions.LEFT.value
+
+        outcomes, _, dones = self.batch.step(actions)
+
+        np.testing.assert_array_equal(dones, going_left)
+        np.testing.assert_array_equal(outcomes[going_left], Outcomes.HIT_WALL.value)
+        np.testing.assert_array_equal(self.batch.ticks[going_left], 0)
+
+    def test_eat(self):
+        self.put_food_ahead(0)
+        length = self.batch.length[0]
+
+        outcomes, rewards, _ = self.batch.step()
+
+        self.assertEqual(outcomes[0], Outcomes.ATE.value)
+        self.assertEqual(rewards[0], 5)
+        self.assertEqual(self.batch.length[0], length + 1)
+        self.assertEqual(self.batch.scores[0], 5)
+        self.assertIn(2, self.batch.food_values[0])
+        self.assertConsistent()
+
+    def test_full_board(self):
+        self.put_food_ahead(0)
+        body_plane = self.batch.body.reshape(self.batch.games, -1)
+        body_plane[0] = ~self.batch.food.reshape(self.batch.games, -1)[0]
+
+        outcomes, rewards, dones = self.batch.step()
+
+        self.assertEqual(outcomes[0], Outcomes.GAME_OVER.value)
+        self.assertTrue(Outcomes(outcomes[0]).terminal)
+        self.assertTrue(dones[0])
+        self.assertEqual(self.batch.final_scores[0], 5)
+        self.assertConsistent()
+
+    def test_hit_self(self):
+        direction = self.batch.directions[0]
+        turns = [Directions.DOWN, Directions.RIGHT, Directions.UP] if direction == Directions.LEFT.value \
+            else [Directions.LEFT, Directions.UP, Directions.RIGHT]
+
+        self.put_food_ahead(0)
+        self.batch.step()
+        for d in turns[:-1]:
+            self.batch.step(np.where(np.arange(self.batch.games) == 0, d.value, KEEP_DIRECTION))
+
+        outcomes, _, dones = self.batch.step(np.where(np.arange(self.batch.games) == 0, turns[-1].value, -1))
+
+        self.assertEqual(outcomes[0], Outcomes.HIT_SELF.value)
+        self.assertTrue(dones[0])
+        self.assertEqual(self.batch.final_scores[0], 5)
+        self.assertEqual(self.batch.scores[0], 0)
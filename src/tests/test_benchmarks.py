@@ -0,0 +1,28 @@
+import time
+import unittest
+
+from src.benchmarks import run_benchmarks, compare, measure, BENCHMARKS
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_run_benchmarks(self):
+        results = run_benchmarks(sizes=(10,), repeat=1)
+
+        self.assertListEqual([r['name'] for r in results], list(BENCHMARKS))
+        self.assertTrue(all(r['best'] > 0 for r in results))
+
+    def test_setup_not_timed(self):
+        runs = []
+        timings = measure(lambda: runs.append(1), 3, lambda: len(runs), lambda: time.sleep(0.02))
+
+        self.assertEqual(len(timings), 3)
+        self.assertLess(max(timings), 0.01)
+
+    def test_compare(self):
+        baseline = [{'name': 'move', 'size': 20, 'best': 1.0}, {'name': 'draw', 'size': 20, 'best': 1.0}]
+        results = [{'name': 'move', 'size': 20, 'best': 1.1}, {'name': 'draw', 'size': 20, 'best': 1.5}]
+
+        regressions = list(compare(results, baseline, threshold=0.2))
+
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0][0]['name'], 'draw')
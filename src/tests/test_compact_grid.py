@@ -0,0 +1,66 @@
+import unittest
+
+from src.food import Food
+from src.grid.compact import CompactGrid, CompactCellSet
+from src.grid.grid import GridBounds
+from src.snake import UnclePy
+from src.tests import test_grid
+
+
+class CompactGridTest(test_grid.BasicGridTest):
+    grid_class = CompactGrid
+
+    def test_cells_are_views(self):
+        cell = self.grid.get_cell(3, 2)
+
+        self.assertEqual(cell.index, 2 * self.cells_in_row + 3)
+        self.assertEqual(cell, self.grid.cells[cell.index])
+        self.assertIs(cell.owner, self.grid.main_structure)
+
+    def test_snake_move(self):
+        snake = UnclePy(self.grid, self.grid.get_cell(10, 10), 5, (1, 0, 0))
+        tail = snake.tail
+
+        snake.move()
+
+        self.assertEqual(len(self.grid.get_owner_cells(snake)), 5)
+        self.assertTrue(self.grid.is_free_cell(self.grid.get_cell(*tail.coordinates)))
+        self.assertIs(self.grid.get_cell(*snake.head.coordinates).owner, snake)
+
+    def test_owner_ids_released(self):
+        cell = self.grid.get_cell(4, 4)
+        owners_count = self.grid.owners_count
+
+        for _ in range(100):
+            food = Food(self.grid, cell, (0, 1, 0), 1)
+            self.assertIs(cell.owner, food)
+            self.grid.bring_back_cells([cell])
+
+        self.assertEqual(self.grid.owners_count, owners_count)
+        self.assertLessEqual(len(self.grid._owners), owners_count + 2)
+        self.assertEqual(self.grid.get_owner_cells(food), [])
+
+
+class CompactCoordinateConversionTest(test_grid.TestCoordinateConversion):
+    grid_class = CompactGrid
+
+
+class TestCompactCellSet(unittest.TestCase):
+    def setUp(self):
+        self.grid = CompactGrid(grid_info=(6, 6, 1), grid_bounds=GridBounds(4, 4))
+
+    def test_full(self):
+        cell_set = CompactCellSet.full(self.grid)
+
+        self.assertEqual(len(cell_set), 16)
+        self.assertIn(self.grid.get_cell(3, 3), cell_set)
+
+    def test_remove(self):
+        cell_set = CompactCellSet(self.grid, [1, 2, 3])
+
+        cell_set.remove(self.grid.cells[1])
+
+        self.assertNotIn(self.grid.cells[1], cell_set)
+        self.assertCountEqual([c.index for c in cell_set], [2, 3])
+        with self.assertRaises(ValueError):
+            cell_set.remove(self.grid.cells[1])
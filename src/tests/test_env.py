@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+from src.env import SnakeEnv, BODY_PLANE, HEAD_PLANE, FOOD_PLANE, DIRECTION, LENGTH
+from src.food import Food
+from src.snake import Directions
+
+
+class TestSnakeEnv(unittest.TestCase):
+    def setUp(self):
+        self.env = SnakeEnv(grid_bounds=(20, 20), seed=3)
+        self.planes, self.features = self.env.reset()
+
+    def assertPlanesMatchGrid(self):
+        grid, snake = self.env.game.grid, self.env.game.snake
+        expected = np.zeros_like(self.planes)
+
+        for c in grid.cells:
+            x, y = c.coordinates
+            expected[BODY_PLANE, y, x] = c.owner is snake
+            expected[FOOD_PLANE, y, x] = isinstance(c.owner, Food)
+        head_x, head_y = snake.head.coordinates
+        expected[HEAD_PLANE, head_y, head_x] = 1
+
+        np.testing.assert_array_equal(self.planes, expected)
+
+    def test_reset(self):
+        self.assertPlanesMatchGrid()
+        self.assertEqual(self.features[LENGTH], 3)
+        self.assertEqual(self.features[DIRECTION].sum(), 1)
+
+    def test_step_updates_buffers_in_place(self):
+        for d in [Directions.DOWN, Directions.DOWN, Directions.LEFT, Directions.LEFT, Directions.DOWN]:
+            (planes, features), reward, done, info = self.env.step(d)
+            if done:
+                break
+
+            self.assertIs(planes, self.planes)
+            self.assertIs(features, self.features)
+            self.assertPlanesMatchGrid()
+            self.assertEqual(features[DIRECTION.start + self.env.game.snake.direction.value], 1)
+
+    def test_max_ticks(self):
+        env = SnakeEnv(grid_bounds=(20, 20), seed=3, max_ticks=1)
+        env.reset()
+
+        _, _, done, _ = env.step()
+
+        self.assertTrue(done)
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src import evolution
+from src.evolution import Trainer, NeuralAgent, genome_size, sense, INPUTS_COUNT
+from src.game import Game
+
+
+class TestNeuralAgent(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(grid_bounds=(20, 20), seed=1)
+        self.game.dispose()
+
+    def test_sense(self):
+        inputs = np.zeros(INPUTS_COUNT)
+        sense(self.game, inputs)
+
+        self.assertGreater(inputs[evolution.FOOD_DISTANCE], 0)
+        self.assertEqual(inputs[evolution.DIRECTION].sum(), 1)
+        self.assertEqual(inputs[evolution.DIRECTION.start + self.game.snake.direction.value], 1)
+
+    def test_no_backward_moves(self):
+        genome = np.random.default_rng(1).normal(size=genome_size(4)).astype(np.float32)
+        agent = NeuralAgent(genome, hidden=4)
+
+        for _ in range(10):
+            direction = agent(self.game)
+            self.assertIsNot(direction, self.game.snake.opposite_direction())
+
+            if not self.game.tick(direction):
+                break
+
+
+class TestTrainer(unittest.TestCase):
+    def setUp(self):
+        self.checkpoint_dir = tempfile.TemporaryDirectory()
+        self.trainer = Trainer(
+            population_size=12,
+            hidden=4,
+            games=1,
+            max_ticks=30,
+            workers=2,
+            chunk_size=5,
+            checkpoint_dir=self.checkpoint_dir.name,
+            seed=1,
+        )
+
+    def tearDown(self):
+        self.trainer.close()
+        self.checkpoint_dir.cleanup()
+
+    def test_step(self):
+        stats = list(self.trainer.run(2))
+
+        self.assertEqual([s.generation for s in stats], [0, 1])
+        self.assertEqual(self.trainer.generation, 2)
+        self.assertEqual(self.trainer.fitness.shape, (12,))
+        self.assertTrue(os.path.exists(os.path.join(self.checkpoint_dir.name, 'generation_0001.npz')))
+
+    def test_workers_read_shared_population(self):
+        self.trainer.population[:] = 0
+        zero_fitness = self.trainer.evaluate()
+
+        self.assertTrue(np.all(zero_fitness == zero_fitness[0]))
+
+        self.trainer.population[:] = np.random.default_rng(2).normal(size=self.trainer.population.shape)
+        self.assertFalse(np.all(self.trainer.evaluate() == zero_fitness[0]))
+
+    def test_elite_survives(self):
+        self.trainer.fitness = self.trainer.evaluate()
+        best = self.trainer.best.copy()
+        self.trainer.breed(self.trainer.fitness)
+
+        np.testing.assert_array_equal(self.trainer.population[0], best)
+
+    def test_checkpoint(self):
+        self.trainer.step()
+        path = os.path.join(self.checkpoint_dir.name, 'generation_0000.npz')
+        population = self.trainer.population.copy()
+
+        with Trainer(population_size=12, hidden=4, games=1, max_ticks=30, workers=1, seed=5) as resumed:
+            resumed.load_checkpoint(path)
+
+            self.assertEqual(resumed.generation, 1)
+            np.testing.assert_array_equal(resumed.population, population)
+            self.assertEqual(resumed.rng.bit_generator.state, self.trainer.rng.bit_generator.state)
@@ -1,8 +1,11 @@
+import random
 import unittest
+from math import sqrt
 
 from src.food import Food
 from src.grid.grid import BasicGrid, GridBounds
-from src.snake import UnclePy
+from src.grid.sparse import SparseGrid
+from src.snake import UnclePy, Directions
 
 
 class TestSnakeFood(unittest.TestCase):
@@ -20,8 +23,10 @@ class TestSnakeFood(unittest.TestCase):
         self.grid = BasicGrid(
             grid_info=(self.cell_height, self.cell_width, self.margin),
             grid_bounds=GridBounds(self.cells_in_row, self.cells_in_column),
+            # The seed makes the snake go RIGHT from its tail.
+            rng=random.Random(0),
         )
-        self.snake = self.snake = UnclePy(
+        self.snake = UnclePy(
             self.grid,
             self.grid.get_cell(0, 0),
             7,
@@ -33,3 +38,64 @@ class TestSnakeFood(unittest.TestCase):
         previous_tail = self.snake.tail
         self.snake.move()
         self.assertIs(previous_tail, self.snake.tail)
+
+    def test_registry(self):
+        self.assertIs(self.snake.direction, Directions.RIGHT)
+        food_count = len(self.grid.food)
+        self.assertIn(self.food.cells[0], self.grid.food)
+
+        self.snake.move()
+
+        self.assertNotIn(self.grid.get_cell(7, 0), self.grid.food)
+        self.assertEqual(len(self.grid.food), food_count)
+        self.assertCountEqual(self.grid.food_cells(), [c for c in self.grid.cells if isinstance(c.owner, Food)])
+
+
+class TestFoodRegistry(unittest.TestCase):
+    def setUp(self):
+        self.grid = BasicGrid(grid_info=(6, 6, 1), grid_bounds=GridBounds(60, 60))
+        self.rng = random.Random(4)
+
+        for _ in range(50):
+            x, y = self.rng.randrange(60), self.rng.randrange(60)
+            if self.grid.is_free_cell(self.grid.get_cell(x, y)):
+                Food(self.grid, self.grid.get_cell(x, y), (0, 255, 0), 1)
+
+    def test_nearest(self):
+        for _ in range(20):
+            x, y = self.rng.randrange(60), self.rng.randrange(60)
+            expected = sorted(sqrt((x - f_x) ** 2 + (y - f_y) ** 2) for f_x, f_y in
+                              (c.coordinates for c in self.grid.food_cells()))
+
+            self.assertListEqual([d for d, _ in self.grid.food.nearest(x, y, 5)], expected[:5])
+
+    def test_nearest_more_than_food(self):
+        self.assertEqual(len(self.grid.food.nearest(0, 0, 100)), len(self.grid.food))
+
+    def test_nearest_empty(self):
+        self.grid.clear()
+
+        self.assertEqual(len(self.grid.food), 0)
+        self.assertListEqual(self.grid.food.nearest(10, 10), [])
+
+
+class TestHugeGridFood(unittest.TestCase):
+    def setUp(self):
+        self.size = 100000
+        self.grid = SparseGrid(grid_info=(6, 6, 1), grid_bounds=GridBounds(self.size, self.size), rng=random.Random(1))
+        self.snake = UnclePy(self.grid, self.grid.get_cell(10, 10), 5, (1, 0, 0))
+
+    def test_far_food(self):
+        Food(self.grid, self.grid.get_cell(self.size - 1, self.size - 1), (0, 255, 0), 1)
+        x, y = self.snake.head.coordinates
+
+        self.assertAlmostEqual(self.snake.get_food_distance(), sqrt((self.size - 1 - x) ** 2 + (self.size - 1 - y) ** 2))
+
+    def test_nearest(self):
+        for _ in range(20):
+            self.grid.add_food((0, 255, 0), 1)
+
+        expected = sorted(sqrt((50000 - f_x) ** 2 + (3 - f_y) ** 2) for f_x, f_y in
+                          (c.coordinates for c in self.grid.food))
+
+        self.assertListEqual([d for d, _ in self.grid.food.nearest(50000, 3, 3)], expected[:3])
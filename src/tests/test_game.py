@@ -0,0 +1,172 @@
+import unittest
+
+from src.agents import greedy_agent
+from src.game import Game
+from src.grid.compact import CompactGrid
+from src.grid.grid import GridBounds, BasicGrid
+from src.grid.sparse import SparseGrid
+from src.snake import Directions, Outcomes
+
+
+class TestGame(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(grid_bounds=GridBounds(20, 20))
+        self.game.dispose()
+
+    def test_dispose(self):
+        self.assertEqual(len(self.game.snake.cells), 3)
+        self.assertEqual(len(self.game.grid.food_cells()), 2)
+        self.assertFalse(self.game.done)
+
+    def test_tick(self):
+        head = self.game.snake.head
+
+        self.assertTrue(self.game.tick())
+        self.assertIsNot(self.game.snake.head, head)
+        self.assertEqual(self.game.ticks, 1)
+
+    def test_backward_turn_ignored(self):
+        direction = self.game.snake.direction
+
+        self.assertFalse(self.game.turn(self.game.snake.opposite_direction()))
+        self.assertIs(self.game.snake.direction, direction)
+
+    def test_step(self):
+        self.game.grid.bring_back_cells(self.game.grid.food_cells())
+        result = self.game.step(self.game.snake.opposite_direction())
+
+        self.assertIs(result.outcome, Outcomes.ILLEGAL_TURN)
+        self.assertEqual(self.game.ticks, 0)
+        self.assertIs(self.game.step().outcome, Outcomes.MOVED)
+        self.assertEqual(self.game.ticks, 1)
+
+    def test_run_until_wall(self):
+        ticks = self.game.run(lambda game: None)
+
+        self.assertTrue(self.game.done)
+        self.assertFalse(self.game.tick())
+        self.assertLessEqual(ticks, self.game.grid.bounds.cells_in_row)
+
+    def test_step_after_game_over(self):
+        self.game.run(lambda game: None)
+        head, ticks = self.game.snake.head, self.game.ticks
+        changed = len(self.game.grid.flush_changed())
+
+        self.assertIs(self.game.step().outcome, Outcomes.GAME_OVER)
+        self.assertFalse(self.game.tick(self.game.snake.direction))
+        self.assertIs(self.game.snake.head, head)
+        self.assertEqual(self.game.ticks, ticks)
+        self.assertEqual(len(self.game.grid.flush_changed()), 0)
+        self.assertGreater(changed, 0)
+
+    def test_run_max_ticks(self):
+        directions = [Directions.DOWN, Directions.LEFT, Directions.UP, Directions.RIGHT]
+        self.game.grid.bring_back_cells(self.game.grid.food_cells())
+
+        self.game.run(lambda game: directions[game.ticks % 4], max_ticks=8)
+
+        self.assertEqual(self.game.ticks, 8)
+
+    def test_seed(self):
+        first, second = Game(grid_bounds=GridBounds(20, 20), seed=5), Game(grid_bounds=GridBounds(20, 20), seed=5)
+        first.dispose()
+        second.dispose()
+
+        self.assertListEqual(
+            sorted(c.coordinates for c in first.grid.food_cells()),
+            sorted(c.coordinates for c in second.grid.food_cells()),
+        )
+
+
+class TestGameSnapshot(unittest.TestCase):
+    grid_class = BasicGrid
+
+    def setUp(self):
+        self.game = Game(grid_bounds=GridBounds(12, 12), grid_class=self.grid_class, seed=3)
+        self.game.dispose()
+
+        self.play(10)
+
+    def play(self, ticks):
+        self.game.run(greedy_agent, max_ticks=self.game.ticks + ticks)
+
+    def picture(self):
+        grid = self.game.grid
+
+        return (
+            repr(grid),
+            [c.coordinates for c in grid.main_structure.cells],
+            [c.coordinates for c in self.game.snake.cells],
+            sorted(c.coordinates for c in grid.food_cells()),
+            self.game.snake.dump_state(),
+            self.game.ticks,
+            self.game.done,
+            grid.random.getstate(),
+        )
+
+    def test_restore(self):
+        picture = self.picture()
+        snapshot = self.game.snapshot()
+
+        self.play(30)
+        self.assertNotEqual(self.picture(), picture)
+
+        self.game.restore(snapshot)
+        self.assertEqual(self.picture(), picture)
+
+    def test_nested_snapshots(self):
+        first_picture = self.picture()
+        first = self.game.snapshot()
+
+        self.play(5)
+        second_picture = self.picture()
+        second = self.game.snapshot()
+
+        self.play(5)
+        self.game.restore(second)
+        self.assertEqual(self.picture(), second_picture)
+
+        self.play(5)
+        self.game.restore(first)
+        self.assertEqual(self.picture(), first_picture)
+
+    def test_restored_game_replays(self):
+        snapshot = self.game.snapshot()
+
+        self.play(30)
+        picture = self.picture()
+
+        self.game.restore(snapshot)
+        self.play(30)
+
+        self.assertEqual(self.picture(), picture)
+
+    def test_release_snapshots(self):
+        self.game.snapshot()
+        self.game.release_snapshots()
+        self.play(5)
+
+        self.assertIsNone(self.game.grid.journal)
+
+    def test_state(self):
+        state = self.game.state()
+        picture = self.picture()
+
+        other = Game(grid_bounds=GridBounds(12, 12), grid_class=self.grid_class)
+        other.dispose()
+        other.load_state(state)
+
+        self.assertEqual(other.state(), state)
+        self.assertEqual(repr(other.grid), picture[0])
+        self.assertEqual([c.coordinates for c in other.snake.cells], picture[2])
+
+        occupied = [i for i in range(12 * 12) if state.occupancy[i >> 3] >> (i & 7) & 1]
+        self.assertListEqual(occupied, sorted(y * 12 + x for x, y in state.body))
+
+
+class TestCompactGameSnapshot(TestGameSnapshot):
+    grid_class = CompactGrid
+
+
+class TestSparseGameSnapshot(TestGameSnapshot):
+    grid_class = SparseGrid
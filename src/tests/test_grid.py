@@ -1,31 +1,38 @@
 import unittest
+from types import SimpleNamespace
 
 from src.exceptions.grid_exceptions import OutOfGridBoundsError
+from src.grid.cell import GridCell
 from src.grid.grid import BasicGrid, GridBounds
+from src.grid.structure import CellSet
 from src.snake import UnclePy
 
 
 class TestGridStructures(unittest.TestCase):
+    grid_class = BasicGrid
+
     def setUp(self):
         self.cell_height = 6
         self.cell_width = 6
         self.margin = 1
         self.cells_in_row = self.cells_in_column = 60
 
-        self.grid = BasicGrid(
+        self.grid = self.grid_class(
             grid_info=(self.cell_height, self.cell_width, self.margin),
             grid_bounds=GridBounds(self.cells_in_row, self.cells_in_column)
         )
 
 
 class BasicGridTest(unittest.TestCase):
+    grid_class = BasicGrid
+
     def setUp(self):
         self.cell_height = 6
         self.cell_width = 6
         self.margin = 1
         self.cells_in_row = self.cells_in_column = 60
 
-        self.grid = BasicGrid(
+        self.grid = self.grid_class(
             grid_info=(self.cell_height, self.cell_width, self.margin),
             grid_bounds=GridBounds(self.cells_in_row, self.cells_in_column)
         )
@@ -33,6 +40,20 @@ class BasicGridTest(unittest.TestCase):
     def test_draw(self):
         self.assertTrue(True)
 
+    def test_draw_changed_cells(self):
+        pygame = SimpleNamespace(draw=SimpleNamespace(rect=lambda screen, color, rect: rect))
+
+        self.assertEqual(len(self.grid.draw(None, pygame)), self.cells_in_row * self.cells_in_column)
+        self.assertListEqual(self.grid.draw(None, pygame), [])
+
+        snake = UnclePy(self.grid, self.grid.get_cell(30, 30), 5, (1, 0, 0))
+        self.grid.draw(None, pygame)
+        snake.move()
+
+        rects = self.grid.draw(None, pygame)
+        self.assertEqual(len(rects), 2)
+        self.assertFalse(any(c.changed for c in self.grid.cells))
+
     def test_calculate_screen_size(self):
         screen_width = self.cells_in_row * (self.cell_width + self.margin) + self.margin
         screen_height = self.cells_in_column * (self.cell_height + self.margin) + self.margin
@@ -56,15 +77,77 @@ class BasicGridTest(unittest.TestCase):
         self.grid.clear()
         self.assertEqual(len(self.grid.get_owner_cells(snake)), 0)
 
+    def test_get_cell(self):
+        for x, y in [(0, 0), (59, 0), (0, 59), (17, 42)]:
+            self.assertTupleEqual(self.grid.get_cell(x, y).coordinates, (x, y))
+
+    def test_get_cell_out_of_bounds(self):
+        for x, y in [(-1, 0), (0, -1), (self.cells_in_row, 0), (0, self.cells_in_column)]:
+            with self.assertRaises(OutOfGridBoundsError):
+                self.grid.get_cell(x, y)
+
+    def test_get_cell_not_square(self):
+        grid = self.grid_class(
+            grid_info=(self.cell_height, self.cell_width, self.margin),
+            grid_bounds=GridBounds(10, 4)
+        )
+
+        self.assertTupleEqual(grid.get_cell(9, 3).coordinates, (9, 3))
+        with self.assertRaises(OutOfGridBoundsError):
+            grid.get_cell(3, 9)
+
+    def test_free_cells(self):
+        total = self.cells_in_row * self.cells_in_column
+        self.assertEqual(self.grid.free_cells_count(), total)
+
+        snake = UnclePy(self.grid, self.grid.get_cell(55, 0), 5, (1, 0, 0))
+        food = self.grid.add_food((0, 0, 1), 1)
+
+        self.assertEqual(self.grid.free_cells_count(), total - len(snake.cells) - 1)
+        self.assertEqual(len(self.grid.free_cells()), self.grid.free_cells_count())
+        self.assertFalse(self.grid.is_free_cell(food.cells[0]))
+        self.assertTrue(all(self.grid.is_free_cell(c) for c in self.grid.free_cells()))
+
+        self.grid.clear()
+        self.assertEqual(self.grid.free_cells_count(), total)
+
+
+class TestCellSet(unittest.TestCase):
+    def setUp(self):
+        self.cells = [GridCell((x, 0)) for x in range(5)]
+        self.cell_set = CellSet(self.cells)
+
+    def test_remove(self):
+        self.cell_set.remove(self.cells[1])
+        self.cell_set.remove(self.cells[4])
+
+        self.assertEqual(len(self.cell_set), 3)
+        self.assertNotIn(self.cells[1], self.cell_set)
+        self.assertCountEqual(list(self.cell_set), [self.cells[0], self.cells[2], self.cells[3]])
+
+    def test_remove_missing(self):
+        self.cell_set.remove(self.cells[0])
+
+        with self.assertRaises(ValueError):
+            self.cell_set.remove(self.cells[0])
+
+    def test_sample(self):
+        self.assertIn(self.cell_set.sample(), self.cells)
+
+        with self.assertRaises(IndexError):
+            CellSet().sample()
+
 
 class TestCoordinateConversion(unittest.TestCase):
+    grid_class = BasicGrid
+
     def setUp(self):
         self.cell_height = 6
         self.cell_width = 6
         self.margin = 1
         self.cells_in_row = self.cells_in_column = 60
 
-        self.grid = BasicGrid(
+        self.grid = self.grid_class(
             grid_info=(self.cell_height, self.cell_width, self.margin),
             grid_bounds=GridBounds(self.cells_in_row, self.cells_in_column)
         )
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from src.evolution import NeuralAgent, genome_size, sense, INPUTS_COUNT
+from src.game import Game
+from src.inference import InferenceBroker, play, play_async
+
+
+def observe(game):
+    inputs = np.zeros(INPUTS_COUNT, dtype=np.float32)
+    sense(game, inputs)
+
+    return inputs
+
+
+class TestInferenceBroker(unittest.TestCase):
+    def setUp(self):
+        self.batch_sizes = []
+
+    def policy(self, observations):
+        self.batch_sizes.append(len(observations))
+
+        return observations.sum(axis=1)
+
+    def test_batch(self):
+        with InferenceBroker(self.policy, max_batch_size=4, max_latency=0.05) as broker:
+            futures = [broker.submit(np.array([i, 1])) for i in range(10)]
+            actions = [f.result() for f in futures]
+
+        self.assertListEqual(actions, list(range(1, 11)))
+        self.assertLessEqual(max(self.batch_sizes), 4)
+        self.assertLess(len(self.batch_sizes), 10)
+        self.assertEqual(broker.requests, 10)
+
+    def test_latency(self):
+        with InferenceBroker(self.policy, max_batch_size=64, max_latency=0.01) as broker:
+            start = time.monotonic()
+            self.assertEqual(broker.request(np.array([2, 3])), 5)
+
+            self.assertLess(time.monotonic() - start, 0.5)
+
+        self.assertListEqual(self.batch_sizes, [1])
+
+    def test_policy_error(self):
+        def policy(observations):
+            raise RuntimeError('model failed')
+
+        with InferenceBroker(policy) as broker:
+            with self.assertRaises(RuntimeError):
+                broker.request(np.zeros(2))
+
+    def test_short_policy_output(self):
+        with InferenceBroker(lambda observations: observations[1:, 0], max_latency=0.05) as broker:
+            futures = [broker.submit(np.array([i, 1])) for i in range(3)]
+
+            for future in futures:
+                with self.assertRaises(ValueError):
+                    future.result(timeout=1)
+
+    def test_cancelled_request(self):
+        with InferenceBroker(self.policy, max_latency=0.05) as broker:
+            cancelled = broker.submit(np.array([1, 1]))
+            self.assertTrue(cancelled.cancel())
+
+            self.assertEqual(broker.submit(np.array([2, 1])).result(timeout=1), 3)
+
+    def test_request_timeout(self):
+        async def requests(broker):
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(broker.request_async(np.array([1, 1])), 0.001)
+
+            return await asyncio.wait_for(broker.request_async(np.array([2, 1])), 1)
+
+        loop = asyncio.new_event_loop()
+        try:
+            with InferenceBroker(self.policy, max_latency=0.05) as broker:
+                self.assertEqual(loop.run_until_complete(requests(broker)), 3)
+        finally:
+            loop.close()
+
+    def test_close_in_batches(self):
+        broker = InferenceBroker(self.policy, max_batch_size=4, max_latency=10)
+        futures = [broker.submit(np.array([i, 1])) for i in range(10)]
+        broker.close()
+
+        self.assertListEqual([f.result(timeout=1) for f in futures], list(range(1, 11)))
+        self.assertLessEqual(max(self.batch_sizes), 4)
+        self.assertEqual(len(self.batch_sizes), 3)
+
+    def test_close(self):
+        broker = InferenceBroker(self.policy, max_latency=10)
+        future = broker.submit(np.array([1, 1]))
+        broker.close()
+        broker.close()
+
+        self.assertEqual(future.result(timeout=1), 2)
+        with self.assertRaises(RuntimeError):
+            broker.submit(np.array([1, 1]))
+
+
+class TestPlay(unittest.TestCase):
+    def setUp(self):
+        genome = np.random.default_rng(1).normal(size=genome_size(8)).astype(np.float32)
+        self.agent = NeuralAgent(genome, hidden=8)
+
+    def create_games(self):
+        games = [Game(grid_bounds=(15, 15), seed=s) for s in range(6)]
+        for g in games:
+            g.dispose()
+
+        return games
+
+    def expected(self):
+        games = self.create_games()
+        for g in games:
+            g.run(self.agent, 50)
+
+        return [(g.ticks, g.snake.scores) for g in games]
+
+    def test_threads(self):
+        games = self.create_games()
+
+        with InferenceBroker(self.agent.act, max_batch_size=6) as broker:
+            threads = [threading.Thread(target=play, args=(g, broker, observe, 50)) for g in games]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertListEqual([(g.ticks, g.snake.scores) for g in games], self.expected())
+
+    def test_asyncio(self):
+        games = self.create_games()
+
+        async def play_all(broker):
+            return await asyncio.gather(*(play_async(g, broker, observe, 50) for g in games))
+
+        loop = asyncio.new_event_loop()
+        with InferenceBroker(self.agent.act, max_batch_size=6) as broker:
+            ticks = loop.run_until_complete(play_all(broker))
+        loop.close()
+
+        self.assertListEqual(ticks, [g.ticks for g in games])
+        self.assertListEqual([(g.ticks, g.snake.scores) for g in games], self.expected())
+        self.assertGreater(broker.mean_batch_size, 1)
@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.instrumentation import FrameProfiler, NullProfiler
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = FrameProfiler(window=11)
+
+    def record_frame(self, cells):
+        self.profiler.start_frame()
+        with self.profiler.phase('move'):
+            pass
+        with self.profiler.phase('wait'):
+            pass
+        self.profiler.count('cells_drawn', cells)
+        self.profiler.end_frame()
+
+    def test_frames(self):
+        for i in range(20):
+            self.record_frame(i)
+
+        self.assertEqual(self.profiler.frames_count, 20)
+        self.assertEqual(len(self.profiler.frames), 11)
+        self.assertEqual(self.profiler.percentile(50, 'cells_drawn'), 14)
+        self.assertEqual(self.profiler.percentile(99, 'cells_drawn'), 19)
+
+        frame = self.profiler.frames[-1]
+        self.assertEqual(frame['time'], frame['move'])
+        self.assertIn('allocated_blocks', frame)
+
+    def test_dump(self):
+        self.record_frame(3)
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.profiler.stats_path = os.path.join(directory, 'stats.json')
+            self.profiler.close()
+
+            with open(self.profiler.stats_path) as f:
+                stats = json.load(f)
+
+        self.assertEqual(stats['frames'], 1)
+        self.assertEqual(stats['stats']['cells_drawn']['max'], 3)
+
+    def test_null_profiler(self):
+        profiler = NullProfiler()
+
+        profiler.start_frame()
+        with profiler.phase('move'):
+            profiler.count('cells_drawn', 1)
+        profiler.end_frame()
+        profiler.close()
+
+        self.assertFalse(profiler.enabled)
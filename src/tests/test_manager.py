@@ -0,0 +1,105 @@
+import os
+import unittest
+from math import ceil
+from unittest import mock
+
+from src.config import FPS, LOOP_RATE
+from src.game import Game
+from src.grid.grid import GridBounds
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+try:
+    import pygame
+    from src.manager import GameManager
+except ImportError:
+    pygame = None
+
+
+class FakeEvents:
+    """Stands in for the pygame event queue and the clock: waiting for an
+    event moves the time to the next scripted event or to the timeout."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.now = 0.0
+        self.timeouts = []
+
+    def clock(self):
+        return self.now
+
+    def wait(self, timeout_ms):
+        self.timeouts.append(timeout_ms)
+        deadline = self.now + timeout_ms / 1000
+
+        if self.script and self.script[0][0] <= deadline:
+            self.now, event = self.script.pop(0)
+            return event
+
+        self.now = deadline
+        return pygame.event.Event(pygame.NOEVENT)
+
+    def get(self):
+        return []
+
+
+@unittest.skipIf(pygame is None, 'pygame is not installed')
+class TestGameManager(unittest.TestCase):
+    def setUp(self):
+        self.key_time = 0.05
+        self.events = FakeEvents([
+            (self.key_time, pygame.event.Event(pygame.KEYDOWN, key=pygame.K_UP)),
+            (0.4, pygame.event.Event(pygame.QUIT)),
+        ])
+
+        self.game = Game(grid_bounds=GridBounds(20, 20), seed=1)
+        self.manager = GameManager(self.game, clock=self.events.clock)
+
+        self.moves = []
+        self.turns = []
+        tick, turn = self.game.tick, self.game.turn
+
+        def record_tick(direction=None):
+            alive = tick(direction)
+            self.moves.append((self.events.now, self.manager.move_interval()))
+            return alive
+
+        def record_turn(direction):
+            self.turns.append((self.events.now, direction))
+            return turn(direction)
+
+        self.game.tick = record_tick
+        self.game.turn = record_turn
+
+    def tearDown(self):
+        pygame.quit()
+
+    def start(self):
+        with mock.patch.object(pygame.event, 'wait', self.events.wait), \
+                mock.patch.object(pygame.event, 'get', self.events.get):
+            self.manager.start()
+
+    def test_moves_at_deadlines(self):
+        self.start()
+
+        self.assertEqual(len(self.moves), 3)
+
+        deadline = FPS / LOOP_RATE
+        for time, next_interval in self.moves:
+            self.assertGreaterEqual(time, deadline)
+            self.assertLess(time, deadline + 0.002)
+            deadline += next_interval
+
+        self.assertLess(self.moves[1][1], FPS / LOOP_RATE)
+
+    def test_input_wakes_loop(self):
+        self.start()
+
+        first_deadline = FPS / LOOP_RATE
+
+        self.assertEqual(self.turns[0][0], self.key_time)
+        self.assertLess(self.turns[0][0], self.moves[0][0])
+        self.assertEqual(self.events.timeouts[:2], [
+            ceil(first_deadline * 1000),
+            ceil((first_deadline - self.key_time) * 1000),
+        ])
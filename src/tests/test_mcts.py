@@ -0,0 +1,76 @@
+import itertools
+import random
+import unittest
+
+from src.game import Game, GameState
+from src.mcts import MCTSAgent, TreeSearch, Node
+from src.snake import Directions, SnakeState
+
+
+class TestMCTSAgent(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(seed=1)
+        self.game.dispose()
+
+    def test_time_budget(self):
+        clock = itertools.count()
+        agent = MCTSAgent(time_budget=50, seed=1, clock=lambda: next(clock))
+
+        for _ in range(3):
+            start = next(clock)
+            direction = agent(self.game)
+
+            # The deadline is read once and the clock once per iteration,
+            # so a move takes the budget however fast the machine is.
+            self.assertEqual(next(clock), start + 52)
+            self.assertIn(direction, list(self.game.snake.safe_directions()))
+            self.game.tick(direction)
+
+    def test_avoids_wall(self):
+        self.game.load_state(GameState(
+            body=((17, 5), (18, 5), (19, 5)),
+            occupancy=b'',
+            food=((10, 15, 3, (100, 100, 0)),),
+            snake=SnakeState(Directions.RIGHT, False, 0, 1),
+            ticks=0,
+            done=False,
+            random_state=random.Random(0).getstate(),
+        ))
+
+        self.assertIn(MCTSAgent(seed=1)(self.game), (Directions.UP, Directions.DOWN))
+
+    def test_tree_reuse(self):
+        agent = MCTSAgent(seed=1)
+        self.game.tick(agent(self.game))
+
+        root = agent.root
+        visits = root.visits
+        self.game.tick(agent(self.game))
+
+        self.assertGreater(visits, 0)
+        self.assertGreater(root.visits, visits)
+
+    def test_workers(self):
+        with MCTSAgent(workers=2, seed=1) as agent:
+            direction = agent(self.game)
+
+        self.assertIn(direction, list(self.game.snake.safe_directions()))
+        self.assertIsNone(agent.executor)
+
+
+class TestTreeSearch(unittest.TestCase):
+    def test_search_restores_copy(self):
+        game = Game(grid_bounds=(20, 20), seed=1)
+        game.dispose()
+        state = game.state()
+
+        clock = itertools.count()
+        search = TreeSearch(seed=1, clock=lambda: next(clock))
+        search.load(state, game.grid.bounds)
+        root = Node()
+        iterations = search.search(root, 30)
+
+        self.assertEqual(iterations, 30)
+        self.assertEqual(root.visits, iterations)
+        self.assertEqual(sum(visits for visits, _ in root.stats().values()), iterations)
+        self.assertEqual(search.game.state(), state)
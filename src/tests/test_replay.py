@@ -0,0 +1,126 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.agents import greedy_agent, random_agent
+from src.game import Game
+from src.replay import ReplayRecorder, ReplayPlayer, read_summary, FOOTER
+
+
+def comparable(state):
+    return state.body, state.food, state.snake, state.ticks, state.done
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'game.replay')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, agent, seed=4, max_ticks=300, keyframe_interval=16):
+        game = Game(grid_bounds=(15, 15), seed=seed)
+        game.dispose()
+
+        states = [comparable(game.state())]
+        with ReplayRecorder(game, self.path, seed=seed, keyframe_interval=keyframe_interval) as recorder:
+            while not game.done and game.ticks < max_ticks:
+                recorder.step(agent(game))
+                states.append(comparable(game.state()))
+
+        return game, states
+
+    def test_summary(self):
+        game, _ = self.record(greedy_agent)
+        summary = read_summary(self.path)
+
+        self.assertEqual(summary.bounds, (15, 15))
+        self.assertEqual(summary.seed, 4)
+        self.assertEqual(summary.ticks, game.ticks)
+        self.assertEqual(summary.scores, game.snake.scores)
+        self.assertGreater(summary.scores, 0)
+
+    def test_play_back(self):
+        game, states = self.record(greedy_agent)
+
+        with ReplayPlayer(self.path) as player:
+            self.assertEqual(comparable(player.game.state()), states[0])
+
+            for tick in range(1, len(states)):
+                player.step()
+                self.assertEqual(comparable(player.game.state()), states[tick])
+
+    def test_seek(self):
+        _, states = self.record(random_agent)
+        ticks = list(range(len(states)))
+        random.Random(1).shuffle(ticks)
+
+        with ReplayPlayer(self.path) as player:
+            for tick in ticks[:20] + [0, len(states) - 1]:
+                self.assertEqual(comparable(player.seek(tick).state()), states[tick])
+
+            with self.assertRaises(ValueError):
+                player.seek(len(states))
+
+    def test_compact(self):
+        game, _ = self.record(greedy_agent, keyframe_interval=10000)
+
+        with ReplayPlayer(self.path) as player:
+            # Ticks are written between the initial keyframe and the index.
+            index_offset, *_ = FOOTER.unpack_from(player.data, len(player.data) - FOOTER.size)
+            events_size = index_offset - int(player.index['events'][0])
+
+        self.assertLess(events_size, 2 * game.ticks)
+
+    def test_not_closed(self):
+        game = Game(grid_bounds=(15, 15), seed=4)
+        game.dispose()
+        states = [comparable(game.state())]
+
+        recorder = ReplayRecorder(game, self.path, seed=4, keyframe_interval=16)
+        try:
+            for _ in range(40):
+                recorder.step(random_agent(game))
+                states.append(comparable(game.state()))
+
+            self.assertFalse(read_summary(self.path).complete)
+            with ReplayPlayer(self.path) as player:
+                self.assertFalse(player.complete)
+                self.assertGreaterEqual(player.ticks, 32)
+                self.assertEqual(comparable(player.seek(player.ticks).state()), states[player.ticks])
+        finally:
+            recorder.close()
+
+        self.assertTrue(read_summary(self.path).complete)
+
+    def test_truncated(self):
+        _, states = self.record(random_agent, max_ticks=100)
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        with ReplayPlayer(self.path) as player:
+            keyframes = player.index.copy()
+
+        for size in range(int(keyframes['events'][0]), len(data), 7):
+            with open(self.path, 'wb') as f:
+                f.write(data[:size])
+
+            last_keyframe = int(keyframes['tick'][keyframes['events'] <= size][-1])
+            summary = read_summary(self.path)
+            self.assertFalse(summary.complete)
+            self.assertIsNone(summary.outcome)
+            self.assertGreaterEqual(summary.ticks, last_keyframe)
+
+            with ReplayPlayer(self.path) as player:
+                self.assertEqual(player.ticks, summary.ticks)
+                for tick in (last_keyframe, player.ticks):
+                    self.assertEqual(comparable(player.seek(tick).state()), states[tick])
+                with self.assertRaises(ValueError):
+                    player.seek(player.ticks + 1)
+
+        with open(self.path, 'wb') as f:
+            f.write(data[:int(keyframes['keyframe'][0])])
+        with self.assertRaises(ValueError):
+            ReplayPlayer(self.path)
@@ -0,0 +1,74 @@
+import unittest
+
+from src.game import Game
+from src.grid.grid import GridBounds
+from src.scheduler import TimingWheel, move_delay
+
+
+class TestTimingWheel(unittest.TestCase):
+    def setUp(self):
+        self.wheel = TimingWheel(slots=8)
+
+    def advance(self, ticks):
+        due = []
+        for _ in range(ticks):
+            due += [(self.wheel.now, e) for e in self.wheel.advance()]
+
+        return due
+
+    def test_deadline_order(self):
+        self.wheel.schedule('b', 3)
+        self.wheel.schedule('a', 1)
+        self.wheel.schedule('c', 3)
+
+        self.assertListEqual(self.advance(3), [(1, 'a'), (3, 'b'), (3, 'c')])
+        self.assertEqual(len(self.wheel), 0)
+
+    def test_wrap_around(self):
+        self.wheel.schedule('far', 20)
+        self.wheel.schedule('near', 4)
+
+        self.assertListEqual(self.advance(25), [(4, 'near'), (20, 'far')])
+
+    def test_reschedule_and_cancel(self):
+        self.wheel.schedule('a', 2)
+        self.wheel.schedule('b', 2)
+        self.wheel.schedule('a', 5)
+        self.wheel.cancel('b')
+
+        self.assertNotIn('b', self.wheel)
+        self.assertEqual(self.wheel.deadline('a'), 5)
+        self.assertListEqual(self.advance(6), [(5, 'a')])
+
+    def test_not_positive_delay(self):
+        with self.assertRaises(ValueError):
+            self.wheel.schedule('a', 0)
+
+
+class TestGameScheduling(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(grid_bounds=GridBounds(20, 20), seed=2)
+        self.game.dispose()
+
+    def test_snake_moves_on_deadline(self):
+        delay = move_delay(self.game.snake.speed)
+
+        for _ in range(delay - 1):
+            self.game.advance()
+        self.assertEqual(self.game.ticks, 0)
+
+        self.game.advance()
+        self.assertEqual(self.game.ticks, 1)
+
+    def test_timed_events(self):
+        calls = []
+
+        def event(game):
+            calls.append(game.scheduler.now)
+            return 3 if len(calls) < 3 else None
+
+        self.game.schedule(event, 2)
+        for _ in range(20):
+            self.game.advance()
+
+        self.assertListEqual(calls, [2, 5, 8])
@@ -0,0 +1,117 @@
+import unittest
+
+import numpy as np
+
+from src.batch import BatchGame
+from src.game import Game
+from src.sensors import RaySensor, RAY_STEPS, WALL, BODY, FOOD, cast_rays, ray_table
+
+
+class TestRayTable(unittest.TestCase):
+    def test_limits(self):
+        table = ray_table((5, 4))
+        left, up_left, up, up_right, right, down_right, down, down_left = range(8)
+
+        corner = table.limits[0]
+        self.assertEqual(corner[left], 0)
+        self.assertEqual(corner[up], 0)
+        self.assertEqual(corner[right], 4)
+        self.assertEqual(corner[down], 3)
+        self.assertEqual(corner[down_right], 3)
+
+        center = table.limits[2 * 5 + 2]
+        self.assertEqual(center[up_right], 2)
+        self.assertEqual(center[down_left], 1)
+
+    def test_cached(self):
+        self.assertIs(ray_table((7, 7), 16), ray_table((7, 7), 16))
+
+    def test_rays_count(self):
+        with self.assertRaises(ValueError):
+            ray_table((7, 7), 12)
+
+
+class TestCastRays(unittest.TestCase):
+    def setUp(self):
+        self.table = ray_table((9, 9))
+        self.body = np.zeros((9, 9), dtype=bool)
+        self.food = np.zeros_like(self.body)
+
+    def test_cast(self):
+        self.body[4, 2] = True
+        self.food[1, 4] = True
+        self.food[4, 7] = True
+
+        rays = cast_rays(self.table, np.array([4 * 9 + 4]), self.body, self.food)[0]
+
+        self.assertEqual(rays.shape, (8, 3))
+        np.testing.assert_allclose(rays[:, WALL], 1 / 5)
+        self.assertAlmostEqual(rays[0, BODY], 1 / 2)
+        self.assertAlmostEqual(rays[2, FOOD], 1 / 3)
+        self.assertAlmostEqual(rays[4, FOOD], 1 / 3)
+        self.assertEqual(np.count_nonzero(rays[:, BODY]), 1)
+        self.assertEqual(np.count_nonzero(rays[:, FOOD]), 2)
+
+    def test_board_per_head(self):
+        body = np.zeros((2, 9, 9), dtype=bool)
+        body[1, 0, 0] = True
+
+        rays = cast_rays(self.table, np.array([4 * 9 + 4, 4 * 9 + 4]), body, np.zeros_like(body))
+
+        self.assertFalse(rays[0, :, BODY].any())
+        self.assertAlmostEqual(rays[1, 1, BODY], 1 / 4)
+
+    def test_batch_game(self):
+        games = BatchGame(5, (12, 12), seed=1)
+        rays = cast_rays(ray_table((12, 12), 16), games.heads, games.body, games.food)
+
+        self.assertEqual(rays.shape, (5, 16, 3))
+        self.assertTrue(rays[..., BODY].any(axis=1).all())
+
+
+class TestRaySensor(unittest.TestCase):
+    def test_matches_grid_scan(self):
+        game = Game(grid_bounds=(15, 15), seed=3)
+        game.dispose()
+        for _ in range(5):
+            game.tick(next(game.snake.safe_directions(), None))
+
+        for rays in RAY_STEPS:
+            sensed = RaySensor(game.grid.bounds, rays).sense_snake(game.snake)
+
+            for r, step in enumerate(RAY_STEPS[rays]):
+                self.assertAlmostEqual(sensed[r, WALL], 1 / self.scan(game, step, lambda c: False)[0])
+                self.assertAlmostEqual(sensed[r, BODY], self.scan(game, step, lambda c: c.owner is game.snake)[1])
+                self.assertAlmostEqual(sensed[r, FOOD], self.scan(game, step, lambda c: c in game.grid.food)[1])
+
+    def test_reused_planes(self):
+        game = Game(grid_bounds=(15, 15), seed=3)
+        game.dispose()
+        sensor = RaySensor(game.grid.bounds)
+
+        for _ in range(30):
+            sensor.sense_snake(game.snake)
+
+            self.assertEqual(
+                {(x, y) for y, x in zip(*sensor.body.nonzero())},
+                {c.coordinates for c in game.snake.cells},
+            )
+            self.assertEqual(
+                {(x, y) for y, x in zip(*sensor.food.nonzero())},
+                {c.coordinates for c in game.grid.food},
+            )
+
+            if not game.tick(next(game.snake.safe_directions(), None)):
+                break
+
+    @staticmethod
+    def scan(game, step, hit):
+        x, y = game.snake.head.coordinates
+        distance = 1
+        found = 0
+        while game.grid.in_bounds(x + step[0] * distance, y + step[1] * distance):
+            if not found and hit(game.grid.get_cell(x + step[0] * distance, y + step[1] * distance)):
+                found = 1 / distance
+            distance += 1
+
+        return distance, found
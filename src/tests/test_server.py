@@ -0,0 +1,149 @@
+import asyncio
+import unittest
+
+from src.arena import Arena
+from src.grid.grid import GridBounds
+from src.server import ArenaServer, FrameClient, KEYFRAME, DELTA, encode_frame, decode_frame, LENGTH
+from src.snake import Directions
+
+
+class TestFrames(unittest.TestCase):
+    def test_encode_decode(self):
+        frame = encode_frame(KEYFRAME, 7, [(1, (255, 0, 0))], [(10, 1), (11, 0)], (20, 30))
+        length, = LENGTH.unpack_from(frame)
+
+        kind, tick, bounds, palette, cells = decode_frame(frame[LENGTH.size:])
+
+        self.assertEqual(length, len(frame) - LENGTH.size)
+        self.assertEqual((kind, tick, bounds), (KEYFRAME, 7, (20, 30)))
+        self.assertEqual(tuple(palette[0]['rgb']), (255, 0, 0))
+        self.assertListEqual(cells['index'].tolist(), [10, 11])
+        self.assertListEqual(cells['color'].tolist(), [1, 0])
+
+    def test_delta_size(self):
+        frame = encode_frame(DELTA, 1, [], [(i, 1) for i in range(10)])
+
+        self.assertEqual(len(frame), LENGTH.size + 11 + 10 * 6)
+
+
+class TestArenaServer(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.arena = Arena(grid_bounds=GridBounds(20, 20), seed=1)
+        self.arena.add_snake()
+        self.server = ArenaServer(self.arena, food_count=3)
+        self.address = self.run_async(self.server.start())
+        self.clients = []
+
+    def tearDown(self):
+        for client in self.clients:
+            self.run_async(client.close())
+        self.run_async(self.server.close())
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def connect(self):
+        client = FrameClient()
+        self.run_async(client.connect(*self.address))
+        self.assertEqual(self.run_async(client.read_frame()), KEYFRAME)
+        self.clients.append(client)
+
+        return client
+
+    def server_board(self):
+        grid = self.server.grid
+
+        return {
+            y * grid.bounds.cells_in_row + x: c.owner.color
+            for c in grid.get_foreign_cells(grid.main_structure)
+            for x, y in [c.coordinates]
+        }
+
+    def test_spectators_follow_board(self):
+        clients = [self.connect() for _ in range(3)]
+
+        for _ in range(5):
+            self.server.tick()
+            for client in clients:
+                self.assertEqual(self.run_async(client.read_frame()), DELTA)
+
+        for client in clients:
+            self.assertEqual(client.tick, self.arena.ticks)
+            self.assertEqual(client.bounds, (20, 20))
+            self.assertDictEqual(client.board, self.server_board())
+
+    def test_player(self):
+        client = self.connect()
+        client.join()
+        self.run_async(asyncio.sleep(0.05))
+
+        snake = next(c.snake for c in self.server.connections)
+        self.assertIn(snake, self.arena)
+
+        client.turn(Directions((snake.direction.value + 1) % len(Directions)))
+        self.run_async(asyncio.sleep(0.05))
+        self.server.tick()
+        self.run_async(client.read_frame())
+
+        self.assertDictEqual(client.board, self.server_board())
+
+    def test_disconnect_removes_snake(self):
+        client = self.connect()
+        client.join()
+        self.run_async(asyncio.sleep(0.05))
+        snake = next(c.snake for c in self.server.connections)
+
+        self.clients.remove(client)
+        self.run_async(client.close())
+        self.run_async(asyncio.sleep(0.05))
+
+        self.assertNotIn(snake, self.arena)
+        self.assertNotIn(snake, self.arena.snakes)
+        self.assertFalse(self.arena.grid.get_owner_cells(snake))
+
+    def test_palette_recycled(self):
+        client = self.connect()
+
+        for i in range(200):
+            snake = self.arena.add_snake(color=(i % 256, i // 256, 7))
+            self.server.tick()
+            self.run_async(client.read_frame())
+
+            self.arena.remove_snake(snake)
+
+        self.server.tick()
+        self.run_async(client.read_frame())
+
+        self.assertDictEqual(client.board, self.server_board())
+        self.assertLess(max(self.server._palette.values()), 10)
+        self.assertEqual(len(self.server._palette), len({c.owner.color for c in self.arena.grid.cells}))
+
+    def test_backpressure(self):
+        client = self.connect()
+        connection = next(iter(self.server.connections))
+        transport = connection.writer.transport
+        buffer_size = transport.get_write_buffer_size
+
+        transport.get_write_buffer_size = lambda: self.server.max_buffer + 1
+        for _ in range(3):
+            self.server.tick()
+        self.assertTrue(connection.stale)
+
+        transport.get_write_buffer_size = buffer_size
+        self.server.tick()
+
+        self.assertEqual(self.run_async(client.read_frame()), KEYFRAME)
+        self.assertEqual(client.tick, self.arena.ticks)
+        self.assertDictEqual(client.board, self.server_board())
+
+    def test_run(self):
+        self.server.tick_interval = 0.001
+        client = self.connect()
+
+        self.run_async(self.server.run(ticks=4))
+        for _ in range(4):
+            self.run_async(client.read_frame())
+
+        self.assertEqual(client.tick, self.arena.ticks)
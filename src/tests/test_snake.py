@@ -1,9 +1,12 @@
+import random
 import unittest
 
 from src.exceptions.snake_exceptions import SnakeTwistedError, SnakeHeadBeatenError, SnakeBackwardMoveError
 from src.food import Food
+from src.grid.cell import GridCell
 from src.grid.grid import BasicGrid, GridBounds
-from src.snake import UnclePy, Directions
+from src.grid.structure import CellQueue
+from src.snake import UnclePy, Directions, Outcomes
 
 
 class TestUnclePy(unittest.TestCase):
@@ -22,6 +25,8 @@ class TestUnclePy(unittest.TestCase):
         self.grid = BasicGrid(
             grid_info=(self.cell_height, self.cell_width, self.margin),
             grid_bounds=GridBounds(self.cells_in_row, self.cells_in_column),
+            # The seed makes the snake go LEFT from its tail.
+            rng=random.Random(0),
         )
         self.snake = UnclePy(
             self.grid,
@@ -97,3 +102,58 @@ class TestUnclePy(unittest.TestCase):
 
         got_angle = self.snake.get_food_angle(nearest_food_cell)
         self.assertAlmostEqual(got_angle, 0.785, places=3)
+
+    def test_step_outcomes(self):
+        self.assertIs(self.snake.direction, Directions.LEFT)
+        self.assertEqual(self.snake.step(), (Outcomes.MOVED, 0))
+        self.assertEqual(self.snake.step(Directions.RIGHT).outcome, Outcomes.ILLEGAL_TURN)
+
+        head_x, head_y = self.snake.head.coordinates
+        Food(self.grid, self.grid.get_cell(head_x, head_y + 1), (50, 50, 50), 4)
+        self.assertEqual(self.snake.step(Directions.DOWN), (Outcomes.ATE, 4))
+
+        self.snake.step(Directions.RIGHT)
+        self.assertEqual(self.snake.step(Directions.UP).outcome, Outcomes.HIT_SELF)
+        self.assertTrue(Outcomes.HIT_SELF.terminal)
+
+    def test_step_wall(self):
+        self.assertEqual(self.snake.step(Directions.UP).outcome, Outcomes.HIT_WALL)
+        self.assertFalse(Outcomes.ATE.terminal)
+
+    def test_body_membership(self):
+        head, tail = self.snake.head, self.snake.tail
+
+        self.snake.move()
+
+        self.assertIn(self.snake.head, self.snake.cells)
+        self.assertIn(head, self.snake.cells)
+        self.assertNotIn(tail, self.snake.cells)
+        self.assertEqual(len(self.snake.cells), self.length)
+
+    def test_nearest_food(self):
+        head_x, head_y = self.snake.head.coordinates
+        far_food = Food(self.grid, self.grid.get_cell(head_x - 5, head_y + 5), (50, 50, 50), 1)
+        near_food = Food(self.grid, self.grid.get_cell(head_x, head_y + 2), (50, 50, 50), 1)
+
+        self.assertListEqual(self.snake.get_nearest_food(3), [near_food.cells[0], far_food.cells[0]])
+        self.assertAlmostEqual(self.snake.get_food_angle(), 0)
+
+
+class TestCellQueue(unittest.TestCase):
+    def setUp(self):
+        self.cells = [GridCell((x, 0)) for x in range(5)]
+        self.queue = CellQueue(self.cells)
+
+    def test_order(self):
+        self.queue.remove(self.cells[0])
+        self.queue.remove(self.cells[4])
+        self.queue.remove(self.cells[2])
+        self.queue.appendleft(self.cells[0])
+
+        self.assertListEqual(list(self.queue), [self.cells[0], self.cells[1], self.cells[3]])
+        self.assertIs(self.queue[0], self.cells[0])
+        self.assertIs(self.queue[-1], self.cells[3])
+
+    def test_remove_missing(self):
+        with self.assertRaises(ValueError):
+            self.queue.remove(GridCell((10, 10)))
@@ -0,0 +1,85 @@
+import random
+import unittest
+
+from src.exceptions.grid_exceptions import OutOfGridBoundsError
+from src.grid.grid import GridBounds
+from src.grid.sparse import SparseGrid
+from src.snake import UnclePy
+from src.tests import test_grid
+
+
+class SparseGridTest(test_grid.BasicGridTest):
+    grid_class = SparseGrid
+
+    def test_draw_changed_cells(self):
+        pygame = test_grid.SimpleNamespace(draw=test_grid.SimpleNamespace(rect=lambda screen, color, rect: rect))
+
+        self.grid.mark_all_changed()
+        self.assertListEqual(self.grid.draw(None, pygame), [])
+
+        snake = UnclePy(self.grid, self.grid.get_cell(30, 30), 5, (1, 0, 0))
+        self.grid.mark_all_changed()
+        self.assertEqual(len(self.grid.draw(None, pygame)), 5)
+
+        snake.move()
+        self.assertEqual(len(self.grid.draw(None, pygame)), 2)
+
+
+class SparseCoordinateConversionTest(test_grid.TestCoordinateConversion):
+    grid_class = SparseGrid
+
+
+class TestHugeSparseGrid(unittest.TestCase):
+    def setUp(self):
+        self.size = 100000
+        self.grid = SparseGrid(grid_info=(6, 6, 1), grid_bounds=GridBounds(self.size, self.size), rng=random.Random(1))
+        self.snake = UnclePy(self.grid, self.grid.get_cell(50000, 50000), 5, (1, 0, 0))
+
+    def test_only_owned_cells_stored(self):
+        food = self.grid.add_food((0, 0, 1), 1)
+
+        self.assertEqual(len(self.grid.owned_cells), 6)
+        self.assertEqual(self.grid.free_cells_count(), self.size ** 2 - 6)
+        self.assertFalse(self.grid.is_free_cell(self.grid.get_cell(*food.cells[0].coordinates)))
+
+    def test_move(self):
+        tail = self.snake.tail.coordinates
+
+        for _ in range(10):
+            self.snake.move()
+
+        self.assertEqual(len(self.grid.owned_cells), 5)
+        self.assertTrue(self.grid.is_free_cell(self.grid.get_cell(*tail)))
+        self.assertIs(self.grid.get_cell(*self.snake.head.coordinates), self.snake.head)
+
+    def test_foreign_cells(self):
+        food = self.grid.add_food((0, 0, 1), 1)
+        foreign_cells = self.grid.get_foreign_cells(self.snake)
+
+        self.assertEqual(len(foreign_cells), self.size ** 2 - 5)
+        self.assertIn(food.cells[0], foreign_cells)
+        self.assertNotIn(self.snake.head, foreign_cells)
+        self.assertIn(self.grid.get_cell(0, 0), foreign_cells)
+
+    def test_clear(self):
+        self.grid.clear()
+
+        self.assertEqual(len(self.grid.owned_cells), 0)
+        self.assertEqual(len(self.snake.cells), 0)
+
+    def test_out_of_bounds(self):
+        with self.assertRaises(OutOfGridBoundsError):
+            self.grid.get_cell(self.size, 0)
+
+
+class TestFullSparseGrid(unittest.TestCase):
+    def test_sample_nearly_full_grid(self):
+        grid = SparseGrid(grid_info=(6, 6, 1), grid_bounds=GridBounds(10, 10), rng=random.Random(1))
+        for _ in range(99):
+            grid.add_food((0, 0, 1), 1)
+
+        self.assertEqual(grid.free_cells_count(), 1)
+        grid.add_food((0, 0, 1), 1)
+
+        with self.assertRaises(IndexError):
+            grid.add_food((0, 0, 1), 1)
@@ -0,0 +1,33 @@
+import unittest
+
+from src.agents import random_agent, greedy_agent
+from src.tournament import play_game, run_tournament, summarize
+
+
+class TestTournament(unittest.TestCase):
+    def setUp(self):
+        self.grid_bounds = (20, 20)
+
+    def test_seeded_game(self):
+        first = play_game('random', random_agent, 7, self.grid_bounds)
+        second = play_game('random', random_agent, 7, self.grid_bounds)
+
+        self.assertEqual(first, second)
+        self.assertGreater(first.ticks, 0)
+
+    def test_max_ticks(self):
+        result = play_game('greedy', greedy_agent, 1, self.grid_bounds, max_ticks=5)
+
+        self.assertLessEqual(result.ticks, 5)
+
+    def test_run_tournament(self):
+        agents = {'random': random_agent, 'greedy': greedy_agent}
+
+        results = list(run_tournament(agents, 7, seed=3, grid_bounds=self.grid_bounds, workers=2, chunk_size=3))
+
+        self.assertEqual(len(results), 14)
+        self.assertCountEqual([r.seed for r in results if r.agent == 'greedy'], range(3, 10))
+
+        summary = summarize(results)
+        self.assertEqual(summary['random']['games'], 7)
+        self.assertGreaterEqual(summary['greedy']['max_scores'], summary['greedy']['scores'])
@@ -0,0 +1,63 @@
+import random
+import unittest
+
+from src.grid.grid import GridBounds
+from src.grid.sparse import SparseGrid
+from src.grid.viewport import Viewport
+from src.snake import UnclePy, Directions
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+
+@unittest.skipIf(pygame is None, 'pygame is not installed')
+class TestViewport(unittest.TestCase):
+    def setUp(self):
+        self.grid = SparseGrid(grid_info=(6, 6, 1), grid_bounds=GridBounds(10000, 10000), rng=random.Random(1))
+        self.snake = UnclePy(self.grid, self.grid.get_cell(5000, 5000), 5, (255, 0, 0))
+        self.viewport = Viewport(self.grid, pygame, (40, 30), tile_size=8, target=self.snake)
+        self.screen = pygame.Surface(self.viewport.screen_size())
+
+    def screen_color(self, x, y):
+        screen_x, screen_y = self.viewport._screen_position(x, y)
+
+        return tuple(self.screen.get_at((screen_x, screen_y)))[:3]
+
+    def test_first_draw_follows_target(self):
+        rects = self.viewport.draw(self.screen)
+
+        self.assertEqual(len(rects), 1)
+        self.assertTrue(self.viewport.is_visible(*self.snake.head.coordinates))
+        self.assertEqual(self.screen_color(*self.snake.head.coordinates), (255, 0, 0))
+        self.assertLessEqual(len(self.viewport._tiles), self.viewport.max_tiles)
+
+    def test_incremental_draw(self):
+        self.viewport.draw(self.screen)
+        tail = self.snake.tail.coordinates
+
+        self.snake.move()
+        rects = self.viewport.draw(self.screen)
+
+        self.assertEqual(len(rects), 2)
+        self.assertEqual(self.screen_color(*self.snake.head.coordinates), (255, 0, 0))
+        self.assertEqual(self.screen_color(*tail), self.grid.color)
+
+    def test_scroll(self):
+        self.viewport.draw(self.screen)
+        view = self.viewport.x, self.viewport.y
+
+        self.snake.turn(Directions.DOWN) or self.snake.turn(Directions.LEFT)
+        for _ in range(20):
+            self.snake.move()
+        rects = self.viewport.draw(self.screen)
+
+        self.assertNotEqual((self.viewport.x, self.viewport.y), view)
+        self.assertEqual(len(rects), 1)
+        self.assertEqual(self.screen_color(*self.snake.head.coordinates), (255, 0, 0))
+
+    def test_view_inside_grid(self):
+        self.viewport.move_to(-5, 20000)
+
+        self.assertEqual((self.viewport.x, self.viewport.y), (0, 10000 - 30))
@@ -0,0 +1,144 @@
+import argparse
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from os import cpu_count
+
+from src.agents import AGENTS, OPT_IN_AGENTS
+from src.config import CELLS_IN_ROW
+from src.game import Game
+
+GameResult = namedtuple('GameResult', ['agent', 'seed', 'scores', 'length', 'ticks'])
+
+MAX_TICKS = 10000
+
+
+def play_game(agent_name, agent, seed, grid_bounds=(CELLS_IN_ROW, CELLS_IN_ROW), max_ticks=MAX_TICKS) -> GameResult:
+    """Play a headless game seeded by `seed` with the `agent`."""
+
+    game = Game(grid_bounds=grid_bounds, seed=seed)
+    game.dispose()
+    game.run(agent, max_ticks)
+
+    return GameResult(agent_name, seed, game.snake.scores, len(game.snake.cells), game.ticks)
+
+
+def play_games(agent_name, agent, seeds, grid_bounds=(CELLS_IN_ROW, CELLS_IN_ROW), max_ticks=MAX_TICKS) -> list:
+    """Play a chunk of games, one per seed."""
+
+    return [play_game(agent_name, agent, s, grid_bounds, max_ticks) for s in seeds]
+
+
+def run_tournament(
+        agents: dict,
+        games: int,
+        seed: int = 0,
+        grid_bounds: tuple = (CELLS_IN_ROW, CELLS_IN_ROW),
+        max_ticks: int = MAX_TICKS,
+        workers: int = None,
+        chunk_size: int = 100,
+):
+    """
+    Play `games` games with every agent across a process pool.
+
+    Games are dispatched in chunks of `chunk_size` and only a couple of
+    chunks per worker are in flight at once, so results are streamed as they
+    are ready instead of piling up in memory. Every agent plays the same
+    seeds ``seed .. seed + games - 1``.
+
+    Args:
+        agents: names mapped to agent callables, see :mod:`src.agents`.
+        games: count of games per agent.
+        seed: seed of the first game.
+        grid_bounds: count of cells in a row and in a column.
+        max_ticks: games still running after this count of ticks are stopped.
+        workers: count of worker processes, all cores are used by default.
+        chunk_size: count of games in one task.
+
+    Yields:
+        :obj:`GameResult`: results in order of completion.
+    """
+
+    workers = workers or cpu_count()
+    tasks = (
+        (name, agent, range(start, min(start + chunk_size, seed + games)))
+        for name, agent in agents.items()
+        for start in range(seed, seed + games, chunk_size)
+    )
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = set()
+
+        def submit_tasks():
+            for name, agent, seeds in tasks:
+                pending.add(executor.submit(play_games, name, agent, seeds, grid_bounds, max_ticks))
+                if len(pending) >= 2 * workers:
+                    break
+
+        submit_tasks()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            submit_tasks()
+
+            for future in done:
+                yield from future.result()
+
+
+def summarize(results) -> dict:
+    """Aggregate streamed `results` per agent without keeping them.
+
+    Returns:
+        :obj:`dict`: agent names mapped to count of games and mean and maximum
+        scores, lengths and ticks.
+    """
+
+    summary = {}
+    for r in results:
+        stats = summary.setdefault(r.agent, {'games': 0, 'scores': 0, 'length': 0, 'ticks': 0,
+                                             'max_scores': 0, 'max_length': 0, 'max_ticks': 0})
+
+        stats['games'] += 1
+        for field in ('scores', 'length', 'ticks'):
+            value = getattr(r, field)
+            stats[field] += value
+            stats['max_' + field] = max(stats['max_' + field], value)
+
+    for stats in summary.values():
+        for field in ('scores', 'length', 'ticks'):
+            stats[field] /= stats['games']
+
+    return summary
+
+
+def run():
+    parser = argparse.ArgumentParser(description='Evaluate agents on seeded headless games.')
+    parser.add_argument(
+        'agents', nargs='*',
+        help=f'agents to evaluate: {", ".join(AGENTS)} by default, also {", ".join(OPT_IN_AGENTS)}',
+    )
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--size', type=int, default=CELLS_IN_ROW)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=100)
+    args = parser.parse_args()
+
+    known_agents = {**AGENTS, **OPT_IN_AGENTS}
+    unknown = set(args.agents) - set(known_agents)
+    if unknown:
+        parser.error(f'unknown agents: {", ".join(sorted(unknown))}')
+
+    results = run_tournament(
+        {name: known_agents[name] for name in args.agents or AGENTS},
+        args.games,
+        seed=args.seed,
+        grid_bounds=(args.size, args.size),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+
+    for name, stats in sorted(summarize(results).items()):
+        print(f'{name}: ' + ', '.join(f'{k}={v:.2f}' if isinstance(v, float) else f'{k}={v}' for k, v in stats.items()))
+
+
+if __name__ == "__main__":
+    run()